@@ -0,0 +1,88 @@
+"""Index foreign keys and job_histories(user_id, is_active, start_date DESC)
+
+The composite index leads with user_id, so it replaces ix_job_histories_user_id.
+
+Revision ID: 20df8e3c5323
+Revises: 63f7842f7160
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20df8e3c5323'
+down_revision: Union[str, None] = '63f7842f7160'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns); tokens(refresh_expires_at) was added in 36c36a474abd
+INDEXES = [
+    ('ix_tokens_user_id', 'tokens', ['user_id']),
+    ('ix_projects_user_id', 'projects', ['user_id']),
+    ('ix_projects_job_history_id', 'projects', ['job_history_id']),
+    ('ix_job_history_skills_skill_id', 'job_history_skills', ['skill_id']),
+    ('ix_project_skills_skill_id', 'project_skills', ['skill_id']),
+    (
+        'ix_job_histories_user_id_is_active_start_date', 'job_histories',
+        ['user_id', 'is_active', sa.text('start_date DESC')],
+    ),
+]
+
+# Superseded by ix_job_histories_user_id_is_active_start_date
+REDUNDANT_INDEXES = [
+    ('ix_job_histories_user_id', 'job_histories', ['user_id']),
+]
+
+
+def drop_invalid_indexes(names) -> None:
+    """
+    Drop any of `names` left INVALID by an interrupted concurrent build.
+
+    `if_not_exists` would otherwise skip them, and an INVALID index is
+    maintained on every write but never used by the planner.
+    """
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE NOT i.indisvalid AND c.relname = ANY(:names)"
+        ),
+        {'names': list(names)},
+    ).scalars().all()
+    for name in invalid:
+        op.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction. A failed build leaves an
+    # INVALID index behind, which a re-run of the upgrade drops and rebuilds.
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes(name for name, _, _ in INDEXES)
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=False, postgresql_concurrently=True, if_not_exists=True,
+            )
+        for name, table, _ in REDUNDANT_INDEXES:
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_invalid_indexes(name for name, _, _ in REDUNDANT_INDEXES)
+        for name, table, columns in REDUNDANT_INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=False, postgresql_concurrently=True, if_not_exists=True,
+            )
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
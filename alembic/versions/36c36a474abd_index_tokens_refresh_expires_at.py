@@ -0,0 +1,34 @@
+"""Index tokens.refresh_expires_at for the expired-token purge
+
+Revision ID: 36c36a474abd
+Revises: ccc8a3e9a365
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '36c36a474abd'
+down_revision: Union[str, None] = 'ccc8a3e9a365'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_tokens_refresh_expires_at'), 'tokens', ['refresh_expires_at'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_tokens_refresh_expires_at'), table_name='tokens',
+            postgresql_concurrently=True, if_exists=True,
+        )
@@ -0,0 +1,34 @@
+"""Keep the token rows of deleted users
+
+Revision ID: 5d1e0c7a9f42
+Revises: 9b575f6c7279
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1e0c7a9f42'
+down_revision: Union[str, None] = '9b575f6c7279'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Deleting a user nulls `user_id`, so their blacklisted tokens stay revoked on every worker
+    op.alter_column('tokens', 'user_id', existing_type=sa.Integer(), nullable=True)
+    op.drop_constraint('tokens_user_id_fkey', 'tokens', type_='foreignkey')
+    op.create_foreign_key(
+        'tokens_user_id_fkey', 'tokens', 'users', ['user_id'], ['id'], ondelete='SET NULL'
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM tokens WHERE user_id IS NULL")
+    op.drop_constraint('tokens_user_id_fkey', 'tokens', type_='foreignkey')
+    op.create_foreign_key('tokens_user_id_fkey', 'tokens', 'users', ['user_id'], ['id'])
+    op.alter_column('tokens', 'user_id', existing_type=sa.Integer(), nullable=False)
@@ -0,0 +1,51 @@
+"""Use timezone-aware timestamp columns
+
+Revision ID: 60877b2f0e44
+Revises: e13b2266bc9f
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '60877b2f0e44'
+down_revision: Union[str, None] = 'e13b2266bc9f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing values were written as UTC, so they are reinterpreted as such.
+DATETIME_COLUMNS = {
+    'skills': ['created_at', 'updated_at'],
+    'users': ['created_at', 'updated_at'],
+    'job_histories': ['start_date', 'end_date', 'created_at', 'updated_at'],
+    'tokens': ['expires_at', 'refresh_expires_at', 'created_at', 'updated_at'],
+    'projects': ['start_date', 'end_date', 'created_at', 'updated_at'],
+}
+
+
+def upgrade() -> None:
+    for table, columns in DATETIME_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.DateTime(timezone=True),
+                existing_type=sa.DateTime(),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
+
+
+def downgrade() -> None:
+    for table, columns in DATETIME_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.DateTime(),
+                existing_type=sa.DateTime(timezone=True),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
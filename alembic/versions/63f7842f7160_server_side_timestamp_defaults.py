@@ -0,0 +1,42 @@
+"""Server-side defaults for created_at and updated_at
+
+Revision ID: 63f7842f7160
+Revises: 36c36a474abd
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '63f7842f7160'
+down_revision: Union[str, None] = '36c36a474abd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['skills', 'users', 'job_histories', 'tokens', 'projects']
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(
+                table, column,
+                server_default=sa.func.now(),
+                existing_type=sa.DateTime(timezone=True),
+                existing_nullable=False,
+            )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        for column in ('created_at', 'updated_at'):
+            op.alter_column(
+                table, column,
+                server_default=None,
+                existing_type=sa.DateTime(timezone=True),
+                existing_nullable=False,
+            )
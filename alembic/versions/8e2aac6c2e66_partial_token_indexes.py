@@ -0,0 +1,45 @@
+"""Partial indexes for live and blacklisted tokens
+
+Revision ID: 8e2aac6c2e66
+Revises: 20df8e3c5323
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2aac6c2e66'
+down_revision: Union[str, None] = '20df8e3c5323'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, columns, predicate). now() is not immutable, so expiry stays
+# in the index key rather than the predicate.
+INDEXES = [
+    ('ix_tokens_user_id_refresh_expires_at_live', ['user_id', 'refresh_expires_at'], 'NOT is_blacklisted'),
+    ('ix_tokens_expires_at_blacklisted', ['expires_at'], 'is_blacklisted'),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, columns, predicate in INDEXES:
+            op.create_index(
+                name, 'tokens', columns,
+                unique=False, postgresql_where=sa.text(predicate),
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in INDEXES:
+            op.drop_index(
+                name, table_name='tokens',
+                postgresql_concurrently=True, if_exists=True,
+            )
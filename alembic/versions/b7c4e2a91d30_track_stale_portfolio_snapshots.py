@@ -0,0 +1,42 @@
+"""Track stale portfolio snapshots in the database
+
+Revision ID: b7c4e2a91d30
+Revises: 5d1e0c7a9f42
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c4e2a91d30'
+down_revision: Union[str, None] = '5d1e0c7a9f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSION_COLUMNS = ['source_version', 'built_from_version']
+
+
+def upgrade() -> None:
+    # A constant default fills existing rows without a rewrite; existing
+    # snapshots start out fresh (0 == 0). The app supplies the value afterwards.
+    for column in VERSION_COLUMNS:
+        op.add_column(
+            'portfolio_snapshots',
+            sa.Column(column, sa.BigInteger(), nullable=False, server_default='0'),
+        )
+        op.alter_column('portfolio_snapshots', column, server_default=None)
+    # Rows marked stale before their first build have no document yet
+    op.alter_column('portfolio_snapshots', 'document', existing_type=sa.Text(), nullable=True)
+    op.alter_column('portfolio_snapshots', 'generated_at', existing_type=sa.DateTime(timezone=True), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM portfolio_snapshots WHERE document IS NULL")
+    op.alter_column('portfolio_snapshots', 'generated_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+    op.alter_column('portfolio_snapshots', 'document', existing_type=sa.Text(), nullable=False)
+    for column in reversed(VERSION_COLUMNS):
+        op.drop_column('portfolio_snapshots', column)
@@ -0,0 +1,99 @@
+"""Store token digests instead of full JWTs
+
+Revision ID: ccc8a3e9a365
+Revises: 60877b2f0e44
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import config
+from app.utils.security_utils import TOKEN_DIGEST_LENGTH
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ccc8a3e9a365'
+down_revision: Union[str, None] = '60877b2f0e44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10000
+
+# Mirrors `generate_secure_value`: sha256(value || SECRET_KEY) as lowercase hex.
+# Rows already holding a digest are skipped, so the backfill can be resumed.
+BACKFILL_SQL = sa.text(
+    """
+    UPDATE tokens
+    SET token = CASE WHEN length(token) <> :digest_length
+                THEN encode(sha256(convert_to(token || :secret, 'UTF8')), 'hex')
+                ELSE token END,
+        refresh_token = CASE WHEN length(refresh_token) <> :digest_length
+                THEN encode(sha256(convert_to(refresh_token || :secret, 'UTF8')), 'hex')
+                ELSE refresh_token END
+    WHERE id >= :lower AND id < :upper
+      AND (length(token) <> :digest_length OR length(refresh_token) <> :digest_length)
+    """
+)
+
+
+def backfill(connection, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Replace plaintext tokens with their digests, `batch_size` ids per statement.
+
+    Returns:
+        int: Number of batches run.
+    """
+    bounds = connection.execute(sa.text("SELECT min(id), max(id) FROM tokens")).one()
+    if bounds[0] is None:
+        return 0
+    batches = 0
+    for lower in range(bounds[0], bounds[1] + 1, batch_size):
+        connection.execute(
+            BACKFILL_SQL,
+            {
+                "secret": config.SECRET_KEY,
+                "digest_length": TOKEN_DIGEST_LENGTH,
+                "lower": lower,
+                "upper": lower + batch_size,
+            },
+        )
+        batches += 1
+    return batches
+
+
+def upgrade() -> None:
+    # Commit each batch on its own so row locks are short-lived
+    with op.get_context().autocommit_block():
+        backfill(op.get_bind())
+
+    op.alter_column(
+        'tokens', 'token',
+        type_=sa.String(length=TOKEN_DIGEST_LENGTH),
+        existing_type=sa.String(),
+        existing_nullable=False,
+    )
+    op.alter_column(
+        'tokens', 'refresh_token',
+        type_=sa.String(length=TOKEN_DIGEST_LENGTH),
+        existing_type=sa.String(),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    # Digests cannot be turned back into JWTs; the columns are only widened.
+    op.alter_column(
+        'tokens', 'refresh_token',
+        type_=sa.String(),
+        existing_type=sa.String(length=TOKEN_DIGEST_LENGTH),
+        existing_nullable=False,
+    )
+    op.alter_column(
+        'tokens', 'token',
+        type_=sa.String(),
+        existing_type=sa.String(length=TOKEN_DIGEST_LENGTH),
+        existing_nullable=False,
+    )
@@ -1,8 +1,18 @@
 from app.api.endpoints.users import router as users_router
 
 from app.api.endpoints.auth import router as auth_router
+from app.api.endpoints.job_history import router as job_history_router
+from app.api.endpoints.portfolio import router as portfolio_router
+from app.api.endpoints.health import router as health_router
+from app.api.endpoints.metrics import router as metrics_router
+from app.api.endpoints.profiling import router as profiling_router
 # Combine all routers in a list for easier imports
 routers = [
     {"router": users_router, "prefix": "/api/v1", "tags": ["users"]},
     {"router": auth_router, "prefix": "/api/v1", "tags": ["auth"]},
+    {"router": job_history_router, "prefix": "/api/v1", "tags": ["job-history"]},
+    {"router": portfolio_router, "prefix": "/api/v1", "tags": ["portfolio"]},
+    {"router": health_router, "prefix": "", "tags": ["health"]},
+    {"router": metrics_router, "prefix": "", "tags": ["metrics"]},
+    {"router": profiling_router, "prefix": "", "tags": ["profiling"]},
 ]
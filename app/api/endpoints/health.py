@@ -0,0 +1,40 @@
+from fastapi import APIRouter, status
+from app.db.database import engine
+from app.db.pool import pool_metrics
+from app.utils.lifecycle import lifecycle
+from app.utils.serialization_utils import TrustedJSONResponse
+
+router = APIRouter()
+
+
+@router.get("/health/live")
+async def liveness():
+    """
+    Report that the process is up. Never touches the database.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/health/ready")
+async def readiness():
+    """
+    Report whether this worker should receive traffic.
+
+    Returns 503 until startup warmup has finished, and again once shutdown
+    has started draining, so rolling deploys only route to warmed-up workers.
+    """
+    if not lifecycle.accepting:
+        return TrustedJSONResponse(
+            {"status": "draining" if lifecycle.draining else "starting"},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    return {"status": "ready", "warmup_seconds": lifecycle.warmup_seconds}
+
+
+@router.get("/health/pool")
+async def pool():
+    """
+    Report this worker's database pool: checked-out connections, overflow,
+    queued checkouts (waiters) and checkout latency.
+    """
+    return pool_metrics.stats(engine.pool)
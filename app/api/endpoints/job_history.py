@@ -1,62 +1,105 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.db.database import get_db
+from app.db.database import get_db, get_session_factory
 from app.db.dependency import get_current_user
 from app.services.job_history_service import JobHistoryService
 from app.schemas.job_history import JobHistoryCreate, JobHistoryUpdate, JobHistoryResponse
-from app.models.user import User
+from app.schemas.user import AuthenticatedUser
+from app.utils.query_tracking import query_budget
+from app.utils.serialization_utils import TrustedJSONResponse
+from app.utils.streaming_utils import ExportFormat
 
 router = APIRouter()
 
 
 @router.get("/job-history", response_model=List[JobHistoryResponse])
+@query_budget(2)
 async def get_user_jobs(
     user_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    current: bool = False,
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Get all job history entries for a specific user.
+    Get all job history entries for a specific user. Pass `current=true` to
+    only return jobs that have not ended. Supports `If-None-Match` and
+    `If-Modified-Since`.
     """
     job_history_service = JobHistoryService(db)
-    return job_history_service.get_user_jobs(user_id)
+    validators = await job_history_service.get_user_jobs_validators(user_id, current_only=current)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    jobs = await job_history_service.get_user_jobs(user_id, current_only=current, version=validators.etag)
+    return validators.apply(TrustedJSONResponse(jobs))
+
+
+@router.get("/job-history/export")
+async def export_user_jobs(
+    user_id: int,
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    session_factory=Depends(get_session_factory),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """
+    Stream every job history entry for a user as NDJSON or a JSON array.
+    """
+    return JobHistoryService.export_user_jobs(session_factory, user_id, export_format)
+
+
+@router.get("/job-history/{job_history_id}", response_model=JobHistoryResponse)
+@query_budget(2)
+async def get_job_history(
+    job_history_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get a job history entry by ID. Supports `If-None-Match` and `If-Modified-Since`.
+    """
+    job_history_service = JobHistoryService(db)
+    validators = await job_history_service.get_job_history_validators(job_history_id)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    job_history = await job_history_service.get_job_history(job_history_id, version=validators.etag)
+    return validators.apply(TrustedJSONResponse(job_history))
 
 
 @router.post("/create-job-history", response_model=JobHistoryResponse, status_code=201)
 async def create_job_history(
     job_history_data: JobHistoryCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
 ):
     """
     Create a new job history entry for the user.
     """
     job_history_service = JobHistoryService(db)
-    return job_history_service.create_job_history(job_history_data)
+    return await job_history_service.create_job_history(job_history_data)
 
 
 @router.put("/edit-job-history/{job_history_id}", response_model=JobHistoryResponse)
 async def edit_job_history(
     job_history_id: int,
     job_data: JobHistoryUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
 ):
     """
     Update a job history entry by ID.
     """
     job_history_service = JobHistoryService(db)
-    return job_history_service.edit_job_history(job_history_id, job_data)
+    return await job_history_service.edit_job_history(job_history_id, job_data)
 
 
 @router.delete("/delete-job-history/{job_history_id}")
 async def delete_job_history(
     job_history_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user),
 ):
     """
     Delete a job history entry by ID.
     """
     job_history_service = JobHistoryService(db)
-    return job_history_service.delete_job_history(job_history_id)
+    return await job_history_service.delete_job_history(job_history_id)
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+from app.utils.metrics import CONTENT_TYPE, metrics_registry
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Expose metrics in the Prometheus text format: per-route request counts
+    and latency, in-flight requests, the database pool, password hashing,
+    caches and token issuance. Aggregated over all workers when
+    METRICS_MULTIPROCESS_DIR is set.
+    """
+    return Response(metrics_registry.render(), media_type=CONTENT_TYPE)
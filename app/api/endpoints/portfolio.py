@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_db
+from app.schemas.portfolio import PortfolioResponse
+from app.services.portfolio_service import PortfolioService
+from app.utils.conditional_utils import Validators
+from app.utils.query_tracking import query_budget
+from app.utils.serialization_utils import TrustedJSONResponse
+
+router = APIRouter()
+
+
+@router.get("/portfolio/{user_id}", response_model=PortfolioResponse)
+# One read; rebuilding a missing or stale snapshot adds the five-query portfolio load and the upsert
+@query_budget(7)
+async def get_portfolio(user_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Get a user's full portfolio: job history, projects and their skills.
+
+    Served from the precomputed snapshot, which is rebuilt in the background
+    after writes, or on read if it is older than its source rows. Supports `If-None-Match` and `If-Modified-Since`.
+    """
+    portfolio_service = PortfolioService(db)
+    snapshot = await portfolio_service.get_snapshot(user_id)
+    validators = Validators.from_parts(user_id, snapshot.version, last_modified=snapshot.generated_at)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    return validators.apply(TrustedJSONResponse(snapshot.document.encode()))
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from app.utils.profiling import profiler, verify_profile_header
+
+router = APIRouter()
+
+
+@router.put("/debug/profiling", include_in_schema=False)
+async def set_profiling_sample_rate(
+    sample_rate: float = Query(..., ge=0, le=1),
+    x_profile: str = Header(""),
+):
+    """
+    Change the fraction of requests this worker profiles.
+
+    Requires the same signed `X-Profile` header as an individual trace
+    request (see `sign_profile_header`).
+    """
+    if not verify_profile_header(x_profile):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="A valid signed X-Profile header is required.",
+        )
+    profiler.sample_rate = sample_rate
+    return {"sample_rate": profiler.sample_rate, "traces_written": profiler.traces_written}
@@ -1,47 +1,84 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from typing import List
-from app.db.database import get_db
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_db, get_session_factory
 from app.db.dependency import get_current_user
-from app.services.user_service import UserService
+from app.services.user_service import UserService, user_serializer
+from app.schemas.pagination import Page
 from app.schemas.user import UserResponse
-from app.models.user import User
+from app.utils.pagination_utils import PageParams
+from app.utils.query_tracking import query_budget
+from app.utils.serialization_utils import TrustedJSONResponse
+from app.utils.streaming_utils import ExportFormat
+from app.schemas.user import AuthenticatedUser
 
 router = APIRouter()
 
-@router.get("/users", response_model=List[UserResponse])
+@router.get("/users", response_model=Page[UserResponse])
+@query_budget(2)
 async def get_users(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """
-    Get a list of all users.
+    Get a page of users. Pass `next_cursor` back as `cursor` for the next page.
     """
     user_service = UserService(db)
-    return user_service.get_all_users()
+    return TrustedJSONResponse(await user_service.get_users_page(page.limit, page.cursor))
+
+
+@router.get("/users/export")
+async def export_users(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    session_factory=Depends(get_session_factory),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """
+    Stream every user as NDJSON or a JSON array.
+    """
+    return UserService.export_users(session_factory, export_format)
 
 
 @router.get("/users/{user_id}", response_model=UserResponse)
+@query_budget(3)
 async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
+):
+    """
+    Get a user by ID. Supports `If-None-Match` and `If-Modified-Since`.
+    """
+    user_service = UserService(db)
+    validators = await user_service.get_user_validators(user_id)
+    if validators.is_fresh(request):
+        return validators.not_modified()
+    user = await user_service.get_user_by_id(user_id)
+    return validators.apply(TrustedJSONResponse(user_serializer(user)))
+
+
+@router.post("/users/{user_id}/deactivate")
+async def deactivate_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """
-    Get a user by ID.
+    Deactivate a user by ID. Their tokens stop working on every worker.
     """
     user_service = UserService(db)
-    return user_service.get_user_by_id(user_id)
+    return await user_service.deactivate_user_by_id(user_id)
 
 
 @router.delete("/users/{user_id}")
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """
     Delete a user by ID.
     """
     user_service = UserService(db)
-    return user_service.delete_user_by_id(user_id)
\ No newline at end of file
+    return await user_service.delete_user_by_id(user_id)
\ No newline at end of file
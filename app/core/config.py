@@ -23,6 +23,92 @@ class Config:
 
     # Database settings
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    # Connection pool: at most size + overflow connections per worker process
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", 30))
+    # Replace connections older than this, ahead of server/proxy idle limits (-1 disables)
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", 1800))
+    # Ping a connection on checkout only after it sat idle this long (0 pings every checkout, -1 never)
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = float(os.getenv("DB_POOL_PRE_PING_IDLE_SECONDS", 30))
+
+    # Server settings (start_server.py). Development runs one auto-reloading
+    # uvicorn process; every other ENV runs gunicorn with uvicorn workers.
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", 8000))
+    SERVER_RELOAD: bool = os.getenv("SERVER_RELOAD", str(ENV == "development")).lower() == "true"
+    SERVER_WORKERS: int = int(os.getenv("SERVER_WORKERS", os.cpu_count() or 1))
+    SERVER_LOOP: str = os.getenv("SERVER_LOOP", "uvloop")
+    SERVER_HTTP: str = os.getenv("SERVER_HTTP", "httptools")
+    SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", 2048))
+    SERVER_KEEPALIVE_SECONDS: int = int(os.getenv("SERVER_KEEPALIVE_SECONDS", 5))
+    # Requests a worker handles at once before answering 503 (0 is unlimited)
+    SERVER_LIMIT_CONCURRENCY: int = int(os.getenv("SERVER_LIMIT_CONCURRENCY", 0))
+    # Recycle each worker after max requests + a random 0..jitter, so they don't all restart together (0 disables)
+    SERVER_MAX_REQUESTS: int = int(os.getenv("SERVER_MAX_REQUESTS", 10000))
+    SERVER_MAX_REQUESTS_JITTER: int = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", 1000))
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = int(os.getenv("SERVER_GRACEFUL_TIMEOUT_SECONDS", 30))
+
+    # Startup and shutdown. Warmup opens this many pooled connections before the
+    # app reports ready; on SIGTERM a production worker reports draining and
+    # gives in-flight requests up to the drain time to finish (keep it below
+    # SERVER_GRACEFUL_TIMEOUT_SECONDS).
+    DB_POOL_WARMUP_CONNECTIONS: int = int(os.getenv("DB_POOL_WARMUP_CONNECTIONS", 5))
+    SHUTDOWN_DRAIN_SECONDS: float = float(os.getenv("SHUTDOWN_DRAIN_SECONDS", 20))
+    # Then queued portfolio snapshot rebuilds get this long (leftovers are rebuilt on read)
+    SNAPSHOT_DRAIN_SECONDS: float = float(os.getenv("SNAPSHOT_DRAIN_SECONDS", 5))
+
+    # Pagination settings for list endpoints
+    PAGE_SIZE_DEFAULT: int = int(os.getenv("PAGE_SIZE_DEFAULT", 50))
+    PAGE_SIZE_MAX: int = int(os.getenv("PAGE_SIZE_MAX", 200))
+
+    # Rows fetched per round trip by streaming exports
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+    # Per-request SQL tracking (Server-Timing header, N+1 warnings, query budgets)
+    QUERY_TRACKING_ENABLED: bool = os.getenv("QUERY_TRACKING_ENABLED", "true").lower() == "true"
+    # Identical statements within one request that get flagged as a likely N+1
+    QUERY_REPEAT_THRESHOLD: int = int(os.getenv("QUERY_REPEAT_THRESHOLD", 5))
+    # Raise instead of logging when an endpoint exceeds its `query_budget` (on in tests)
+    QUERY_BUDGET_STRICT: bool = os.getenv("QUERY_BUDGET_STRICT", "false").lower() == "true"
+
+    # Prometheus metrics on /metrics. With a multiprocess directory, each worker
+    # writes its figures there and /metrics reports the sum over all workers.
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_MULTIPROCESS_DIR: str = os.getenv("METRICS_MULTIPROCESS_DIR", "")
+    METRICS_FLUSH_SECONDS: float = float(os.getenv("METRICS_FLUSH_SECONDS", 5))
+
+    # Request profiling. Requests carrying an `X-Profile` header signed with the
+    # secret (see `sign_profile_header`), plus a random sample, get a
+    # stack-sampling trace written to the directory as collapsed stacks.
+    PROFILING_SECRET: str = os.getenv("PROFILING_SECRET", "")  # Empty disables signed requests
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", 0))
+    PROFILING_INTERVAL_MS: float = float(os.getenv("PROFILING_INTERVAL_MS", 1))
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "profiles")
+
+    # Read-through cache for service reads: "local" (in-process LRU) or "redis"
+    SERVICE_CACHE_BACKEND: str = os.getenv("SERVICE_CACHE_BACKEND", "local")
+    SERVICE_CACHE_REDIS_URL: str = os.getenv("SERVICE_CACHE_REDIS_URL", "redis://localhost:6379/0")
+    SERVICE_CACHE_MAX_SIZE: int = int(os.getenv("SERVICE_CACHE_MAX_SIZE", 10000))
+    SERVICE_CACHE_TTL_SECONDS: int = int(os.getenv("SERVICE_CACHE_TTL_SECONDS", 60))
+
+    # Verified-token cache settings (entries never outlive the token's `exp`)
+    TOKEN_CACHE_MAX_SIZE: int = int(os.getenv("TOKEN_CACHE_MAX_SIZE", 10000))
+    TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", 300))
+
+    # Password hashing pool: bcrypt runs in worker processes, off the event loop.
+    # Requests beyond workers + queue size are rejected with 503.
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_QUEUE_SIZE: int = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", 16))
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = int(os.getenv("PASSWORD_HASH_RETRY_AFTER_SECONDS", 1))
+
+    # Expired-token purge job (interval 0 disables it)
+    TOKEN_PURGE_INTERVAL_SECONDS: int = int(os.getenv("TOKEN_PURGE_INTERVAL_SECONDS", 3600))
+    TOKEN_PURGE_BATCH_SIZE: int = int(os.getenv("TOKEN_PURGE_BATCH_SIZE", 1000))
+    TOKEN_PURGE_BATCH_PAUSE_SECONDS: float = float(os.getenv("TOKEN_PURGE_BATCH_PAUSE_SECONDS", 0.1))
+
+    # Upper bound on how long a revocation takes to reach every worker
+    TOKEN_REVOCATION_SYNC_SECONDS: int = int(os.getenv("TOKEN_REVOCATION_SYNC_SECONDS", 5))
 
 
 # Initialize a global `config` object for use throughout the app
@@ -0,0 +1,89 @@
+import uvicorn
+from app.core.config import config
+from app.utils.lifecycle import lifecycle
+from app.utils.metrics import clear_snapshots, mark_process_dead
+
+APP = "app.main:app"
+
+
+class DrainingServer(uvicorn.Server):
+    """
+    Uvicorn server that reports not ready as soon as it is told to exit.
+
+    The signal handler runs before the listeners close, so requests still
+    being served during the graceful shutdown (up to SHUTDOWN_DRAIN_SECONDS)
+    see `/health/ready` answer "draining".
+    """
+
+    def handle_exit(self, sig, frame) -> None:
+        lifecycle.begin_drain()
+        super().handle_exit(sig, frame)
+
+
+def child_exit(server, worker) -> None:
+    """
+    Gunicorn hook, run in the master after reaping a worker: fold the
+    worker's metrics into the aggregate before its PID can be reused.
+    """
+    mark_process_dead(config.METRICS_MULTIPROCESS_DIR, worker.pid)
+
+
+def gunicorn_options() -> dict:
+    """
+    Build the gunicorn settings for the production server from `config`.
+    """
+    options = {
+        "bind": f"{config.SERVER_HOST}:{config.SERVER_PORT}",
+        "workers": config.SERVER_WORKERS,
+        "worker_class": "app.core.server_worker.ProductionWorker",
+        "backlog": config.SERVER_BACKLOG,
+        "keepalive": config.SERVER_KEEPALIVE_SECONDS,
+        "max_requests": config.SERVER_MAX_REQUESTS,
+        "max_requests_jitter": config.SERVER_MAX_REQUESTS_JITTER,
+        "graceful_timeout": config.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+    }
+    if config.METRICS_MULTIPROCESS_DIR:
+        options["child_exit"] = child_exit
+    return options
+
+
+def run_development() -> None:
+    """
+    Run a single auto-reloading uvicorn process.
+    """
+    uvicorn.run(APP, host=config.SERVER_HOST, port=config.SERVER_PORT, reload=True)
+
+
+def run_production() -> None:
+    """
+    Run gunicorn as the process manager over uvicorn workers.
+
+    Gunicorn provides worker recycling with jitter and restarts crashed
+    workers; each worker serves the app with uvloop and httptools.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    if config.METRICS_MULTIPROCESS_DIR:
+        # Counters from a previous run must not be added to this one's
+        clear_snapshots(config.METRICS_MULTIPROCESS_DIR)
+
+    class ProductionApplication(BaseApplication):
+        def load_config(self):
+            for key, value in gunicorn_options().items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+            return app
+
+    ProductionApplication().run()
+
+
+def run() -> None:
+    """
+    Start the server in the mode selected by SERVER_RELOAD (on in development).
+    """
+    if config.SERVER_RELOAD:
+        run_development()
+    else:
+        run_production()
@@ -0,0 +1,33 @@
+import sys
+from gunicorn.arbiter import Arbiter
+from uvicorn_worker import UvicornWorker
+from app.core.config import config
+from app.core.server import DrainingServer
+
+
+class ProductionWorker(UvicornWorker):
+    """
+    Uvicorn worker for gunicorn using the event loop, HTTP parser and
+    concurrency limit from `config`. Gunicorn passes its own backlog and
+    keep-alive settings through.
+
+    On SIGTERM the worker reports draining, stops accepting connections and
+    gives in-flight requests SHUTDOWN_DRAIN_SECONDS to finish before
+    cancelling them and running the lifespan shutdown.
+    """
+    CONFIG_KWARGS = {
+        "loop": config.SERVER_LOOP,
+        "http": config.SERVER_HTTP,
+        "lifespan": "on",
+        "limit_concurrency": config.SERVER_LIMIT_CONCURRENCY or None,
+        "timeout_graceful_shutdown": config.SHUTDOWN_DRAIN_SECONDS,
+    }
+
+    async def _serve(self) -> None:
+        # As in UvicornWorker, with the server flipping readiness on exit
+        self.config.app = self.wsgi
+        server = DrainingServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
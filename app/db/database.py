@@ -1,8 +1,10 @@
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
+from app.core.config import config
+from app.db.pool import InstrumentedQueuePool, install_idle_pre_ping
+from app.utils.query_tracking import instrument_engine
 
 # Load environment variables from the .env file
 load_dotenv()
@@ -14,24 +16,75 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL is not set in the environment variables.")
 
-# Initialize the SQLAlchemy engine
-# Use `pool_pre_ping=True` to check if connections are alive
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 
-# Create a configured "Session" class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_async_database_url(url: str) -> str:
+    """
+    Convert a synchronous PostgreSQL URL into its asyncpg equivalent.
+
+    Alembic keeps using the plain (psycopg2) URL, so the same DATABASE_URL
+    can be shared by migrations and the application.
+
+    Args:
+        url (str): Database URL as found in the environment.
+
+    Returns:
+        str: The URL with an async driver.
+    """
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+
+# Initialize the SQLAlchemy async engine with the pool settings from `config`
+engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW,
+    pool_timeout=config.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=config.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=config.DB_POOL_PRE_PING_IDLE_SECONDS == 0,
+)
+if config.DB_POOL_PRE_PING_IDLE_SECONDS > 0:
+    install_idle_pre_ping(engine, config.DB_POOL_PRE_PING_IDLE_SECONDS)
+instrument_engine(engine)
+
+# Create a configured "AsyncSession" class
+# `expire_on_commit=False` keeps loaded attributes usable after a commit,
+# since lazy refreshes are not possible outside of an awaited call.
+AsyncSessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 # Base class for all models
 Base = declarative_base()
 
 # Dependency for FastAPI to manage the session lifecycle
-def get_db():
+async def get_db():
     """
     Dependency to get the database session.
     Ensures that the session is properly closed after use.
+
+    FastAPI caches dependencies per request, so the handler and
+    `get_current_user` share this one session. The session only checks out
+    a pooled connection on its first query, so requests that never touch
+    the database hold no connection at all.
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+
+def get_session_factory():
+    """
+    Dependency returning the session factory itself.
+
+    Streaming responses are consumed after request-scoped dependencies have
+    exited, so they open and close their own session with this factory.
+    """
+    return AsyncSessionLocal
@@ -1,34 +1,48 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_db
 from app.models.user import User
+from app.schemas.user import AuthenticatedUser
+from app.utils.token_cache import token_cache
+from app.utils.token_revocation import revocation_list
+from app.utils.database_utils import DatabaseUtils
 from app.utils.token_utils import decode_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # Dependency to get the current user
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+) -> AuthenticatedUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    # Both the revocation set and the token cache are keyed by the token's digest
+    digest = token_cache.digest(token)
+    if revocation_list.is_digest_revoked(digest):
+        raise credentials_exception
+
+    # Tokens verified recently skip the JWT decode and the user lookup
+    cached = token_cache.get_digest(digest)
+    if cached is not None:
+        return cached[1]
+
     payload = decode_access_token(token)
     if payload is None:
         raise credentials_exception
     email: str = payload.get("sub")
     if email is None:
         raise credentials_exception
-    user = db.query(User).filter(User.email == email).first()
+    result = await db.execute(
+        DatabaseUtils.select_for(User, AuthenticatedUser).where(User.email == email)
+    )
+    user = result.scalars().first()
     if user is None:
         raise credentials_exception
-    return user
+
+    current_user = AuthenticatedUser.model_validate(user)
+    token_cache.set_digest(digest, payload, current_user)
+    return current_user
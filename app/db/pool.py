@@ -0,0 +1,127 @@
+import logging
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the checkout latency histogram
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMetrics:
+    """
+    Checkout counters for the application's connection pool.
+
+    Kept outside the pool because `engine.dispose()` replaces the pool
+    instance, and the counters should survive that.
+    """
+
+    def __init__(self):
+        self.waiters = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
+        self.checkout_buckets = [0] * len(CHECKOUT_BUCKETS)
+        self.pings = 0
+        self.ping_failures = 0
+
+    def observe_checkout(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.checkout_seconds_total += seconds
+        self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+        for index, bound in enumerate(CHECKOUT_BUCKETS):
+            if seconds <= bound:
+                self.checkout_buckets[index] += 1
+                break
+
+    def stats(self, pool) -> dict:
+        """
+        Return the pool's current occupancy along with the checkout counters.
+
+        Args:
+            pool: The engine's pool (`engine.pool`).
+        """
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "waiters": self.waiters,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "checkout_seconds_total": self.checkout_seconds_total,
+            "checkout_seconds_max": self.checkout_seconds_max,
+            "checkout_buckets": dict(zip(CHECKOUT_BUCKETS, self.checkout_buckets)),
+            "pings": self.pings,
+            "ping_failures": self.ping_failures,
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    The default async queue pool, recording checkout latency and waiters into `pool_metrics`.
+
+    Latency covers the whole checkout: waiting for a free connection,
+    opening a new one and any pre-ping.
+    """
+
+    def connect(self):
+        # No idle connection and no overflow room left: this checkout queues
+        waiting = (
+            self._max_overflow > -1
+            and self.overflow() >= self._max_overflow
+            and self.checkedin() == 0
+        )
+        if waiting:
+            pool_metrics.waiters += 1
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        finally:
+            if waiting:
+                pool_metrics.waiters -= 1
+        pool_metrics.observe_checkout(time.perf_counter() - started)
+        return connection
+
+
+def install_idle_pre_ping(engine, idle_seconds: float) -> None:
+    """
+    Ping connections on checkout only when they have sat idle for `idle_seconds`.
+
+    A connection that was just returned is almost certainly alive, so this
+    skips the extra round trip `pool_pre_ping=True` adds to every checkout
+    while still catching connections the server or a proxy dropped while
+    idle. A failed ping makes the pool replace the connection.
+
+    Args:
+        engine: The async engine whose pool should be pinged.
+        idle_seconds (float): Minimum idle time before a checkout pings.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "checkin")
+    def record_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.pop("checked_in_at", None)
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        pool_metrics.pings += 1
+        try:
+            sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            pool_metrics.ping_failures += 1
+            logger.warning("Discarding pooled connection that failed its ping: %s", e)
+            # The pool invalidates this connection and checks out another
+            raise exc.DisconnectionError() from e
+
+
+# Global metrics for the application pool
+pool_metrics = PoolMetrics()
@@ -1,8 +1,68 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.endpoints import routers  # Import the routers list from the endpoints module
+from app.core.config import config
+from app.db.database import get_session_factory
+from app.utils.lifecycle import InFlightMiddleware, lifecycle, warm_up
+from app.utils.metrics import MetricsMiddleware, metrics_registry
+from app.utils.password_pool import password_hasher
+from app.utils.portfolio_snapshots import snapshot_refresher
+from app.utils.profiling import ProfilingMiddleware, profiler
+from app.utils.query_tracking import QueryTrackingMiddleware
+from app.utils.serialization_utils import TrustedJSONResponse
+from app.utils.token_purge import run_token_purge
+from app.utils.token_revocation import revocation_list
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm up the connection pool and hot caches, then report ready. Keep token
+    revocations in sync across workers, run the portfolio snapshot refresher
+    and schedule the expired-token purge. In multiprocess metrics mode,
+    publish this worker's metrics for the others to aggregate.
+
+    On shutdown, which the server runs once in-flight requests have drained,
+    stop background work, rebuild the snapshots still queued and close the pool.
+
+    Sessions come from `get_session_factory`, honouring
+    `app.dependency_overrides`, so tests can point the lifespan at their own database.
+    """
+    session_factory = app.dependency_overrides.get(get_session_factory, get_session_factory)()
+    engine = session_factory.kw["bind"]
+    warmup_seconds = await warm_up(engine, session_factory, config.DB_POOL_WARMUP_CONNECTIONS)
+    tasks = [
+        asyncio.create_task(
+            revocation_list.run_sync(session_factory, config.TOKEN_REVOCATION_SYNC_SECONDS)
+        ),
+    ]
+    tasks.append(asyncio.create_task(snapshot_refresher.run(session_factory)))
+    if config.TOKEN_PURGE_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(run_token_purge(session_factory)))
+    if config.METRICS_MULTIPROCESS_DIR:
+        tasks.append(asyncio.create_task(
+            metrics_registry.run_flush(config.METRICS_MULTIPROCESS_DIR, config.METRICS_FLUSH_SECONDS)
+        ))
+    lifecycle.mark_ready(warmup_seconds)
+    logger.info("Ready after %.2fs of warmup", warmup_seconds)
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await snapshot_refresher.drain(session_factory, config.SNAPSHOT_DRAIN_SECONDS)
+    password_hasher.shutdown()
+    await engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=TrustedJSONResponse)
+
+# Innermost, so traces start at routing and dependency resolution
+app.add_middleware(ProfilingMiddleware, profiler=profiler)
 
 # Add CORS Middleware
 origins = ["http://localhost:3000", "http://127.0.0.1:3000"]
@@ -13,8 +73,11 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryTrackingMiddleware)
+app.add_middleware(MetricsMiddleware)
+# Outermost, so the in-flight count covers the whole request including streamed bodies
+app.add_middleware(InFlightMiddleware, lifecycle=lifecycle)
 
 # Include all routers from the endpoints
 for route in routers:
     app.include_router(route["router"], prefix=route["prefix"], tags=route["tags"])
-
@@ -3,6 +3,7 @@ from app.models.token import Token
 from app.models.job_history import JobHistory
 from app.models.project import Project
 from app.models.skill import Skill
+from app.models.portfolio_snapshot import PortfolioSnapshot
 from app.models.associations.job_history_skills import job_history_skills
 from app.models.associations.project_skills import project_skills
 
@@ -12,6 +13,7 @@ __all__ = [
     "JobHistory",
     "Project",
     "Skill",
+    "PortfolioSnapshot",
     "job_history_skills",
     "project_skills",
 ]
@@ -16,6 +16,7 @@ project_skills = Table(
         Integer,
         ForeignKey("skills.id"),
         primary_key=True,
+        index=True,
         doc="Foreign key linking to the Skill model."
     )
 )
@@ -1,32 +1,46 @@
-from sqlalchemy import Column, DateTime
+from functools import lru_cache
+from operator import attrgetter
+from sqlalchemy import Column, DateTime, func
 from sqlalchemy.ext.declarative import declared_attr
-from datetime import datetime, timezone
 from app.db.database import Base
 
 
+@lru_cache(maxsize=None)
+def _column_getter(model) -> tuple:
+    """
+    Column names of a model and a getter returning their values as a tuple.
+    """
+    names = tuple(column.name for column in model.__table__.columns)
+    return names, attrgetter(*names)
+
+
 class BaseModel(Base):
     __abstract__ = True  # Ensure this doesn't create a table
 
+    # Fetch server-generated values (ids, timestamps) with RETURNING on
+    # INSERT/UPDATE instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
     @declared_attr
     def created_at(cls):
         """
-        Timestamp for when the record is created. Defaults to the current UTC time.
+        Timestamp for when the record is created. Set by the database on insert.
         """
         return Column(
-            DateTime, 
-            default=datetime.now(timezone.utc), 
+            DateTime(timezone=True),
+            server_default=func.now(),
             nullable=False
         )
 
     @declared_attr
     def updated_at(cls):
         """
-        Timestamp for when the record is last updated. Automatically updates to the current UTC time.
+        Timestamp for when the record is last updated. Set by the database on insert and update.
         """
         return Column(
-            DateTime,
-            default=datetime.now(timezone.utc),
-            onupdate=datetime.now(timezone.utc),
+            DateTime(timezone=True),
+            server_default=func.now(),
+            onupdate=func.now(),
             nullable=False
         )
 
@@ -34,7 +48,8 @@ class BaseModel(Base):
         """
         Convert model instance to a dictionary for serialization.
         """
-        return {column.name: getattr(self, column.name) for column in self.__table__.columns}
+        names, getter = _column_getter(type(self))
+        return dict(zip(names, getter(self)))
 
     def __repr__(self):
         """
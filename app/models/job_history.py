@@ -1,5 +1,6 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index, func, or_
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship, validates
 from app.models.base_model import BaseModel
 
@@ -23,8 +24,7 @@ class JobHistory(BaseModel):
     user_id = Column(
         Integer,
         ForeignKey("users.id"),
-        index=True,
-        doc="Foreign key linking to the User model."
+        doc="Foreign key linking to the User model. Indexed by `ix_job_histories_user_id_is_active_start_date`."
     )
 
     location = Column(
@@ -49,18 +49,26 @@ class JobHistory(BaseModel):
     )
 
     start_date = Column(
-        DateTime,
+        DateTime(timezone=True),
         default=lambda: datetime.now(timezone.utc),
         nullable=False,
         doc="The start date of the job."
     )
 
     end_date = Column(
-        DateTime,
+        DateTime(timezone=True),
         nullable=True,
         doc="The end date of the job. Nullable for active jobs."
     )
 
+    __table_args__ = (
+        # Serves "a user's (active) jobs, newest first"
+        Index(
+            "ix_job_histories_user_id_is_active_start_date",
+            user_id, is_active, start_date.desc(),
+        ),
+    )
+
     user = relationship(
         "User",
         back_populates="job_histories",
@@ -80,12 +88,19 @@ class JobHistory(BaseModel):
         doc="Many-to-Many relationship linking to the Skill model."
     )
 
-    @property
+    @hybrid_property
     def is_current(self):
         """
         Determine if the job is still active based on the end_date.
 
+        Usable in queries as well, e.g. `select(JobHistory).where(JobHistory.is_current)`.
+
         Returns:
             bool: True if the job is active, False otherwise.
         """
         return self.end_date is None or self.end_date > datetime.now(timezone.utc)
+
+    @is_current.inplace.expression
+    @classmethod
+    def _is_current_expression(cls):
+        return or_(cls.end_date.is_(None), cls.end_date > func.now())
@@ -0,0 +1,97 @@
+from sqlalchemy import Column, Integer, BigInteger, Text, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.hybrid import hybrid_property
+from app.models.base_model import BaseModel
+
+
+class PortfolioSnapshot(BaseModel):
+    """
+    A user's complete portfolio, materialized as the JSON document served by
+    `GET /portfolio/{user_id}`.
+
+    Each row is replaced with a single upsert, so readers see either the
+    previous or the next document, never a partial one.
+
+    Writes to the portfolio's source rows call `mark_stale` in their own
+    transaction, so a snapshot that missed a write is known to be stale even
+    if the worker that was going to rebuild it dies.
+    """
+    __tablename__ = "portfolio_snapshots"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+        doc="The user whose portfolio this is. The snapshot is dropped with the user."
+    )
+
+    version = Column(
+        BigInteger,
+        nullable=False,
+        default=1,
+        doc="Incremented every time the document is replaced; used as the ETag."
+    )
+
+    document = Column(
+        Text,
+        nullable=True,
+        doc="The serialized `PortfolioResponse` JSON. Null until the first build after `mark_stale`."
+    )
+
+    generated_at = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        doc="Start of the transaction that read the source rows. Null until the first build."
+    )
+
+    source_version = Column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        doc="Incremented by `mark_stale` in the same transaction as every write to the portfolio."
+    )
+
+    built_from_version = Column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        doc=(
+            "The `source_version` read before the document's source rows were. Builds "
+            "from an older `source_version` never replace newer ones."
+        )
+    )
+
+    @hybrid_property
+    def is_stale(self) -> bool:
+        """
+        Check if a write has committed since the document was built, or it never was.
+
+        Usable in queries as well, e.g. to find snapshots that need a rebuild.
+        """
+        return self.document is None or self.built_from_version < self.source_version
+
+    @is_stale.inplace.expression
+    @classmethod
+    def _is_stale_expression(cls):
+        return cls.document.is_(None) | (cls.built_from_version < cls.source_version)
+
+    @staticmethod
+    async def mark_stale(db, user_id: int) -> None:
+        """
+        Record that a user's portfolio changed. Call in the write's transaction, before it commits.
+
+        Creates an unbuilt row if the user has no snapshot yet, so a build
+        already in progress cannot store a document that misses the write.
+        Concurrent writes for one user serialize on the row until they commit.
+
+        Args:
+            db: The async database session.
+            user_id (int): The user whose portfolio changed.
+        """
+        statement = pg_insert(PortfolioSnapshot).values(user_id=user_id, source_version=1)
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[PortfolioSnapshot.user_id],
+                set_={"source_version": PortfolioSnapshot.source_version + 1},
+            )
+        )
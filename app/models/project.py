@@ -19,6 +19,7 @@ class Project(BaseModel):
         Integer,
         ForeignKey("users.id"),
         nullable=False,
+        index=True,
         doc="Foreign key linking to the User model."
     )
 
@@ -26,6 +27,7 @@ class Project(BaseModel):
         Integer,
         ForeignKey("job_histories.id"),
         nullable=True,
+        index=True,
         doc="Foreign key linking to the JobHistory model."
     )
 
@@ -42,13 +44,13 @@ class Project(BaseModel):
     )
 
     start_date = Column(
-        DateTime,
+        DateTime(timezone=True),
         nullable=False,
         doc="Start date of the project."
     )
 
     end_date = Column(
-        DateTime,
+        DateTime(timezone=True),
         nullable=True,
         doc="Optional end date of the project."
     )
@@ -1,7 +1,10 @@
+import asyncio
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, delete, func, or_, select, update
+from sqlalchemy.ext.hybrid import hybrid_method, hybrid_property
 from sqlalchemy.orm import relationship, validates
 from app.models.base_model import BaseModel
+from app.utils.security_utils import TOKEN_DIGEST_LENGTH
 
 
 class Token(BaseModel):
@@ -20,35 +23,40 @@ class Token(BaseModel):
     )
 
     token = Column(
-        String,
+        String(TOKEN_DIGEST_LENGTH),
         nullable=False,
         unique=True,
-        doc="The JWT access token. Must be unique and not nullable."
+        doc="Digest of the JWT access token (see `generate_secure_value`). Must be unique and not nullable."
     )
 
     refresh_token = Column(
-        String,
+        String(TOKEN_DIGEST_LENGTH),
         nullable=False,
         unique=True,
-        doc="The refresh token. Must be unique and not nullable."
+        doc="Digest of the refresh token (see `generate_secure_value`). Must be unique and not nullable."
     )
 
     user_id = Column(
         Integer,
-        ForeignKey("users.id"),
-        nullable=False,
-        doc="Foreign key referencing the user associated with this token."
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+        doc=(
+            "Foreign key referencing the user associated with this token. Set to null when the "
+            "user is deleted, so the blacklisted row keeps revoking the token until it expires."
+        )
     )
 
     expires_at = Column(
-        DateTime,
+        DateTime(timezone=True),
         nullable=False,
         doc="Expiration time for the access token. Cannot be null."
     )
 
     refresh_expires_at = Column(
-        DateTime,
+        DateTime(timezone=True),
         nullable=False,
+        index=True,
         doc="Expiration time for the refresh token. Cannot be null."
     )
 
@@ -59,6 +67,21 @@ class Token(BaseModel):
         doc="Indicates whether the token has been invalidated. Defaults to False."
     )
 
+    __table_args__ = (
+        # A user's live sessions: `~Token.is_blacklisted` filtered on refresh expiry
+        Index(
+            "ix_tokens_user_id_refresh_expires_at_live",
+            user_id, refresh_expires_at,
+            postgresql_where=~is_blacklisted,
+        ),
+        # The revocation sync: blacklisted tokens whose access token is unexpired
+        Index(
+            "ix_tokens_expires_at_blacklisted",
+            expires_at,
+            postgresql_where=is_blacklisted,
+        ),
+    )
+
     # Relationship to the User model
     user = relationship(
         "User",
@@ -112,11 +135,13 @@ class Token(BaseModel):
             raise ValueError("refresh_expires_at must be after expires_at.")
         return value
 
-    @property
+    @hybrid_property
     def is_expired(self) -> bool:
         """
         Check if the token (access or refresh) has expired.
 
+        Usable in queries as well, e.g. `select(Token).where(~Token.is_expired)`.
+
         Returns:
             bool: True if either the access or refresh token has expired, False otherwise.
         """
@@ -125,43 +150,139 @@ class Token(BaseModel):
         refresh_expires_at = self.refresh_expires_at if self.refresh_expires_at.tzinfo else self.refresh_expires_at.replace(tzinfo=timezone.utc)
         return expires_at < now or refresh_expires_at < now
 
+    @is_expired.inplace.expression
+    @classmethod
+    def _is_expired_expression(cls):
+        return or_(cls.expires_at < func.now(), cls.refresh_expires_at < func.now())
 
-    def is_access_token_expired(self) -> bool:
+    @hybrid_method
+    def is_access_token_expired(self, now: datetime = None) -> bool:
         """
         Check if the access token has expired.
 
+        Usable in queries as well, e.g. `Token.is_access_token_expired()`.
+
+        Args:
+            now (datetime, optional): Time to compare against. Defaults to the current time.
+
         Returns:
             bool: True if the access token has expired, False otherwise.
         """
-        return self.expires_at < datetime.now(timezone.utc)
+        return self.expires_at < (now or datetime.now(timezone.utc))
 
-    def is_refresh_token_expired(self) -> bool:
+    @is_access_token_expired.inplace.expression
+    @classmethod
+    def _is_access_token_expired_expression(cls, now: datetime = None):
+        return cls.expires_at < (now if now is not None else func.now())
+
+    @hybrid_method
+    def is_refresh_token_expired(self, now: datetime = None) -> bool:
         """
         Check if the refresh token has expired.
 
+        Usable in queries as well, e.g. `Token.is_refresh_token_expired()`.
+
+        Args:
+            now (datetime, optional): Time to compare against. Defaults to the current time.
+
         Returns:
             bool: True if the refresh token has expired, False otherwise.
         """
-        return self.refresh_expires_at < datetime.now(timezone.utc)
+        return self.refresh_expires_at < (now or datetime.now(timezone.utc))
+
+    @is_refresh_token_expired.inplace.expression
+    @classmethod
+    def _is_refresh_token_expired_expression(cls, now: datetime = None):
+        return cls.refresh_expires_at < (now if now is not None else func.now())
+
+    @hybrid_property
+    def is_live(self) -> bool:
+        """
+        Check if the token can still be used to refresh: not blacklisted and
+        the refresh token has not expired.
+
+        Usable in queries as well, e.g. to count a user's active sessions.
+        """
+        return not self.is_blacklisted and not self.is_refresh_token_expired()
+
+    @is_live.inplace.expression
+    @classmethod
+    def _is_live_expression(cls):
+        return ~cls.is_blacklisted & ~cls.is_refresh_token_expired()
 
     def blacklist(self) -> None:
         """
         Blacklist the token, marking it as invalidated.
+
+        Once the change is committed, record it with `revocation_list.revoke_digest`
+        so this worker rejects the token without waiting for the next sync.
         """
         self.is_blacklisted = True
         # Optionally add a timestamp to track when it was blacklisted:
         # self.blacklisted_at = datetime.now(timezone.utc)
 
     @staticmethod
-    def delete_expired_tokens(db):
+    async def revoke_user_tokens(db, user_id: int) -> list[tuple[str, datetime]]:
+        """
+        Blacklist every live token of a user, e.g. when the account is deactivated.
+
+        The blacklisted rows are what the other workers' revocation sync
+        reads, so the user's access tokens stop working everywhere within
+        TOKEN_REVOCATION_SYNC_SECONDS, including tokens already in their
+        token caches. Does not commit; pass the result to
+        `revocation_list.revoke_digests` once the transaction has committed.
+
+        Args:
+            db: The async database session.
+            user_id (int): The user whose tokens are revoked.
+
+        Returns:
+            list[tuple[str, datetime]]: Digest and access token expiry of each token blacklisted.
+        """
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            update(Token)
+            .where(Token.user_id == user_id, ~Token.is_blacklisted, ~Token.is_refresh_token_expired(now))
+            .values(is_blacklisted=True)
+            .returning(Token.token, Token.expires_at)
+            .execution_options(synchronize_session=False)
+        )
+        return [(digest, expires_at) for digest, expires_at in result]
+
+    @staticmethod
+    async def delete_expired_tokens(db, batch_size: int = 1000, pause_seconds: float = 0) -> int:
         """
-        Delete all expired tokens (both access and refresh) from the database.
+        Delete tokens whose refresh token has expired, in bounded batches.
+
+        Rows whose access token has expired are kept until the refresh token
+        expires, since they are still needed to refresh. Each batch is its own
+        short transaction, and `SKIP LOCKED` lets several workers purge at once
+        without waiting on each other.
 
         Args:
-            db: The database session.
+            db: The async database session.
+            batch_size (int): Maximum rows deleted per statement.
+            pause_seconds (float): Sleep between batches to limit load.
+
+        Returns:
+            int: Number of rows deleted.
         """
         now = datetime.now(timezone.utc)
-        db.query(Token).filter(
-            (Token.expires_at < now) | (Token.refresh_expires_at < now)
-        ).delete(synchronize_session=False)
-        db.commit()
+        batch = (
+            select(Token.id)
+            .where(Token.is_refresh_token_expired(now))
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        deleted = 0
+        while True:
+            result = await db.execute(
+                delete(Token).where(Token.id.in_(batch)).execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
+            if pause_seconds:
+                await asyncio.sleep(pause_seconds)
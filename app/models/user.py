@@ -1,11 +1,41 @@
 from sqlalchemy import Column, Integer, String, Boolean
 from sqlalchemy.orm import relationship, validates
 from app.models.base_model import BaseModel
+from app.utils.token_cache import token_cache
 
 # Constants for column lengths
 MAX_EMAIL_LENGTH = 255
 MAX_NAME_LENGTH = 50
 
+
+def check_email(value: str) -> str:
+    """
+    Check that an email address is not empty, looks like an address and fits
+    the column. Used by `User.validate_email` and by Core inserts, which skip it.
+    """
+    if not value or not value.strip():
+        raise ValueError("Email cannot be empty or whitespace.")
+    if len(value) > MAX_EMAIL_LENGTH:
+        raise ValueError(f"Email cannot exceed {MAX_EMAIL_LENGTH} characters.")
+    if "@" not in value or "." not in value:
+        raise ValueError("Email must be a valid email address.")
+    return value
+
+
+def check_name(key: str, value: str) -> str:
+    """
+    Check that a name field is not empty, fits the column and is alphabetic.
+    Used by `User.validate_name` and by Core inserts, which skip it.
+    """
+    label = key.replace('_', ' ').title()
+    if not value or not value.strip():
+        raise ValueError(f"{label} cannot be empty or whitespace.")
+    if len(value) > MAX_NAME_LENGTH:
+        raise ValueError(f"{label} cannot exceed {MAX_NAME_LENGTH} characters.")
+    if not value.isalpha():
+        raise ValueError(f"{label} must contain only alphabetic characters.")
+    return value
+
 class User(BaseModel):
     """
     Represents a user in the system with personal details, credentials, and relationships.
@@ -56,6 +86,7 @@ class User(BaseModel):
     tokens = relationship(
         "Token",
         back_populates="user",
+        passive_deletes=True,
         doc="Relationship to the Token model, representing the user's tokens."
     )
 
@@ -65,6 +96,12 @@ class User(BaseModel):
         doc="Relationship to the JobHistory model, representing the user's job history."
     )
 
+    projects = relationship(
+        "Project",
+        back_populates="user",
+        doc="Relationship to the Project model, representing the user's projects."
+    )
+
     def activate(self):
         """
         Activate the user's account by setting is_active to True.
@@ -74,8 +111,12 @@ class User(BaseModel):
     def deactivate(self):
         """
         Deactivate the user's account by setting is_active to False.
+        Any tokens cached by this worker are invalidated; use
+        `UserService.deactivate_user_by_id` to revoke them on every worker.
         """
         self.is_active = False
+        if self.id is not None:
+            token_cache.invalidate_user(self.id)
 
     @property
     def full_name(self):
@@ -93,14 +134,7 @@ class User(BaseModel):
         Validate the email address to ensure it's not empty, adheres to the correct format,
         and does not exceed the maximum length.
         """
-        if not value or not value.strip():
-            raise ValueError("Email cannot be empty or whitespace.")
-        if len(value) > MAX_EMAIL_LENGTH:
-            raise ValueError(f"Email cannot exceed {MAX_EMAIL_LENGTH} characters.")
-        if "@" not in value or "." not in value:
-            raise ValueError("Email must be a valid email address.")
-        return value
-    
+        return check_email(value)
 
     @validates("first_name", "last_name")
     def validate_name(self, key, value):
@@ -108,13 +142,7 @@ class User(BaseModel):
         Validate the user's name fields to ensure they are not empty, do not exceed the
         maximum length, and consist of valid characters.
         """
-        if not value or not value.strip():
-            raise ValueError(f"{key.replace('_', ' ').title()} cannot be empty or whitespace.")
-        if len(value) > MAX_NAME_LENGTH:
-            raise ValueError(f"{key.replace('_', ' ').title()} cannot exceed {MAX_NAME_LENGTH} characters.")
-        if not value.isalpha():
-            raise ValueError(f"{key.replace('_', ' ').title()} must contain only alphabetic characters.")
-        return value
+        return check_name(key, value)
 
     @validates("hashed_password")
     def validate_password(self, key, value):
@@ -14,8 +14,8 @@ class JobHistoryBase(BaseModel):
     end_date: Optional[datetime] = None
 
     @field_validator("end_date")
-    def validate_active_and_end_date(cls, end_date, values):
-        is_active = values.get("is_active")
+    def validate_active_and_end_date(cls, end_date, info):
+        is_active = info.data.get("is_active")
         if is_active and end_date is not None:
             raise ValueError("An active job can't have an end date.")
         if not is_active and end_date is None:
@@ -24,7 +24,7 @@ class JobHistoryBase(BaseModel):
 
     @field_validator("start_date")
     def validate_start_date(cls, start_date):
-        if start_date > datetime.now():
+        if start_date > datetime.now(start_date.tzinfo):
             raise ValueError("Start date cannot be in the future.")
         return start_date
 
@@ -42,13 +42,13 @@ class JobHistoryUpdate(BaseModel):
     """
     location: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = Field(None, max_length=500)
-    is_active: Optional[bool]
-    start_date: Optional[datetime]
-    end_date: Optional[datetime]
+    is_active: Optional[bool] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
 
     @field_validator("end_date")
-    def validate_update_active_and_end_date(cls, end_date, values):
-        is_active = values.get("is_active")
+    def validate_update_active_and_end_date(cls, end_date, info):
+        is_active = info.data.get("is_active")
         if is_active is not None:
             if is_active and end_date is not None:
                 raise ValueError("An active job can't have an end date.")
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """
+    A page of results from a keyset-paginated endpoint.
+    """
+    items: List[T] = Field(..., description="The results on this page.")
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page; null on the last page."
+    )
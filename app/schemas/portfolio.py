@@ -0,0 +1,58 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import List, Optional
+
+
+class PortfolioSkill(BaseModel):
+    """
+    A skill attached to a job or project.
+    """
+    id: int
+    name: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PortfolioProject(BaseModel):
+    """
+    A project in a user's portfolio. `job_history_id` links it to the job it
+    was done in, or is None for personal projects.
+    """
+    id: int
+    job_history_id: Optional[int] = None
+    name: str
+    description: Optional[str] = None
+    start_date: datetime
+    end_date: Optional[datetime] = None
+    skills: List[PortfolioSkill]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PortfolioJobHistory(BaseModel):
+    """
+    A job history entry in a user's portfolio.
+    """
+    id: int
+    location: str
+    description: Optional[str] = None
+    is_active: bool
+    start_date: datetime
+    end_date: Optional[datetime] = None
+    skills: List[PortfolioSkill]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PortfolioResponse(BaseModel):
+    """
+    A user's full portfolio: their details, job history, projects and skills.
+    """
+    id: int
+    email: str
+    first_name: str
+    last_name: str
+    job_histories: List[PortfolioJobHistory]
+    projects: List[PortfolioProject]
+
+    model_config = ConfigDict(from_attributes=True)
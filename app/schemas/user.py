@@ -36,3 +36,14 @@ class UserResponse(BaseModel):
             }
         }
     )
+
+
+class AuthenticatedUser(BaseModel):
+    """
+    Slim identity of the authenticated user, cached alongside verified tokens.
+    """
+    id: int
+    email: str
+    is_active: bool
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
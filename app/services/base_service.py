@@ -1,9 +1,15 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.utils.database_utils import DatabaseUtils as _database
+from app.utils.service_cache import ServiceCache, service_cache
 
 class BaseService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, cache: ServiceCache = None):
         """
         Initialize the service with a database session and utilities.
+
+        Args:
+            db (AsyncSession): SQLAlchemy async database session.
+            cache (ServiceCache, optional): Read-through cache; defaults to the global `service_cache`.
         """
         self._database = _database(db)
+        self._cache = cache if cache is not None else service_cache
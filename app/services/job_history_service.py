@@ -1,47 +1,136 @@
 from app.models.job_history import JobHistory
-from app.schemas.job_history import JobHistoryCreate, JobHistoryUpdate
+from app.models.portfolio_snapshot import PortfolioSnapshot
+from app.schemas.job_history import JobHistoryCreate, JobHistoryUpdate, JobHistoryResponse
 from app.services.base_service import BaseService
+from app.utils.conditional_utils import Validators
+from app.utils.portfolio_snapshots import snapshot_refresher
+from app.utils.serialization_utils import serializer_for
+from app.utils.streaming_utils import ExportFormat, stream_export
 from fastapi import HTTPException, status
-from datetime import datetime
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timezone
+
+
+job_history_serializer = serializer_for(JobHistoryResponse)
+
+
+def job_history_key(job_history_id: int) -> str:
+    """
+    Cache key for a single job history entry.
+    """
+    return f"job_history:{job_history_id}"
+
+
+def user_jobs_keys(user_id: int) -> tuple[str, str]:
+    """
+    Cache keys for a user's job history lists: all jobs and current jobs.
+    """
+    return f"job_history:user:{user_id}:all", f"job_history:user:{user_id}:current"
 
 
 class JobHistoryService(BaseService):
-    def get_user_jobs(self, user_id: int):
+    async def get_user_jobs(self, user_id: int, current_only: bool = False, version: str = None) -> list[dict]:
         """
-        Get all job history entries for a specific user.
+        Get all job history entries for a specific user, serialized.
+
+        With `current_only`, ended jobs are filtered out in the database.
+        Reads go through the service cache; pass the ETag from
+        `get_user_jobs_validators` as `version` so a cached list is only
+        served if it matches the database.
         """
-        jobs = self._database.find_or_404(JobHistory, user_id=user_id)
-        return jobs
+        async def load():
+            statement = (
+                self._database.select_for(JobHistory, JobHistoryResponse)
+                .where(*self._user_jobs_criteria(user_id, current_only))
+                .order_by(JobHistory.id)
+            )
+            result = await self._database.db.execute(statement)
+            return job_history_serializer.many(result.scalars().all())
+
+        all_key, current_key = user_jobs_keys(user_id)
+        return await self._cache.get_or_load(current_key if current_only else all_key, load, version=version)
 
-    def create_job_history(self, job_history_data: JobHistoryCreate):
+    async def get_job_history(self, job_history_id: int, version: str = None) -> dict:
         """
-        Create a new job history entry.
+        Get a single job history entry, serialized, through the service cache.
         """
-        new_job_history = JobHistory(**job_history_data.dict())
-        return self._database.add_and_commit(new_job_history)
+        async def load():
+            job_history = await self._database.get_by_id(JobHistory, job_history_id, schema=JobHistoryResponse)
+            return job_history_serializer(job_history)
 
-    def edit_job_history(self, job_history_id: int, job_data: JobHistoryUpdate):
+        return await self._cache.get_or_load(job_history_key(job_history_id), load, version=version)
+
+    async def get_job_history_validators(self, job_history_id: int) -> Validators:
         """
-        Edit an existing job history entry.
+        Build the ETag and Last-Modified for a job history entry from `(id, updated_at)` alone.
+        """
+        updated_at = await self._database.get_version(JobHistory, job_history_id)
+        return Validators.from_parts(job_history_id, updated_at, last_modified=updated_at)
+
+    async def get_user_jobs_validators(self, user_id: int, current_only: bool = False) -> Validators:
+        """
+        Build the ETag and Last-Modified for `get_user_jobs` from `max(updated_at)` and `count(*)`.
+
+        The count uses the same filter, so a job dropping out of the current
+        set changes the ETag even though no row was updated.
         """
-        job_history = self._database.get_by_id(JobHistory, job_history_id)
+        last_modified, count = await self._database.get_collection_version(
+            JobHistory, *self._user_jobs_criteria(user_id, current_only)
+        )
+        return Validators.from_parts(user_id, current_only, last_modified, count, last_modified=last_modified)
 
-        for key, value in job_data.model_dump(exclude_unset=True).items():
-            setattr(job_history, key, value)
+    @staticmethod
+    def _user_jobs_criteria(user_id: int, current_only: bool) -> list:
+        criteria = [JobHistory.user_id == user_id]
+        if current_only:
+            criteria.append(JobHistory.is_current)
+        return criteria
 
-        return self._database.commit_and_refresh(job_history)
+    @staticmethod
+    def export_user_jobs(session_factory, user_id: int, export_format: ExportFormat) -> StreamingResponse:
+        """
+        Stream every job history entry for a user, ordered by ID.
+        """
+        return stream_export(session_factory, JobHistory, JobHistoryResponse, export_format, user_id=user_id)
+
+    async def create_job_history(self, job_history_data: JobHistoryCreate):
+        """
+        Create a new job history entry.
+        """
+        new_job_history = JobHistory(**job_history_data.model_dump())
+        await PortfolioSnapshot.mark_stale(self._database.db, new_job_history.user_id)
+        new_job_history = await self._database.add_and_commit(new_job_history)
+        await self._cache.invalidate(*user_jobs_keys(new_job_history.user_id))
+        snapshot_refresher.schedule(new_job_history.user_id)
+        return new_job_history
+
+    async def edit_job_history(self, job_history_id: int, job_data: JobHistoryUpdate):
+        """
+        Edit an existing job history entry.
+        """
+        job_history = await self._database.update_by_id(
+            JobHistory, job_history_id, job_data.model_dump(exclude_unset=True)
+        )
+        await PortfolioSnapshot.mark_stale(self._database.db, job_history.user_id)
+        await self._database.commit()
+        await self._cache.invalidate(job_history_key(job_history_id), *user_jobs_keys(job_history.user_id))
+        snapshot_refresher.schedule(job_history.user_id)
+        return job_history
 
-    def delete_job_history(self, job_history_id: int):
+    async def delete_job_history(self, job_history_id: int):
         """
         Delete a job history entry by ID.
         """
-        job_history = self._database.get_by_id(JobHistory, job_history_id)
+        job_history = await self._database.get_by_id(JobHistory, job_history_id)
 
-        if job_history.end_date and job_history.end_date > datetime.now():
+        if job_history.end_date and job_history.end_date > datetime.now(timezone.utc):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot delete job history with an end date in the future",
             )
 
-        self._database.delete_and_commit(job_history)
+        await PortfolioSnapshot.mark_stale(self._database.db, job_history.user_id)
+        await self._database.delete_and_commit(job_history)
+        await self._cache.invalidate(job_history_key(job_history_id), *user_jobs_keys(job_history.user_id))
+        snapshot_refresher.schedule(job_history.user_id)
         return {"message": "Job history deleted successfully"}
@@ -0,0 +1,129 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import load_only, selectinload
+from app.models.job_history import JobHistory
+from app.models.portfolio_snapshot import PortfolioSnapshot
+from app.models.project import Project
+from app.models.skill import Skill
+from app.models.user import User
+from app.schemas.portfolio import PortfolioJobHistory, PortfolioProject, PortfolioResponse, PortfolioSkill
+from app.services.base_service import BaseService
+from app.utils.database_utils import projected_columns
+from app.utils.serialization_utils import dumps, serializer_for
+from fastapi import HTTPException, status
+
+
+portfolio_serializer = serializer_for(PortfolioResponse)
+
+
+class PortfolioService(BaseService):
+    async def get_portfolio(self, user_id: int) -> dict:
+        """
+        Load a user's portfolio in a fixed five queries, however large it is.
+
+        The user is selected first; job histories, projects and the skills of
+        each are then loaded with one `SELECT ... WHERE id IN (...)` per
+        relationship. Projects carry `job_history_id`, so `JobHistory.projects`
+        needs no query of its own. Returns the portfolio as a dict shaped like
+        `PortfolioResponse`.
+        """
+        statement = (
+            self._database.select_for(User, PortfolioResponse)
+            .where(User.id == user_id)
+            .options(
+                selectinload(User.job_histories).options(
+                    load_only(*projected_columns(JobHistory, PortfolioJobHistory)),
+                    selectinload(JobHistory.skills).load_only(*projected_columns(Skill, PortfolioSkill)),
+                ),
+                selectinload(User.projects).options(
+                    load_only(*projected_columns(Project, PortfolioProject)),
+                    selectinload(Project.skills).load_only(*projected_columns(Skill, PortfolioSkill)),
+                ),
+            )
+        )
+        result = await self._database.db.execute(statement)
+        user = result.scalars().first()
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"User with ID {user_id} not found",
+            )
+        return portfolio_serializer(user)
+
+    async def get_snapshot(self, user_id: int) -> PortfolioSnapshot:
+        """
+        Return the stored portfolio snapshot, rebuilding it now if it is missing
+        or older than its source rows.
+
+        Raises:
+            HTTPException: If the user does not exist.
+        """
+        result = await self._database.db.execute(
+            select(PortfolioSnapshot).where(PortfolioSnapshot.user_id == user_id)
+        )
+        snapshot = result.scalars().first()
+        if snapshot is None:
+            snapshot = await self.refresh_snapshot(user_id, source_version=0)
+        elif snapshot.is_stale:
+            snapshot = await self.refresh_snapshot(user_id, source_version=snapshot.source_version)
+        return snapshot
+
+    async def refresh_snapshot(self, user_id: int, source_version: int = None) -> PortfolioSnapshot:
+        """
+        Rebuild a user's portfolio snapshot and store it with a single upsert.
+
+        The snapshot records the `source_version` read before its source
+        rows were. A write that committed before then is in the document,
+        and any later one has incremented `source_version` past it, so the
+        snapshot reads as stale. A build from an older `source_version` than
+        the stored one does not replace it, so refreshes finishing out of
+        order cannot roll the document back.
+
+        Args:
+            user_id (int): The user whose snapshot is rebuilt.
+            source_version (int, optional): The snapshot's `source_version`, if it was
+                read earlier in this transaction. Read here otherwise.
+
+        Raises:
+            HTTPException: If the user does not exist.
+        """
+        if source_version is None:
+            result = await self._database.db.execute(
+                select(PortfolioSnapshot.source_version).where(PortfolioSnapshot.user_id == user_id)
+            )
+            source_version = result.scalar_one_or_none() or 0
+        portfolio = await self.get_portfolio(user_id)
+        statement = pg_insert(PortfolioSnapshot).values(
+            user_id=user_id,
+            version=1,
+            document=dumps(portfolio).decode(),
+            generated_at=func.now(),
+            source_version=source_version,
+            built_from_version=source_version,
+        )
+        statement = (
+            statement.on_conflict_do_update(
+                index_elements=[PortfolioSnapshot.user_id],
+                set_={
+                    "version": PortfolioSnapshot.version + 1,
+                    "document": statement.excluded.document,
+                    "generated_at": statement.excluded.generated_at,
+                    "built_from_version": statement.excluded.built_from_version,
+                    "updated_at": func.now(),
+                },
+                where=PortfolioSnapshot.document.is_(None)
+                | (PortfolioSnapshot.built_from_version <= statement.excluded.built_from_version),
+            )
+            .returning(PortfolioSnapshot)
+            .execution_options(populate_existing=True)
+        )
+        result = await self._database.db.execute(statement)
+        snapshot = result.scalars().first()
+        await self._database.commit()
+        if snapshot is None:
+            # A build from a newer source version already stored its snapshot
+            result = await self._database.db.execute(
+                select(PortfolioSnapshot).where(PortfolioSnapshot.user_id == user_id)
+            )
+            snapshot = result.scalars().one()
+        return snapshot
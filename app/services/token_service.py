@@ -1,8 +1,12 @@
 from datetime import datetime, timedelta, timezone
 from app.models.token import Token
+from app.schemas.token import TokenResponse
 from app.utils.token_utils import create_access_token, validate_token
 from app.core.config import config
 from app.services.base_service import BaseService
+from app.utils.metrics import tokens_issued
+from app.utils.security_utils import generate_secure_value
+from app.utils.token_revocation import revocation_list
 from fastapi import HTTPException, status
 
 
@@ -10,9 +14,18 @@ class TokenService(BaseService):
     ACCESS_TOKEN_EXPIRE_MINUTES = config.ACCESS_TOKEN_EXPIRE_MINUTES
     REFRESH_TOKEN_EXPIRE_DAYS = config.REFRESH_TOKEN_EXPIRE_DAYS
 
-    def create_token(self, user_id: int, payload: dict) -> Token:
+    async def create_token(self, user_id: int, payload: dict) -> TokenResponse:
         """
-        Create an access and refresh token, save them in the database, and return the tokens.
+        Create an access and refresh token, save their digests in the database, and return the tokens.
+        """
+        token_response = self.stage_token(user_id, payload)
+        await self._database.commit()
+        return token_response
+
+    def stage_token(self, user_id: int, payload: dict) -> TokenResponse:
+        """
+        Create an access and refresh token and add their row to the current
+        transaction without committing, so callers can commit once.
         """
         access_expires_at = datetime.now(timezone.utc) + timedelta(minutes=self.ACCESS_TOKEN_EXPIRE_MINUTES)
         refresh_expires_at = datetime.now(timezone.utc) + timedelta(days=self.REFRESH_TOKEN_EXPIRE_DAYS)
@@ -21,42 +34,48 @@ class TokenService(BaseService):
         refresh_token = create_access_token({"sub": user_id}, timedelta(days=self.REFRESH_TOKEN_EXPIRE_DAYS))
 
         token = Token(
-            token=access_token,
-            refresh_token=refresh_token,
+            token=generate_secure_value(access_token),
+            refresh_token=generate_secure_value(refresh_token),
             user_id=user_id,
             expires_at=access_expires_at,
             refresh_expires_at=refresh_expires_at,
         )
+        self._database.db.add(token)
+        tokens_issued.inc("login")
 
-        return self._database.add_and_commit(token)
+        return TokenResponse(
+            access_token=access_token,
+            refresh_token=refresh_token,
+            token_type="bearer",
+        )
 
-    def validate_access_token(self, token_str: str) -> dict:
+    async def validate_access_token(self, token_str: str) -> dict:
         """
         Validate an access token by checking its blacklist status and decoding it.
         """
         payload = validate_token(token_str)
-        token = self._database.find_or_404(Token, token=token_str)
 
-        if token.is_blacklisted:
+        if revocation_list.is_revoked(token_str):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Token is blacklisted"
             )
 
         return payload
 
-    def blacklist_token(self, token_str: str) -> None:
+    async def blacklist_token(self, token_str: str) -> None:
         """
         Blacklist an access token, preventing further use.
         """
-        token = self._database.find_or_404(Token, token=token_str)
-        token.is_blacklisted = True
-        self._database.commit_and_refresh(token)
+        token = await self._database.find_or_404(Token, token=generate_secure_value(token_str))
+        token.blacklist()
+        await self._database.commit_and_refresh(token)
+        revocation_list.revoke_digest(token.token, token.expires_at)
 
-    def refresh_access_token(self, refresh_token_str: str) -> str:
+    async def refresh_access_token(self, refresh_token_str: str) -> str:
         """
         Refresh an access token using a valid refresh token.
         """
-        token = self._database.find_or_404(Token, refresh_token=refresh_token_str)
+        token = await self._database.find_or_404(Token, refresh_token=generate_secure_value(refresh_token_str))
 
         if token.is_blacklisted:
             raise HTTPException(
@@ -75,19 +94,23 @@ class TokenService(BaseService):
             timedelta(minutes=self.ACCESS_TOKEN_EXPIRE_MINUTES),
         )
 
-        token.token = new_access_token
+        token.token = generate_secure_value(new_access_token)
         token.expires_at = datetime.now(timezone.utc) + timedelta(minutes=self.ACCESS_TOKEN_EXPIRE_MINUTES)
-        self._database.commit_and_refresh(token)
+        await self._database.commit_and_refresh(token)
+        tokens_issued.inc("refresh")
 
         return new_access_token
 
-    def delete_expired_tokens(self) -> None:
+    async def delete_expired_tokens(
+        self, batch_size: int = config.TOKEN_PURGE_BATCH_SIZE,
+        pause_seconds: float = config.TOKEN_PURGE_BATCH_PAUSE_SECONDS,
+    ) -> int:
         """
-        Delete all expired tokens from the database.
+        Delete expired tokens from the database in bounded batches.
+
+        Returns:
+            int: Number of rows deleted.
         """
-        now = datetime.now(timezone.utc)
-        expired_tokens = self._database.db.query(Token).filter(
-            (Token.expires_at < now) | (Token.refresh_expires_at < now)
+        return await Token.delete_expired_tokens(
+            self._database.db, batch_size=batch_size, pause_seconds=pause_seconds
         )
-        for token in expired_tokens:
-            self._database.delete_and_commit(token)
@@ -1,10 +1,23 @@
-from app.models.user import User
+from app.models.token import Token
+from app.models.user import User, check_email, check_name
+from sqlalchemy import select
 from app.schemas.register import RegisterRequest, RegisterResponse
 from app.schemas.token import TokenResponse
-from app.utils.security_utils import hash_password, verify_password
+from app.schemas.user import UserResponse
+from app.utils.password_pool import password_hasher
+from app.utils.portfolio_snapshots import snapshot_refresher
+from app.utils.conditional_utils import Validators
+from app.utils.serialization_utils import serializer_for
+from app.utils.token_cache import token_cache
+from app.utils.token_revocation import revocation_list
 from app.services.token_service import TokenService
 from app.services.base_service import BaseService
+from app.utils.streaming_utils import ExportFormat, stream_export
 from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+
+
+user_serializer = serializer_for(UserResponse)
 
 
 class UserService(BaseService):
@@ -12,61 +25,67 @@ class UserService(BaseService):
         super().__init__(db)
         self.token_service = TokenService(db)
 
-    def register_user(self, user_data: RegisterRequest) -> RegisterResponse:
+    async def register_user(self, user_data: RegisterRequest) -> RegisterResponse:
         """
         Register a new user and return their details along with an access token.
+
+        The user and token rows are written in a single transaction: one
+        `INSERT ... ON CONFLICT (email) DO NOTHING RETURNING`, one token
+        INSERT and one COMMIT.
         """
-        if self._database.find_or_404(User, email=user_data.email):
+        # The Core insert skips the model validators, so apply the same checks first
+        values = {
+            "email": check_email(user_data.email),
+            "first_name": check_name("first_name", user_data.first_name),
+            "last_name": check_name("last_name", user_data.last_name),
+        }
+        values["hashed_password"] = await password_hasher.hash(user_data.password)
+
+        new_user = await self._database.insert_ignore_conflicts(User, values, conflict_columns=["email"])
+        if new_user is None:
+            await self._database.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered",
             )
 
-        hashed_password = hash_password(user_data.password)
-        new_user = User(
-            email=user_data.email,
-            hashed_password=hashed_password,
-            first_name=user_data.first_name,
-            last_name=user_data.last_name,
-        )
-
-        new_user = self._database.add_and_commit(new_user)
-
-        token = self.token_service.create_token(
+        token = self.token_service.stage_token(
             user_id=new_user.id,
             payload={"sub": new_user.email},
         )
+        await self._database.commit()
+        snapshot_refresher.schedule(new_user.id)
 
-        return RegisterResponse(
-            id=new_user.id,
-            email=new_user.email,
-            first_name=new_user.first_name,
-            last_name=new_user.last_name,
-            created_at=new_user.created_at.isoformat(),
-            updated_at=new_user.updated_at.isoformat(),
-            token=TokenResponse(
-                access_token=token.token,
-                refresh_token=token.refresh_token,
-                token_type="bearer",
-            ),
-        )
+        return self._build_response(new_user, token)
 
-    def login_user(self, email: str, password: str) -> RegisterResponse:
+    async def login_user(self, email: str, password: str) -> RegisterResponse:
         """
         Authenticate a user and return their details along with an access token.
+
+        The read transaction ends before bcrypt runs, so no pooled connection
+        is held while the password is verified; the token is then written
+        with one INSERT and one COMMIT.
         """
-        user = self._database.find_or_404(User, email=email)
-        if not verify_password(password, user.hashed_password):
+        result = await self._database.db.execute(select(User).where(User.email == email))
+        user = result.scalars().first()
+        await self._database.commit()
+
+        if user is None or not await password_hasher.verify(password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password",
             )
 
-        token = self.token_service.create_token(
+        token = self.token_service.stage_token(
             user_id=user.id,
             payload={"sub": user.email},
         )
+        await self._database.commit()
 
+        return self._build_response(user, token)
+
+    @staticmethod
+    def _build_response(user, token: TokenResponse) -> RegisterResponse:
         return RegisterResponse(
             id=user.id,
             email=user.email,
@@ -74,29 +93,56 @@ class UserService(BaseService):
             last_name=user.last_name,
             created_at=user.created_at.isoformat(),
             updated_at=user.updated_at.isoformat(),
-            token=TokenResponse(
-                access_token=token.token,
-                refresh_token=token.refresh_token,
-                token_type="bearer",
-            ),
+            token=token,
         )
 
-    def get_all_users(self):
+    async def get_users_page(self, limit: int, cursor: str = None) -> dict:
+        """
+        Retrieve one page of users, ordered by ID, shaped like `Page[UserResponse]`.
+        """
+        users, next_cursor = await self._database.get_page(User, limit, cursor, schema=UserResponse)
+        return {"items": user_serializer.many(users), "next_cursor": next_cursor}
+
+    @staticmethod
+    def export_users(session_factory, export_format: ExportFormat) -> StreamingResponse:
+        """
+        Stream every user, ordered by ID, without loading the table into memory.
+        """
+        return stream_export(session_factory, User, UserResponse, export_format)
+
+    async def get_user_validators(self, user_id: int) -> Validators:
+        """
+        Build the ETag and Last-Modified for a user from `(id, updated_at)` alone.
+        """
+        updated_at = await self._database.get_version(User, user_id)
+        return Validators.from_parts(user_id, updated_at, last_modified=updated_at)
+
+    async def get_user_by_id(self, user_id: int) -> User:
         """
-        Retrieve all users from the database.
+        Retrieve a user by their ID, loading only the columns in `UserResponse`.
         """
-        return self._database.get_all(User)
+        return await self._database.get_by_id(User, user_id, schema=UserResponse)
 
-    def get_user_by_id(self, user_id: int) -> User:
+    async def deactivate_user_by_id(self, user_id: int) -> dict:
         """
-        Retrieve a user by their ID.
+        Deactivate a user and revoke their tokens on every worker.
         """
-        return self._database.get_by_id(User, user_id)
+        user = await self._database.find_or_404(User, id=user_id)
+        user.deactivate()
+        revoked = await Token.revoke_user_tokens(self._database.db, user_id)
+        await self._database.commit()
+        revocation_list.revoke_digests(revoked)
+        return {"message": "User deactivated successfully"}
 
-    def delete_user_by_id(self, user_id: int) -> dict:
+    async def delete_user_by_id(self, user_id: int) -> dict:
         """
-        Delete a user by their ID.
+        Delete a user by their ID and revoke their tokens on every worker.
         """
-        user = self._database.find_or_404(User, id=user_id)
-        self._database.delete_and_commit(user)
+        user = await self._database.find_or_404(User, id=user_id)
+        # The blacklisted rows outlive the user (their `user_id` is set to null),
+        # so other workers' revocation sync still sees them
+        revoked = await Token.revoke_user_tokens(self._database.db, user_id)
+        await self._database.delete_and_commit(user)
+        revocation_list.revoke_digests(revoked)
+        token_cache.invalidate_user(user_id)
         return {"message": "User deleted successfully"}
@@ -0,0 +1,74 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response, status
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; PostgreSQL timestamptz is already aware
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+class Validators:
+    """
+    ETag and Last-Modified for a resource, used to answer conditional GETs.
+
+    Build them from a cheap version query (see `DatabaseUtils.get_version`
+    and `get_collection_version`) before loading any rows, then either
+    return `not_modified()` or `apply()` them to the full response.
+    """
+
+    def __init__(self, etag: str, last_modified: Optional[datetime] = None):
+        self.etag = etag
+        self.last_modified = _as_utc(last_modified).replace(microsecond=0) if last_modified else None
+
+    @classmethod
+    def from_parts(cls, *parts, last_modified: Optional[datetime] = None) -> "Validators":
+        """
+        Build a strong ETag by hashing the parts that identify this version of the resource,
+        e.g. `(id, updated_at)` or `(max(updated_at), count(*), filters...)`.
+        """
+        digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+        return cls(f'"{digest}"', last_modified)
+
+    def is_fresh(self, request: Request) -> bool:
+        """
+        Check whether the client's cached copy is current.
+
+        `If-None-Match` takes precedence; `If-Modified-Since` is only used
+        when it is absent, as RFC 9110 requires.
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or self.etag in tags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or self.last_modified is None:
+            return False
+        try:
+            since = _as_utc(parsedate_to_datetime(if_modified_since))
+        except (TypeError, ValueError):
+            return False
+        return self.last_modified <= since
+
+    @property
+    def headers(self) -> dict:
+        headers = {"ETag": self.etag, "Cache-Control": "private, no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def not_modified(self) -> Response:
+        """
+        Build an empty 304 response carrying the validators.
+        """
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers)
+
+    def apply(self, response: Response) -> Response:
+        """
+        Attach the validators to a full response.
+        """
+        response.headers.update(self.headers)
+        return response
@@ -1,73 +1,188 @@
-from sqlalchemy.orm import Session
+from functools import lru_cache
+from sqlalchemy import func, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import load_only
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException
+from app.utils.pagination_utils import decode_cursor, encode_cursor
+
+
+@lru_cache(maxsize=None)
+def projected_columns(model, schema) -> tuple:
+    """
+    Return the column attributes of `model` that `schema` serializes.
+
+    Schema fields that are not plain columns (relationships, properties) are
+    skipped; the primary key is always loaded by `load_only`.
+    """
+    columns = inspect(model).column_attrs
+    return tuple(
+        getattr(model, column.key)
+        for column in columns
+        if column.key in schema.model_fields
+    )
+
 
 class DatabaseUtils:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """
-        Initialize the DatabaseUtils with a SQLAlchemy session.
+        Initialize the DatabaseUtils with a SQLAlchemy async session.
 
         Args:
-            db (Session): SQLAlchemy database session.
+            db (AsyncSession): SQLAlchemy async database session.
         """
         self.db = db
 
-    def add_and_commit(self, instance):
+    async def add_and_commit(self, instance):
         """
-        Add an instance to the database, commit the session, and refresh the instance.
+        Add an instance to the database and commit the session.
+
+        Server-generated values (id, timestamps) come back through the
+        INSERT's RETURNING clause, so no refresh SELECT is needed.
         """
         try:
             self.db.add(instance)
-            self.db.commit()
-            self.db.refresh(instance)
+            await self.db.commit()
             return instance
         except SQLAlchemyError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
 
-    def add_all_and_commit(self, instances):
+    async def add_all_and_commit(self, instances):
         """
         Add multiple instances to the database and commit.
         """
         try:
             self.db.add_all(instances)
-            self.db.commit()
+            await self.db.commit()
         except SQLAlchemyError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
 
-    def bulk_add(self, instances):
+    async def bulk_add(self, instances):
         """
         Add multiple instances to the database without committing.
         """
         try:
             self.db.add_all(instances)
         except SQLAlchemyError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
 
-    def commit_and_refresh(self, instance):
+    async def commit_and_refresh(self, instance):
         """
-        Commit the current transaction and refresh the given instance.
+        Commit the current transaction and return the given instance.
+
+        Server-generated values such as `updated_at` are fetched with
+        RETURNING as part of the flush, so the instance is current without a
+        refresh SELECT.
         """
         try:
-            self.db.commit()
-            self.db.refresh(instance)
+            await self.db.commit()
             return instance
         except SQLAlchemyError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
 
-    def get_by_id(self, model, id: int):
+    async def commit(self):
+        """
+        Commit the current transaction, rolling back on failure.
+        """
+        try:
+            await self.db.commit()
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise e
+
+    async def insert_ignore_conflicts(self, model, values: dict, conflict_columns: list[str]):
+        """
+        Insert a row with `INSERT ... ON CONFLICT DO NOTHING RETURNING *`, without committing.
+
+        Column defaults are applied by SQLAlchemy as for any insert. ORM
+        validators are not, so validate the values beforehand.
+
+        Args:
+            model: SQLAlchemy model class.
+            values (dict): Column values for the new row.
+            conflict_columns (list[str]): Columns of the unique constraint to check.
+
+        Returns:
+            The inserted row, or None if it conflicted with an existing one.
+        """
+        statement = (
+            pg_insert(model)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=conflict_columns)
+            .returning(*model.__table__.columns)
+        )
+        try:
+            result = await self.db.execute(statement)
+            return result.first()
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise e
+
+    @staticmethod
+    def select_for(model, schema=None):
+        """
+        Build a `select` for a model, loading only the columns `schema` needs.
+
+        Instances loaded this way must only be read through `schema`: any
+        other column is unloaded and cannot be lazy-loaded under asyncio.
+
+        Args:
+            model: SQLAlchemy model class.
+            schema (Type[BaseModel], optional): Pydantic model the result is serialized with.
+                If omitted, every column is loaded.
+        """
+        statement = select(model)
+        if schema is not None:
+            statement = statement.options(load_only(*projected_columns(model, schema)))
+        return statement
+
+    async def get_by_id(self, model, id: int, schema=None):
         """
         Retrieve an instance of a model by its ID.
+
+        Pass `schema` to load only the columns that schema serializes.
         """
-        instance = self.db.query(model).filter(model.id == id).first()
+        result = await self.db.execute(self.select_for(model, schema).where(model.id == id))
+        instance = result.scalars().first()
         if not instance:
             raise HTTPException(status_code=404, detail=f"{model.__name__} with ID {id} not found")
         return instance
 
-    def get_by_string(self, model, field_name: str, value: str):
+    async def get_version(self, model, id: int):
+        """
+        Retrieve only the `updated_at` of a record, for cache validation.
+
+        Raises:
+            HTTPException: If the record does not exist.
+        """
+        result = await self.db.execute(select(model.updated_at).where(model.id == id))
+        updated_at = result.scalar_one_or_none()
+        if updated_at is None:
+            raise HTTPException(status_code=404, detail=f"{model.__name__} with ID {id} not found")
+        return updated_at
+
+    async def get_collection_version(self, model, *criteria):
+        """
+        Retrieve `max(updated_at)` and `count(*)` for the rows matching `criteria`.
+
+        Together they change whenever a matching row is inserted, updated or
+        deleted, so they identify a version of the collection without
+        loading it.
+
+        Returns:
+            tuple: The latest `updated_at` (None if there are no rows) and the row count.
+        """
+        result = await self.db.execute(
+            select(func.max(model.updated_at), func.count()).select_from(model).where(*criteria)
+        )
+        return tuple(result.one())
+
+    async def get_by_string(self, model, field_name: str, value: str):
         """
         Retrieve an instance of a model by a string field.
 
@@ -82,12 +197,13 @@ class DatabaseUtils:
         if not hasattr(model, field_name):
             raise HTTPException(status_code=400, detail=f"Invalid field: {field_name} for {model.__name__}")
 
-        instance = self.db.query(model).filter(getattr(model, field_name) == value).first()
+        result = await self.db.execute(select(model).where(getattr(model, field_name) == value))
+        instance = result.scalars().first()
         if not instance:
             raise HTTPException(status_code=404, detail=f"{model.__name__} with {field_name} '{value}' not found")
         return instance
 
-    def find_or_404(self, model, **filters):
+    async def find_or_404(self, model, **filters):
         """
         Retrieve an instance of a model based on filters or raise a 404 error if not found.
 
@@ -101,7 +217,8 @@ class DatabaseUtils:
         Raises:
             HTTPException: If the instance does not exist.
         """
-        instance = self.db.query(model).filter_by(**filters).first()
+        result = await self.db.execute(select(model).filter_by(**filters))
+        instance = result.scalars().first()
         if not instance:
             filter_details = ", ".join(f"{key}={value}" for key, value in filters.items())
             raise HTTPException(
@@ -110,43 +227,106 @@ class DatabaseUtils:
             )
         return instance
 
-    def get_all(self, model):
+    async def get_page(self, model, limit: int, cursor: str = None, schema=None, **filters):
         """
-        Retrieve all instances of a model from the database.
+        Retrieve one page of a model using keyset pagination on `id`.
+
+        Args:
+            model: SQLAlchemy model class.
+            limit (int): Maximum number of rows on the page.
+            cursor (str, optional): `next_cursor` returned with the previous page.
+            schema (Type[BaseModel], optional): Load only the columns this schema serializes.
+            **filters: Field-value pairs to filter by.
+
+        Returns:
+            tuple: The page's instances and the cursor for the next page (None on the last page).
         """
-        return self.db.query(model).all()
+        statement = self.select_for(model, schema).filter_by(**filters).order_by(model.id).limit(limit + 1)
+        if cursor is not None:
+            last_id = decode_cursor(cursor).get("id")
+            if not isinstance(last_id, int):
+                raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+            statement = statement.where(model.id > last_id)
 
-    def delete_and_commit(self, instance):
+        result = await self.db.execute(statement)
+        instances = result.scalars().all()
+        if len(instances) <= limit:
+            return instances, None
+        instances = instances[:limit]
+        return instances, encode_cursor({"id": instances[-1].id})
+
+    async def stream_all(self, model, batch_size: int = 1000, schema=None, **filters):
+        """
+        Iterate over every matching instance of a model, fetching `batch_size` rows at a time.
+
+        Rows are read through a server-side cursor, so memory use does not
+        grow with the size of the table. Pass `schema` to load only the
+        columns that schema serializes.
+        """
+        statement = (
+            self.select_for(model, schema)
+            .filter_by(**filters)
+            .order_by(model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream_scalars(statement)
+        async for instance in result:
+            yield instance
+
+    async def delete_and_commit(self, instance):
         """
         Delete an instance from the database and commit the session.
         """
         try:
-            self.db.delete(instance)
-            self.db.commit()
+            await self.db.delete(instance)
+            await self.db.commit()
         except SQLAlchemyError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise e
 
-    def find_and_update(self, model, id: int, updated_data: dict):
+    async def find_and_update(self, model, id: int, updated_data: dict):
         """
-        Find a record by ID, update its attributes, and commit the changes.
+        Update a record by ID and commit the changes.
+
+        Issues a single `UPDATE ... WHERE id = :id RETURNING *` without loading
+        the row first. ORM validators do not run, so validate the data beforehand.
         """
-        instance = self.get_by_id(model, id)
-        for key, value in updated_data.items():
-            setattr(instance, key, value)
-        return self.commit_and_refresh(instance)
+        instance = await self.update_by_id(model, id, updated_data)
+        await self.commit()
+        return instance
 
-    def bulk_update(self, model, updates: list[dict]):
+    async def bulk_update(self, model, updates: list[dict]):
         """
-        Bulk update multiple records in the database.
+        Bulk update multiple records in the database in one transaction.
         """
         updated_instances = []
         for update_data in updates:
             id = update_data.pop("id", None)
             if not id:
                 raise HTTPException(status_code=400, detail="Missing ID for bulk update")
-            instance = self.get_by_id(model, id)
-            for key, value in update_data.items():
-                setattr(instance, key, value)
-            updated_instances.append(self.commit_and_refresh(instance))
+            updated_instances.append(await self.update_by_id(model, id, update_data))
+        await self.commit()
         return updated_instances
+
+    async def update_by_id(self, model, id: int, updated_data: dict):
+        """
+        Update a record by ID with `UPDATE ... RETURNING *`, without committing.
+        """
+        if not updated_data:
+            return await self.get_by_id(model, id)
+        statement = (
+            update(model)
+            .where(model.id == id)
+            .values(**updated_data)
+            .returning(model)
+            .execution_options(populate_existing=True)
+        )
+        try:
+            result = await self.db.execute(statement)
+            instance = result.scalars().first()
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            raise e
+        if not instance:
+            raise HTTPException(status_code=404, detail=f"{model.__name__} with ID {id} not found")
+        return instance
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+
+class Lifecycle:
+    """
+    Tracks whether this worker should receive traffic, and its in-flight requests.
+
+    The lifespan calls `mark_ready()` once warmup has finished, and the
+    server calls `begin_drain()` when it receives its exit signal;
+    `/health/ready` reports the result so load balancers only route to
+    warmed-up workers.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.draining = False
+        self.in_flight = 0
+        self.warmup_seconds = None
+
+    @property
+    def accepting(self) -> bool:
+        return self.ready and not self.draining
+
+    def mark_ready(self, warmup_seconds: float) -> None:
+        self.ready = True
+        self.draining = False
+        self.warmup_seconds = warmup_seconds
+
+    def begin_drain(self) -> None:
+        self.draining = True
+
+    def request_started(self) -> None:
+        self.in_flight += 1
+
+    def request_finished(self) -> None:
+        self.in_flight -= 1
+
+
+class InFlightMiddleware:
+    """
+    ASGI middleware counting HTTP requests until their response is fully sent,
+    streamed bodies included.
+    """
+
+    def __init__(self, app, lifecycle: Lifecycle):
+        self.app = app
+        self.lifecycle = lifecycle
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        self.lifecycle.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.lifecycle.request_finished()
+
+
+async def warm_pool(engine, connections: int) -> int:
+    """
+    Open up to `connections` pooled connections at once, then return them to the pool.
+
+    They are held open together so the pool keeps that many distinct
+    connections, and the first requests skip connect, TLS and auth.
+    Warmup is capped at the pool size, since overflow connections are
+    closed when returned.
+
+    Returns:
+        int: Number of connections opened.
+    """
+    size = getattr(engine.pool, "size", None)
+    if callable(size):
+        connections = min(connections, size())
+    if connections <= 0:
+        return 0
+
+    async def open_connection(stack: AsyncExitStack) -> None:
+        connection = await stack.enter_async_context(engine.connect())
+        await connection.execute(text("SELECT 1"))
+
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(*(open_connection(stack) for _ in range(connections)))
+    return connections
+
+
+async def warm_up(engine, session_factory, connections: int) -> float:
+    """
+    Prime everything the first requests would otherwise pay for.
+
+    Opens pooled connections, loads token revocations and starts the
+    password hashing processes. A failing step is logged and skipped, so
+    the worker still comes up when the database is briefly unavailable.
+
+    Returns:
+        float: Seconds spent warming up.
+    """
+    from app.utils.password_pool import password_hasher
+    from app.utils.token_revocation import revocation_list
+
+    started = time.perf_counter()
+    try:
+        opened = await warm_pool(engine, connections)
+        logger.info("Opened %d pooled database connections", opened)
+    except Exception:
+        logger.exception("Connection pool warmup failed")
+    try:
+        async with session_factory() as db:
+            await revocation_list.load(db)
+    except Exception:
+        # The sync loop retries on its next tick
+        logger.exception("Initial token revocation load failed")
+    try:
+        await password_hasher.warm()
+    except Exception:
+        logger.exception("Password hashing pool warmup failed")
+    return time.perf_counter() - started
+
+
+# Global lifecycle state for this worker
+lifecycle = Lifecycle()
@@ -0,0 +1,440 @@
+import asyncio
+import fcntl
+import logging
+import math
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple
+import orjson
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds (seconds) of the request latency histogram
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Counters and histograms of exited workers, folded in by `mark_process_dead`
+AGGREGATE_FILE = "aggregate.json"
+LOCK_FILE = ".lock"
+
+
+class MetricFamily(NamedTuple):
+    name: str
+    type: str
+    documentation: str
+    samples: list  # (sample name, labels dict, value)
+
+
+class Counter:
+    """
+    Monotonic counter with optional labels.
+
+    Updates are plain dict operations with no lock: every request and
+    service call that records metrics runs on this worker's event loop
+    thread, and an increment contains no `await`, so no two updates can
+    interleave. Each worker process owns its counters; `/metrics` sums
+    them across workers when multiprocess mode is on.
+    """
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labelvalues, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def collect(self) -> MetricFamily:
+        samples = [
+            (self.name, dict(zip(self.labelnames, labelvalues)), value)
+            for labelvalues, value in self._values.items()
+        ]
+        return MetricFamily(self.name, self.type, self.documentation, samples)
+
+
+class Histogram:
+    """
+    Histogram with optional labels, updated lock-free like `Counter`.
+
+    An observation bumps a single bucket and the sum; buckets are only
+    made cumulative when scraped.
+    """
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Per label set: one count per bucket, then +Inf, then the sum
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labelvalues) -> None:
+        entry = self._values.get(labelvalues)
+        if entry is None:
+            entry = self._values[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+        entry[bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+    def collect(self) -> MetricFamily:
+        samples = []
+        for labelvalues, entry in self._values.items():
+            samples.extend(histogram_samples(
+                self.name, dict(zip(self.labelnames, labelvalues)), self.buckets, entry[:-1], entry[-1]
+            ))
+        return MetricFamily(self.name, self.type, self.documentation, samples)
+
+
+def histogram_samples(name: str, labels: dict, buckets: Iterable[float], counts: list, total: float) -> list:
+    """
+    Build cumulative `_bucket`, `_count` and `_sum` samples from per-bucket counts.
+
+    `counts` holds one count per bucket, plus optionally a last one for +Inf.
+    """
+    samples = []
+    cumulative = 0
+    for bound, count in zip((*buckets, math.inf), counts):
+        cumulative += count
+        samples.append((f"{name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+    samples.append((f"{name}_count", labels, cumulative))
+    samples.append((f"{name}_sum", labels, total))
+    return samples
+
+
+class MetricsRegistry:
+    """
+    The metrics this worker exposes on `/metrics`.
+
+    Holds the counters and histograms updated as requests run, plus
+    collectors called at scrape time to read gauges and counters that
+    other components already keep (pool, caches, password hashing).
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors: list[Callable[[], Iterable[MetricFamily]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        self._collectors.append(collector)
+
+    def collect(self) -> list[MetricFamily]:
+        families = [metric.collect() for metric in self._metrics]
+        for collector in self._collectors:
+            try:
+                families.extend(collector())
+            except Exception:
+                logger.exception("Metrics collector %s failed", collector.__name__)
+        return families
+
+    def render(self) -> str:
+        """
+        Render this worker's metrics, or every worker's when METRICS_MULTIPROCESS_DIR is set.
+        """
+        families = self.collect()
+        directory = config.METRICS_MULTIPROCESS_DIR
+        if directory:
+            write_snapshot(directory, families)
+            families = merge_snapshots(directory, stale_after_seconds=3 * config.METRICS_FLUSH_SECONDS)
+        return render_text(families)
+
+    async def run_flush(self, directory: str, interval_seconds: float) -> None:
+        """
+        Write this worker's snapshot forever, every `interval_seconds`, so
+        whichever worker serves `/metrics` sees it. Writes once more when
+        cancelled, so the counts folded in after the worker exits are complete.
+        """
+        try:
+            while True:
+                self._flush(directory)
+                await asyncio.sleep(interval_seconds)
+        finally:
+            self._flush(directory)
+
+    def _flush(self, directory: str) -> None:
+        try:
+            write_snapshot(directory, self.collect())
+        except Exception:
+            logger.exception("Failed to write metrics snapshot")
+
+
+_process_key = None
+
+
+def process_key() -> str:
+    """
+    Name of this process's snapshot: its PID and start time.
+
+    A worker that reuses a dead worker's PID gets a snapshot of its own
+    instead of overwriting the dead one's counters. Computed on first use
+    in each process, since the module may be imported before the fork.
+    """
+    global _process_key
+    pid = os.getpid()
+    if _process_key is None or _process_key[0] != pid:
+        _process_key = (pid, f"{pid}-{time.time_ns()}")
+    return _process_key[1]
+
+
+@contextmanager
+def _locked(directory: str, exclusive: bool):
+    """
+    Hold the snapshot directory's lock: shared to read a consistent set of
+    snapshots, exclusive to fold a dead worker's into the aggregate.
+    """
+    with open(Path(directory) / LOCK_FILE, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _write_atomically(path: Path, families: list[MetricFamily]) -> None:
+    temporary = path.with_suffix(".tmp")
+    temporary.write_bytes(orjson.dumps([list(family) for family in families]))
+    os.replace(temporary, path)
+
+
+def write_snapshot(directory: str, families: list[MetricFamily]) -> None:
+    """
+    Atomically replace this process's snapshot file in `directory`.
+    """
+    _write_atomically(Path(directory) / f"{process_key()}.json", families)
+
+
+def merge_snapshots(directory: str, stale_after_seconds: float) -> list[MetricFamily]:
+    """
+    Combine every worker's snapshot into one set of families.
+
+    Counters and histograms are summed, including those of workers that
+    have exited (gunicorn recycles them) and the aggregate they were folded
+    into, so totals never go backwards. Gauges get a `pid` label and are
+    dropped once a worker's snapshot is older than `stale_after_seconds`.
+    """
+    with _locked(directory, exclusive=False):
+        return _merge(sorted(Path(directory).glob("*.json")), live_after=time.time() - stale_after_seconds)
+
+
+def mark_process_dead(directory: str, pid: int) -> None:
+    """
+    Fold an exited worker's counters and histograms into the aggregate and
+    remove its snapshot, so recycled workers do not pile up files. Its
+    gauges are dropped.
+
+    Call from the process manager once the worker has exited (gunicorn's
+    `child_exit` hook), before its PID can be reused.
+    """
+    path = Path(directory)
+    with _locked(directory, exclusive=True):
+        dead = sorted(path.glob(f"{pid}-*.json"))
+        if not dead:
+            return
+        aggregate = path / AGGREGATE_FILE
+        _write_atomically(aggregate, _merge([aggregate, *dead], live_after=None))
+        for snapshot in dead:
+            snapshot.unlink(missing_ok=True)
+
+
+def _merge(paths: list[Path], live_after: float | None) -> list[MetricFamily]:
+    """
+    Sum the counters and histograms in `paths`. Gauges are kept, labelled
+    with the worker's PID, from snapshots modified after `live_after`;
+    with None, none are.
+    """
+    merged: dict[str, tuple[MetricFamily, dict]] = {}
+    for path in paths:
+        try:
+            live = live_after is not None and path.name != AGGREGATE_FILE and path.stat().st_mtime >= live_after
+            snapshot = orjson.loads(path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            continue  # Removed or half-written by another process
+        pid = path.stem.split("-")[0]
+        for name, metric_type, documentation, samples in snapshot:
+            if metric_type == "gauge" and not live:
+                continue
+            if name not in merged:
+                merged[name] = (MetricFamily(name, metric_type, documentation, []), {})
+            values = merged[name][1]
+            if metric_type == "gauge":
+                for sample_name, labels, value in samples:
+                    values[(sample_name, tuple({**labels, "pid": pid}.items()))] = value
+            else:
+                for sample_name, labels, value in samples:
+                    key = (sample_name, tuple(labels.items()))
+                    values[key] = values.get(key, 0) + value
+    return [
+        family._replace(samples=[(sample_name, dict(labels), value) for (sample_name, labels), value in values.items()])
+        for family, values in merged.values()
+    ]
+
+
+def clear_snapshots(directory: str) -> None:
+    """
+    Remove snapshots and the aggregate left by a previous server run. Call
+    before starting workers.
+    """
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    for snapshot in path.glob("*.json"):
+        snapshot.unlink(missing_ok=True)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_text(families: Iterable[MetricFamily]) -> str:
+    """
+    Render families in the Prometheus text exposition format (0.0.4).
+    """
+    lines = []
+    for family in families:
+        lines.append(f"# HELP {family.name} {family.documentation}")
+        lines.append(f"# TYPE {family.name} {family.type}")
+        for sample_name, labels, value in family.samples:
+            if labels:
+                label_text = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+                lines.append(f"{sample_name}{{{label_text}}} {_format_value(value)}")
+            else:
+                lines.append(f"{sample_name} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _family(name: str, metric_type: str, documentation: str, value: float) -> MetricFamily:
+    return MetricFamily(name, metric_type, documentation, [(name, {}, value)])
+
+
+def collect_app_metrics() -> list[MetricFamily]:
+    """
+    Read the figures the app's components already keep: in-flight requests,
+    the database pool, password hashing, caches and snapshot refreshes.
+    """
+    from app.db.database import engine
+    from app.db.pool import CHECKOUT_BUCKETS, pool_metrics
+    from app.utils.lifecycle import lifecycle
+    from app.utils.password_pool import password_hasher
+    from app.utils.portfolio_snapshots import snapshot_refresher
+    from app.utils.service_cache import service_cache
+    from app.utils.token_cache import token_cache
+    from app.utils.token_revocation import revocation_list
+
+    pool = pool_metrics.stats(engine.pool)
+    hashing = password_hasher.stats()
+    tokens = token_cache.stats()
+    cache = service_cache.stats()
+    # Checkouts slower than the largest bucket only show up in the +Inf bucket
+    checkout_counts = [*pool["checkout_buckets"].values()]
+    checkout_counts.append(pool["checkouts"] - sum(checkout_counts))
+    return [
+        _family("http_requests_in_flight", "gauge", "HTTP requests being handled.", lifecycle.in_flight),
+        _family("db_pool_size", "gauge", "Connections the pool keeps open.", pool["size"]),
+        _family("db_pool_checked_out", "gauge", "Pooled connections in use.", pool["checked_out"]),
+        _family("db_pool_checked_in", "gauge", "Idle pooled connections.", pool["checked_in"]),
+        _family("db_pool_overflow", "gauge", "Connections open beyond the pool size.", pool["overflow"]),
+        _family("db_pool_waiters", "gauge", "Checkouts waiting for a free connection.", pool["waiters"]),
+        _family("db_pool_timeouts_total", "counter", "Checkouts that gave up waiting.", pool["timeouts"]),
+        _family("db_pool_pings_total", "counter", "Pre-pings of idle connections.", pool["pings"]),
+        _family("db_pool_ping_failures_total", "counter", "Pre-pings that found a dead connection.", pool["ping_failures"]),
+        MetricFamily(
+            "db_pool_checkout_seconds", "histogram", "Time to check out a connection, including waits and pings.",
+            histogram_samples(
+                "db_pool_checkout_seconds", {}, CHECKOUT_BUCKETS, checkout_counts, pool["checkout_seconds_total"]
+            ),
+        ),
+        _family("password_hash_queue_depth", "gauge", "Password hash jobs waiting for a worker.", hashing["queue_depth"]),
+        _family("password_hash_in_flight", "gauge", "Password hash jobs running.", hashing["in_flight"]),
+        _family("password_hash_completed_total", "counter", "Password hash jobs completed.", hashing["completed"]),
+        _family("password_hash_rejected_total", "counter", "Password hash jobs rejected with 503.", hashing["rejected"]),
+        _family(
+            "password_hash_wait_seconds_total", "counter", "Time hash jobs spent queued.", hashing["wait_seconds_total"]
+        ),
+        _family("token_cache_size", "gauge", "Entries in the token cache.", tokens["size"]),
+        _family("token_cache_hits_total", "counter", "Token cache hits.", tokens["hits"]),
+        _family("token_cache_misses_total", "counter", "Token cache misses.", tokens["misses"]),
+        _family("token_cache_evictions_total", "counter", "Token cache evictions.", tokens["evictions"]),
+        _family("token_revocations", "gauge", "Revoked, unexpired tokens tracked by this worker.", len(revocation_list)),
+        _family("service_cache_hits_total", "counter", "Service cache hits.", cache["hits"]),
+        _family("service_cache_misses_total", "counter", "Service cache misses.", cache["misses"]),
+        _family("service_cache_stale_total", "counter", "Service cache entries at an outdated version.", cache["stale"]),
+        _family("service_cache_coalesced_total", "counter", "Loads shared with a concurrent miss.", cache["coalesced"]),
+        _family("service_cache_errors_total", "counter", "Service cache backend errors.", cache["errors"]),
+        _family(
+            "portfolio_snapshots_refreshed_total", "counter", "Portfolio snapshots rebuilt.", snapshot_refresher.refreshed
+        ),
+        _family(
+            "portfolio_snapshot_failures_total", "counter", "Portfolio snapshot rebuilds that failed.",
+            snapshot_refresher.failures,
+        ),
+        _family("portfolio_snapshots_pending", "gauge", "Portfolio snapshots waiting to be rebuilt.", snapshot_refresher.pending),
+    ]
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request count and latency per route.
+
+    Routes are labelled by their path template (e.g. `/api/v1/users/{user_id}`),
+    not the raw path, so label cardinality stays bounded; requests that
+    match no route are labelled `unmatched`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not config.METRICS_ENABLED:
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_requests.inc(scope["method"], route, status_code)
+            http_request_duration.observe(time.perf_counter() - started, scope["method"], route)
+
+
+# Global registry for this worker
+metrics_registry = MetricsRegistry()
+
+http_requests = metrics_registry.counter(
+    "http_requests_total", "HTTP requests handled, by route and status code.", ("method", "route", "status")
+)
+http_request_duration = metrics_registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency, including streamed bodies.", ("method", "route")
+)
+tokens_issued = metrics_registry.counter(
+    "tokens_issued_total", "Access tokens issued, by how they were obtained.", ("kind",)
+)
+metrics_registry.register_collector(collect_app_metrics)
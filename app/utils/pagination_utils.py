@@ -0,0 +1,50 @@
+import base64
+import json
+from typing import Optional
+from fastapi import HTTPException, Query
+from app.core.config import config
+
+
+def encode_cursor(values: dict) -> str:
+    """
+    Encode keyset values into an opaque, URL-safe cursor.
+
+    Args:
+        values (dict): The sort-key values of the last row on a page.
+
+    Returns:
+        str: The encoded cursor.
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor") from e
+    if not isinstance(values, dict):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return values
+
+
+class PageParams:
+    """
+    Query parameters shared by paginated endpoints.
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Cursor from the previous page's `next_cursor`."),
+        limit: int = Query(config.PAGE_SIZE_DEFAULT, ge=1, le=config.PAGE_SIZE_MAX),
+    ):
+        self.cursor = cursor
+        self.limit = limit
@@ -0,0 +1,132 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from fastapi import HTTPException, status
+from app.core.config import config
+from app.utils.security_utils import hash_password, verify_password
+
+
+def _run_in_worker(func, *args):
+    # Executed in a pool process; report when work actually started
+    return time.time(), func(*args)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated process pool with a bounded queue.
+
+    Calls beyond `workers + queue_size` outstanding jobs fail fast with a
+    503 and a Retry-After header instead of piling up behind the pool.
+    """
+
+    def __init__(self, workers: int, queue_size: int, retry_after_seconds: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retry_after_seconds = retry_after_seconds
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = Lock()
+        self._outstanding = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a plain-text password in the pool.
+        """
+        return await self._submit(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a plain-text password against a hash in the pool.
+        """
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of jobs waiting for a free worker.
+        """
+        return max(self._outstanding - self.workers, 0)
+
+    def stats(self) -> dict:
+        """
+        Return queue depth and wait-time metrics for the pool.
+        """
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": min(self._outstanding, self.workers),
+                "queue_depth": self.queue_depth,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+    async def warm(self) -> None:
+        """
+        Start every worker process now, instead of on the first logins.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            executor = self._executor
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(executor, _run_in_worker, int) for _ in range(self.workers)))
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker processes. A later call starts a fresh pool.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, func, *args):
+        with self._lock:
+            if self._outstanding >= self.workers + self.queue_size:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many authentication requests, please retry shortly.",
+                    headers={"Retry-After": str(self.retry_after_seconds)},
+                )
+            self._outstanding += 1
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            executor = self._executor
+
+        submitted_at = time.time()
+        try:
+            job = executor.submit(_run_in_worker, func, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        # Release the slot when the worker is done with the job, not when the
+        # caller stops waiting: a cancelled caller leaves a running job behind
+        job.add_done_callback(self._release)
+        started_at, result = await asyncio.wrap_future(job)
+
+        wait = max(started_at - submitted_at, 0.0)
+        with self._lock:
+            self.completed += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+        return result
+
+    def _release(self, job) -> None:
+        with self._lock:
+            self._outstanding -= 1
+
+
+# Process-wide pool used by `UserService`
+password_hasher = PasswordHasher(
+    workers=config.PASSWORD_HASH_WORKERS,
+    queue_size=config.PASSWORD_HASH_QUEUE_SIZE,
+    retry_after_seconds=config.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
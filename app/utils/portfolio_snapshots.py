@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotRefresher:
+    """
+    Rebuilds portfolio snapshots in the background after writes.
+
+    Services call `schedule(user_id)` once their write has committed.
+    Requests for the same user that arrive before the refresh runs are
+    coalesced into one rebuild.
+
+    The queue only saves readers the rebuild: the write already marked the
+    snapshot stale in the database (`PortfolioSnapshot.mark_stale`), so an
+    id lost with this worker is rebuilt on its next read instead.
+    """
+
+    def __init__(self):
+        self._pending: set[int] = set()
+        self._wakeup = asyncio.Event()
+        self.refreshed = 0
+        self.failures = 0
+
+    def schedule(self, user_id: int) -> None:
+        """
+        Queue a rebuild of `user_id`'s snapshot.
+        """
+        self._pending.add(user_id)
+        self._wakeup.set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def refresh_pending(self, session_factory) -> int:
+        """
+        Rebuild every queued snapshot, one session per user.
+
+        Failed rebuilds are queued again for the next call, and a rebuild
+        interrupted by cancellation is put back before it propagates.
+
+        Returns:
+            int: Number of snapshots rebuilt.
+        """
+        from app.services.portfolio_service import PortfolioService
+
+        refreshed = 0
+        failed = set()
+        try:
+            while self._pending:
+                user_id = self._pending.pop()
+                try:
+                    async with session_factory() as db:
+                        await PortfolioService(db).refresh_snapshot(user_id)
+                    refreshed += 1
+                except HTTPException:
+                    pass  # The user was deleted; the snapshot went with it
+                except asyncio.CancelledError:
+                    self._pending.add(user_id)
+                    raise
+                except Exception:
+                    self.failures += 1
+                    failed.add(user_id)
+                    logger.exception("Portfolio snapshot refresh failed for user %s", user_id)
+        finally:
+            self._pending |= failed
+            self.refreshed += refreshed
+        return refreshed
+
+    async def run(self, session_factory, retry_seconds: float = 5) -> None:
+        """
+        Rebuild snapshots forever, as soon as they are scheduled.
+
+        Failed rebuilds are retried after `retry_seconds`.
+        """
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self.refresh_pending(session_factory)
+            if self._pending:
+                await asyncio.sleep(retry_seconds)
+                self._wakeup.set()
+
+    async def drain(self, session_factory, timeout_seconds: float) -> int:
+        """
+        Rebuild what is still queued, for at most `timeout_seconds`. Call on
+        shutdown, after the `run` task is cancelled.
+
+        Whatever is left stays marked stale in the database and is rebuilt
+        on its next read.
+
+        Returns:
+            int: Number of snapshots rebuilt.
+        """
+        if not self._pending:
+            return 0
+        pending = self.pending
+        try:
+            return await asyncio.wait_for(self.refresh_pending(session_factory), timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Stopped draining portfolio snapshots after %.1fs; %d of %d left for rebuild on read",
+                timeout_seconds, self.pending, pending,
+            )
+            return 0
+
+
+# Global snapshot refresher instance
+snapshot_refresher = SnapshotRefresher()
@@ -0,0 +1,241 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def sign_profile_header(valid_for_seconds: int = 600) -> str:
+    """
+    Build an `X-Profile` header value that requests a trace until it expires.
+
+        python -c "from app.utils.profiling import sign_profile_header; print(sign_profile_header())"
+    """
+    expires = int(time.time()) + valid_for_seconds
+    return f"{expires}.{_signature(str(expires))}"
+
+
+def verify_profile_header(value: str) -> bool:
+    """
+    Check an `X-Profile` header value: an unexpired timestamp signed with PROFILING_SECRET.
+    """
+    if not config.PROFILING_SECRET:
+        return False
+    expires, _, signature = value.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _signature(expires))
+
+
+def _signature(message: str) -> str:
+    return hmac.new(config.PROFILING_SECRET.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+
+def _coroutine_frames(coro) -> list:
+    """
+    Return the frames of a coroutine and everything it is awaiting, outermost first.
+    """
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "ag_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "ag_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    for prefix in sorted(sys.path, key=len, reverse=True):
+        if prefix and filename.startswith(prefix):
+            filename = filename[len(prefix):].lstrip("/\\")
+            break
+    name = getattr(code, "co_qualname", code.co_name)
+    # `;` separates frames in the collapsed-stack format
+    return f"{name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class RequestSampler:
+    """
+    Samples one request's stack from a background thread.
+
+    Each sample follows the request task's coroutine chain, so time spent
+    awaiting the database or the password pool shows up as a `(waiting)`
+    leaf under the awaiting call. While the task is running, the sync
+    frames it is executing (serialization, SQLAlchemy inside its greenlet)
+    are appended. Other requests sharing the event loop are not sampled.
+    """
+
+    def __init__(self, task: asyncio.Task, root_code, interval_seconds: float):
+        self.task = task
+        self.loop = task.get_loop()
+        self.thread_id = threading.get_ident()
+        self.root_code = root_code
+        self.interval_seconds = interval_seconds
+        self.stacks = Counter()
+        self._greenlet_prefix = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop sampling. Returns at once; `join` waits for the thread to exit.
+        """
+        self._stop.set()
+
+    def join(self) -> None:
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.sample()
+            except Exception:
+                # The loop thread mutates the chain while we read it; skip this sample
+                continue
+
+    def sample(self) -> None:
+        chain = _coroutine_frames(self.task.get_coro())
+        if not chain:
+            return
+        if asyncio.current_task(self.loop) is not self.task:
+            labels = self._labels(chain)
+            spawns = [index for index, frame in enumerate(chain) if frame.f_code.co_name == "greenlet_spawn"]
+            if spawns:
+                self._greenlet_prefix = self._labels(chain[:spawns[-1] + 1])
+            labels.append("(waiting)")
+        else:
+            # While running, only the outermost coroutine is in the chain; the rest is on the thread's stack
+            stack = []
+            frame = sys._current_frames().get(self.thread_id)
+            while frame is not None and frame is not chain[0]:
+                stack.append(frame)
+                frame = frame.f_back
+            stack.reverse()
+            labels = self._labels(stack)
+            if not any(frame.f_code is self.root_code for frame in stack):
+                # SQLAlchemy runs sync code in a greenlet whose stack skips the request's
+                # coroutines; graft it under the last `greenlet_spawn` seen awaiting
+                labels = (self._greenlet_prefix or ["(greenlet)"]) + labels
+        self.stacks[";".join(labels)] += 1
+
+    def _labels(self, frames: list) -> list[str]:
+        # Start at this middleware, dropping the server and outer middleware frames
+        for index, frame in enumerate(frames):
+            if frame.f_code is self.root_code:
+                frames = frames[index:]
+                break
+        return [_frame_label(frame) for frame in frames]
+
+    def collapsed(self) -> str:
+        """
+        Render the samples as collapsed stacks (`frame;frame;frame count` per line),
+        the input format of flamegraph.pl, speedscope and inferno.
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class Profiler:
+    """
+    Decides which requests to profile: those carrying a valid signed
+    `X-Profile` header, plus a random `sample_rate` fraction of the rest.
+
+    `sample_rate` starts at PROFILING_SAMPLE_RATE and can be changed at
+    runtime through `PUT /debug/profiling` (per worker).
+    """
+
+    def __init__(self, sample_rate: float):
+        self.sample_rate = sample_rate
+        self.traces_written = 0
+
+    def should_profile(self, scope) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        if not config.PROFILING_SECRET:
+            return False
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return verify_profile_header(value.decode("latin-1"))
+        return False
+
+    def trace_path(self, scope) -> Path:
+        route = _UNSAFE_FILENAME.sub("_", scope["path"]).strip("_") or "root"
+        timestamp = time.strftime("%Y%m%dT%H%M%S")
+        return Path(config.PROFILING_DIR) / f"{timestamp}-{secrets.token_hex(3)}-{scope['method']}-{route}.folded"
+
+    def write(self, path: Path, sampler: RequestSampler) -> None:
+        """
+        Wait for a stopped sampler's thread, then write its trace. Both block,
+        so call this off the event loop.
+        """
+        sampler.join()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(sampler.collapsed())
+        self.traces_written += 1
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware capturing a stack-sampling trace of selected requests.
+
+    Covers dependency resolution, the handler, DB calls and response
+    rendering. Traces go to PROFILING_DIR as collapsed stacks, and the
+    response names the file in an `X-Profile-Trace` header. Requests that
+    are not selected cost one attribute check, or a header scan when
+    PROFILING_SECRET is set.
+    """
+
+    def __init__(self, app, profiler: Profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.profiler.should_profile(scope):
+            return await self.app(scope, receive, send)
+
+        path = self.profiler.trace_path(scope)
+        sampler = RequestSampler(
+            asyncio.current_task(), ProfilingMiddleware.__call__.__code__, config.PROFILING_INTERVAL_MS / 1000
+        )
+
+        async def send_with_trace(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-trace", path.name.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_trace)
+        finally:
+            sampler.stop()
+            elapsed = time.perf_counter() - started
+            try:
+                await asyncio.to_thread(self.profiler.write, path, sampler)
+                logger.info("Profiled %s %s in %.1fms: %s", scope["method"], scope["path"], elapsed * 1000, path)
+            except OSError:
+                logger.exception("Failed to write profile trace %s", path)
+
+
+# Global profiler for this worker
+profiler = Profiler(sample_rate=config.PROFILING_SAMPLE_RATE)
@@ -0,0 +1,144 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable, Optional
+from sqlalchemy import event
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Raised in strict mode when an endpoint issues more statements than its budget.
+    """
+
+
+class QueryStats:
+    """
+    Statements issued while handling one request.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        # Statements are parameterized, so the text is the shape; only layout varies
+        self.shapes[_WHITESPACE.sub(" ", statement).strip()] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Return the statement shapes issued at least `threshold` times, most frequent first.
+        """
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    @property
+    def server_timing(self) -> str:
+        noun = "query" if self.count == 1 else "queries"
+        return f'db;dur={self.seconds * 1000:.2f};desc="{self.count} {noun}"'
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """
+    Return the stats of the request being handled, if any.
+    """
+    return _current.get()
+
+
+def instrument_engine(engine) -> None:
+    """
+    Attribute every statement `engine` executes to the current request.
+
+    Statements run outside a tracked request (background jobs, startup)
+    are not recorded.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        if stats is not None and conn.info.get("query_started_at"):
+            stats.record(statement, time.perf_counter() - conn.info["query_started_at"].pop())
+
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Declare how many statements an endpoint may issue per request.
+
+    Apply below the route decorator:
+
+        @router.get("/users/{user_id}")
+        @query_budget(2)
+        async def get_user(...): ...
+
+    Exceeding the budget is logged, or raises `QueryBudgetExceeded` when
+    QUERY_BUDGET_STRICT is on (as in the test suite).
+    """
+    def decorator(endpoint):
+        endpoint.query_budget = max_queries
+        return endpoint
+    return decorator
+
+
+class QueryTrackingMiddleware:
+    """
+    ASGI middleware counting each request's SQL statements and database time.
+
+    Adds a `Server-Timing` header (`db;dur=<ms>;desc="<n> queries"`) covering
+    the statements issued before the response started. When the request
+    finishes, it warns about statement shapes repeated QUERY_REPEAT_THRESHOLD
+    times or more (a likely N+1) and checks the endpoint's `query_budget`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not config.QUERY_TRACKING_ENABLED:
+            return await self.app(scope, receive, send)
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+        self.check(scope, stats)
+
+    @staticmethod
+    def check(scope, stats: QueryStats) -> None:
+        path = scope.get("path")
+        for shape, count in stats.repeated(config.QUERY_REPEAT_THRESHOLD):
+            logger.warning("Possible N+1 on %s: %d x %s", path, count, shape)
+
+        budget = getattr(scope.get("endpoint"), "query_budget", None)
+        if budget is None or stats.count <= budget:
+            return
+        message = f"{scope.get('method')} {path} issued {stats.count} queries, over its budget of {budget}"
+        if config.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -2,6 +2,9 @@ from hashlib import sha256
 from passlib.context import CryptContext
 from app.core.config import config
 
+# Length of the hex digest returned by `generate_secure_value`
+TOKEN_DIGEST_LENGTH = 64
+
 # Password hashing utilities
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
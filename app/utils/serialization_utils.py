@@ -0,0 +1,111 @@
+from functools import lru_cache
+from operator import attrgetter
+from typing import Iterable, Type, Union, get_args, get_origin
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+# Matches Pydantic's JSON output for the types our schemas use (UTC as "Z")
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content) -> bytes:
+    """
+    Encode builtins (plus datetimes) as JSON bytes.
+    """
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def _nested_schema(annotation):
+    """
+    Return (schema, is_list) if a field holds a nested schema, else None.
+    """
+    origin = get_origin(annotation)
+    if origin is Union:
+        arguments = [argument for argument in get_args(annotation) if argument is not type(None)]
+        return _nested_schema(arguments[0]) if len(arguments) == 1 else None
+    if origin in (list, tuple):
+        item = get_args(annotation)[0]
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            return item, True
+        return None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None
+
+
+class Serializer:
+    """
+    Turns ORM instances or Core rows into JSON-ready dicts shaped like a Pydantic schema.
+
+    The attribute list is compiled once from the schema's fields, and no
+    validation runs, so only use it for data read from our own database.
+    Nested schemas (`Sub`, `Optional[Sub]`, `List[Sub]`) are compiled recursively.
+    """
+
+    def __init__(self, schema: Type[BaseModel]):
+        self.schema = schema
+        self._keys = []
+        self._nested = []
+        for name, field in schema.model_fields.items():
+            nested = _nested_schema(field.annotation)
+            if nested is None:
+                self._keys.append(name)
+            else:
+                nested_schema, is_list = nested
+                self._nested.append((name, serializer_for(nested_schema), is_list))
+        self._keys = tuple(self._keys)
+        if not self._keys:
+            self._getter = lambda obj: ()
+        elif len(self._keys) == 1:
+            key = self._keys[0]
+            self._getter = lambda obj: (getattr(obj, key),)
+        else:
+            self._getter = attrgetter(*self._keys)
+
+    def __call__(self, obj) -> dict:
+        """
+        Serialize a single instance or row to a dict.
+        """
+        data = dict(zip(self._keys, self._getter(obj)))
+        for name, serializer, is_list in self._nested:
+            value = getattr(obj, name)
+            if is_list:
+                data[name] = [serializer(item) for item in value]
+            else:
+                data[name] = None if value is None else serializer(value)
+        return data
+
+    def many(self, objs: Iterable) -> list[dict]:
+        """
+        Serialize several instances or rows.
+        """
+        return [self(obj) for obj in objs]
+
+    def dumps(self, obj) -> bytes:
+        """
+        Serialize a single instance or row straight to JSON bytes.
+        """
+        return dumps(self(obj))
+
+
+@lru_cache(maxsize=None)
+def serializer_for(schema: Type[BaseModel]) -> Serializer:
+    """
+    Return the compiled `Serializer` for a schema, building it on first use.
+    """
+    return Serializer(schema)
+
+
+class TrustedJSONResponse(Response):
+    """
+    JSON response encoded with orjson.
+
+    Returning one from a route skips `response_model` validation, so pair it
+    with a `Serializer` for database output. It is also the app's default
+    response class, where it only replaces the final `json.dumps`.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return content if isinstance(content, bytes) else dumps(content)
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+import orjson
+from app.core.config import config
+from app.utils.cache_utils import LRUCache
+from app.utils.serialization_utils import dumps
+
+logger = logging.getLogger(__name__)
+
+
+class LocalCacheBackend:
+    """
+    In-process backend: an `LRUCache` holding values as-is.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._cache = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        self._cache.set(key, value, ttl_seconds=ttl_seconds)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._cache.delete(key)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+class RedisCacheBackend:
+    """
+    Shared backend for any client speaking the `redis.asyncio` protocol
+    (`get`, `set(..., ex=)`, `delete`). Values are stored as JSON.
+    """
+
+    def __init__(self, client):
+        self._client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        """
+        Connect to Redis. Requires the optional `redis` package.
+        """
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError("SERVICE_CACHE_BACKEND=redis requires the `redis` package.") from e
+        return cls(Redis.from_url(url))
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self._client.get(key)
+        return None if value is None else orjson.loads(value)
+
+    async def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        await self._client.set(key, dumps(value), ex=max(1, int(ttl_seconds)))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._client.delete(*keys)
+
+    def stats(self) -> dict:
+        return {}
+
+
+class ServiceCache:
+    """
+    Read-through cache for service reads, with write invalidation.
+
+    Concurrent misses on the same key share a single load (single-flight).
+    A key invalidated while its load is in flight is not repopulated with
+    the stale result. Backend errors are logged and treated as misses, so a
+    cache outage degrades to reading from the database.
+
+    Entries can carry a version (e.g. the ETag from a cheap version query).
+    A reader asking for a different version treats the entry as a miss, so
+    a worker whose in-process entry was not invalidated never serves it
+    past a change another worker made.
+
+    Cache JSON-ready data (e.g. `Serializer` output), not ORM instances.
+    """
+
+    def __init__(self, backend, ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._in_flight: dict[tuple[str, Optional[str]], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    async def get_or_load(
+        self, key: str, loader: Callable[[], Awaitable[Any]], version: Optional[str] = None
+    ) -> Any:
+        """
+        Return the cached value for `key`, calling `loader` on a miss.
+
+        Args:
+            key (str): Cache key, e.g. from `job_history_key`.
+            loader: Coroutine function producing the value from the database.
+            version (str, optional): Version the value must have been loaded at.
+        """
+        if self.ttl_seconds <= 0:
+            return await loader()
+
+        flight = (key, version)
+        in_flight = self._in_flight.get(flight)
+        if in_flight is not None:
+            self.coalesced += 1
+            return await self._follow(in_flight, key, loader, version)
+
+        try:
+            entry = await self.backend.get(key)
+        except Exception:
+            self.errors += 1
+            logger.exception("Service cache read failed for %s", key)
+            entry = None
+        if entry is not None:
+            cached_version, value = entry
+            if cached_version == version:
+                self.hits += 1
+                return value
+            self.stale += 1
+
+        # Another request may have started the load while we awaited the backend
+        in_flight = self._in_flight.get(flight)
+        if in_flight is not None:
+            self.coalesced += 1
+            return await self._follow(in_flight, key, loader, version)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[flight] = future
+        try:
+            value = await loader()
+            future.set_result(value)
+            # An invalidation during the load unregisters the flight; don't cache its result
+            if self._in_flight.get(flight) is future:
+                try:
+                    await self.backend.set(key, (version, value), self.ttl_seconds)
+                except Exception:
+                    self.errors += 1
+                    logger.exception("Service cache write failed for %s", key)
+            return value
+        except asyncio.CancelledError:
+            # Only this caller went away (e.g. its client disconnected); followers retry the load
+            future.cancel()
+            raise
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+                future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            if self._in_flight.get(flight) is future:
+                del self._in_flight[flight]
+
+    async def _follow(
+        self, in_flight: asyncio.Future, key: str, loader: Callable[[], Awaitable[Any]], version: Optional[str]
+    ) -> Any:
+        """
+        Wait for another caller's load of `key`, retrying it if that caller was cancelled.
+        """
+        # Unlike awaiting the future, `wait` never passes the leader's cancellation on to us
+        await asyncio.wait((in_flight,))
+        if in_flight.cancelled():
+            return await self.get_or_load(key, loader, version)
+        return in_flight.result()
+
+    async def invalidate(self, *keys: str) -> None:
+        """
+        Drop `keys`, and stop any in-flight load of them from being cached.
+        """
+        for flight in [flight for flight in self._in_flight if flight[0] in keys]:
+            del self._in_flight[flight]
+        self.invalidations += len(keys)
+        try:
+            await self.backend.delete(*keys)
+        except Exception:
+            self.errors += 1
+            logger.exception("Service cache invalidation failed for %s", keys)
+
+    def stats(self) -> dict:
+        """
+        Return hit, miss and single-flight counters, plus the backend's own figures.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "backend": self.backend.stats(),
+        }
+
+
+def create_backend():
+    """
+    Build the backend selected by SERVICE_CACHE_BACKEND.
+    """
+    if config.SERVICE_CACHE_BACKEND == "redis":
+        return RedisCacheBackend.from_url(config.SERVICE_CACHE_REDIS_URL)
+    return LocalCacheBackend(
+        max_size=config.SERVICE_CACHE_MAX_SIZE,
+        ttl_seconds=config.SERVICE_CACHE_TTL_SECONDS,
+    )
+
+
+# Global service cache instance
+service_cache = ServiceCache(create_backend(), ttl_seconds=config.SERVICE_CACHE_TTL_SECONDS)
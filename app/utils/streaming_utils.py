@@ -0,0 +1,77 @@
+from enum import Enum
+from typing import AsyncIterator, Type
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from app.core.config import config
+from app.utils.database_utils import DatabaseUtils
+from app.utils.serialization_utils import dumps, serializer_for
+
+
+class ExportFormat(str, Enum):
+    """
+    Wire formats supported by streaming exports.
+    """
+    ndjson = "ndjson"
+    json = "json"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.json: "application/json",
+}
+
+
+async def encode_ndjson(rows: AsyncIterator, schema: Type[BaseModel]) -> AsyncIterator[bytes]:
+    """
+    Encode each row as one JSON document per line.
+    """
+    serializer = serializer_for(schema)
+    async for row in rows:
+        yield dumps(serializer(row)) + b"\n"
+
+
+async def encode_json_array(rows: AsyncIterator, schema: Type[BaseModel]) -> AsyncIterator[bytes]:
+    """
+    Encode rows as a single JSON array, emitted element by element.
+    """
+    serializer = serializer_for(schema)
+    yield b"["
+    separator = b""
+    async for row in rows:
+        yield separator + dumps(serializer(row))
+        separator = b","
+    yield b"]"
+
+
+def stream_export(
+    session_factory,
+    model,
+    schema: Type[BaseModel],
+    export_format: ExportFormat,
+    **filters,
+) -> StreamingResponse:
+    """
+    Build a response that streams every matching row of `model` as it is read.
+
+    Rows come from a server-side cursor in batches of EXPORT_BATCH_SIZE and
+    are encoded one at a time, so peak memory does not depend on the number
+    of rows returned. Only the columns `schema` serializes are selected.
+
+    Args:
+        session_factory: Factory for the session the stream runs in (see `get_session_factory`).
+        model: SQLAlchemy model class to export.
+        schema (Type[BaseModel]): Pydantic schema each row is serialized with.
+        export_format (ExportFormat): NDJSON or a streamed JSON array.
+        **filters: Field-value pairs to filter by.
+    """
+    encoder = encode_ndjson if export_format == ExportFormat.ndjson else encode_json_array
+
+    async def body() -> AsyncIterator[bytes]:
+        async with session_factory() as db:
+            rows = DatabaseUtils(db).stream_all(
+                model, batch_size=config.EXPORT_BATCH_SIZE, schema=schema, **filters
+            )
+            async for chunk in encoder(rows, schema):
+                yield chunk
+
+    return StreamingResponse(body(), media_type=MEDIA_TYPES[export_format])
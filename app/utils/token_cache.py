@@ -0,0 +1,105 @@
+import time
+from collections import defaultdict
+from threading import Lock
+from typing import Optional
+from app.core.config import config
+from app.schemas.user import AuthenticatedUser
+from app.utils.cache_utils import LRUCache
+from app.utils.security_utils import generate_secure_value
+
+
+class TokenCache:
+    """
+    In-process cache of verified access tokens.
+
+    Entries are keyed by a digest of the token, hold the decoded claims and a
+    slim user identity, and never outlive the token's `exp` claim.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._cache = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self._keys_by_user: dict[int, set[str]] = defaultdict(set)
+        self._lock = Lock()
+
+    @staticmethod
+    def digest(token: str) -> str:
+        """
+        Return the cache key for a raw token.
+        """
+        return generate_secure_value(token)
+
+    def get(self, token: str) -> Optional[tuple[dict, AuthenticatedUser]]:
+        """
+        Return `(claims, user)` for a previously verified token, or None.
+        """
+        return self.get_digest(self.digest(token))
+
+    def get_digest(self, digest: str) -> Optional[tuple[dict, AuthenticatedUser]]:
+        """
+        Like `get`, for callers that already hashed the token.
+        """
+        return self._cache.get(digest)
+
+    def set(self, token: str, claims: dict, user: AuthenticatedUser) -> None:
+        """
+        Cache a verified token until the earlier of the cache TTL and its `exp`.
+        """
+        self.set_digest(self.digest(token), claims, user)
+
+    def set_digest(self, digest: str, claims: dict, user: AuthenticatedUser) -> None:
+        """
+        Like `set`, for callers that already hashed the token.
+        """
+        ttl = None
+        if "exp" in claims:
+            ttl = claims["exp"] - time.time()
+            if ttl <= 0:
+                return
+        self._cache.set(digest, (claims, user), ttl_seconds=ttl)
+        with self._lock:
+            # Prune keys that have since expired or been evicted
+            keys = {k for k in self._keys_by_user[user.id] if k in self._cache}
+            keys.add(digest)
+            self._keys_by_user[user.id] = keys
+
+    def invalidate_token(self, token: str) -> None:
+        """
+        Drop the entry for a single token, e.g. after it is blacklisted.
+        """
+        self.invalidate_digest(self.digest(token))
+
+    def invalidate_digest(self, digest: str) -> None:
+        """
+        Drop the entry for a token digest, e.g. one revoked by another worker.
+        """
+        self._cache.delete(digest)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Drop every entry belonging to a user, e.g. after deactivation or deletion.
+        """
+        with self._lock:
+            keys = self._keys_by_user.pop(user_id, set())
+        for key in keys:
+            self._cache.delete(key)
+
+    def clear(self) -> None:
+        """
+        Drop every entry.
+        """
+        self._cache.clear()
+        with self._lock:
+            self._keys_by_user.clear()
+
+    def stats(self) -> dict:
+        """
+        Return hit rate, eviction and memory metrics.
+        """
+        return self._cache.stats()
+
+
+# Process-wide cache used by `get_current_user`
+token_cache = TokenCache(
+    max_size=config.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=config.TOKEN_CACHE_TTL_SECONDS,
+)
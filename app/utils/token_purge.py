@@ -0,0 +1,39 @@
+import asyncio
+import logging
+import time
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_expired_tokens(session_factory) -> int:
+    """
+    Run one purge of expired tokens and log how many rows were removed.
+
+    Args:
+        session_factory: Callable returning an async session context manager.
+
+    Returns:
+        int: Number of rows deleted.
+    """
+    from app.services.token_service import TokenService
+
+    started = time.perf_counter()
+    async with session_factory() as db:
+        deleted = await TokenService(db).delete_expired_tokens()
+    logger.info(
+        "Purged %d expired tokens in %.2fs", deleted, time.perf_counter() - started
+    )
+    return deleted
+
+
+async def run_token_purge(session_factory, interval_seconds: float = config.TOKEN_PURGE_INTERVAL_SECONDS) -> None:
+    """
+    Purge expired tokens forever, every `interval_seconds`.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await purge_expired_tokens(session_factory)
+        except Exception:
+            logger.exception("Expired token purge failed")
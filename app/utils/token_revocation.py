@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Iterable
+from sqlalchemy import select
+from app.utils.security_utils import generate_secure_value
+from app.utils.token_cache import token_cache
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    In-memory set of revoked access tokens, keyed by token digest.
+
+    The set is loaded from the `tokens` table at startup, updated in place
+    when this worker blacklists a token, and merged with a fresh load on an
+    interval so revocations made by other workers take effect within that
+    interval. Entries are dropped once the token they revoke has expired.
+    """
+
+    def __init__(self):
+        self._revoked: dict[str, float] = {}
+        self._lock = Lock()
+        self.last_synced_at: datetime | None = None
+
+    @staticmethod
+    def digest(token: str) -> str:
+        """
+        Return the key used for a raw token.
+        """
+        return generate_secure_value(token)
+
+    def is_revoked(self, token: str) -> bool:
+        """
+        Check whether a token has been revoked, without touching the database.
+        """
+        return self.is_digest_revoked(self.digest(token))
+
+    def is_digest_revoked(self, digest: str) -> bool:
+        """
+        Check whether a token digest has been revoked, for callers that already hashed the token.
+        """
+        return digest in self._revoked
+
+    def revoke(self, token: str, expires_at: datetime) -> None:
+        """
+        Mark a token as revoked on this worker until it expires.
+
+        Args:
+            token (str): The raw access token.
+            expires_at (datetime): When the token expires; the entry is dropped afterwards.
+        """
+        self.revoke_digest(self.digest(token), expires_at)
+
+    def revoke_digest(self, digest: str, expires_at: datetime) -> None:
+        """
+        Mark a token digest, as stored in the `tokens` table, as revoked.
+        """
+        with self._lock:
+            self._revoked[digest] = _timestamp(expires_at)
+        token_cache.invalidate_digest(digest)
+
+    def revoke_digests(self, revoked: Iterable[tuple[str, datetime]]) -> None:
+        """
+        Mark `(digest, expires_at)` pairs, e.g. from `Token.revoke_user_tokens`, as revoked.
+        """
+        for digest, expires_at in revoked:
+            self.revoke_digest(digest, expires_at)
+
+    def merge(self, revoked: dict[str, float]) -> None:
+        """
+        Add a freshly loaded set of revoked digests and drop expired entries.
+
+        Entries are never removed for being missing from `revoked`: a token
+        this worker revoked while the snapshot query was running is not in
+        it yet. Digests that are new to this worker are evicted from the
+        token cache.
+        """
+        now = time.time()
+        with self._lock:
+            added = revoked.keys() - self._revoked.keys()
+            merged = {**self._revoked, **revoked}
+            self._revoked = {digest: expires for digest, expires in merged.items() if expires > now}
+        for digest in added:
+            token_cache.invalidate_digest(digest)
+
+    async def load(self, db) -> int:
+        """
+        Load every revoked, unexpired token from the database into the set.
+
+        Args:
+            db: The async database session.
+
+        Returns:
+            int: Number of revoked tokens now tracked.
+        """
+        from app.models.token import Token
+
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            select(Token.token, Token.expires_at).where(
+                Token.is_blacklisted, ~Token.is_access_token_expired(now)
+            )
+        )
+        # The tokens table already stores digests
+        self.merge({digest: _timestamp(expires_at) for digest, expires_at in result})
+        self.last_synced_at = now
+        return len(self._revoked)
+
+    async def run_sync(self, session_factory, interval_seconds: float) -> None:
+        """
+        Merge the database's revocations into the set forever, every `interval_seconds`.
+
+        This bounds how long a revocation made on another worker can go unseen.
+        """
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                async with session_factory() as db:
+                    await self.load(db)
+            except Exception:
+                logger.exception("Failed to sync token revocations")
+
+    def clear(self) -> None:
+        """
+        Drop every entry.
+        """
+        with self._lock:
+            self._revoked = {}
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+def _timestamp(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+# Process-wide revocation set used by `get_current_user` and `TokenService`
+revocation_list = RevocationList()
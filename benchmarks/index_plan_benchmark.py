@@ -0,0 +1,116 @@
+"""
+Show how the foreign-key and composite indexes change query plans.
+
+Copies the shape of `tokens`, `projects`, `project_skills` and
+`job_histories` into scratch tables in the target PostgreSQL database,
+fills them, and runs EXPLAIN ANALYZE on the lookups the indexes serve, once
+before and once after creating the indexes from revision 20df8e3c5323.
+
+Usage:
+    python benchmarks/index_plan_benchmark.py --rows 1000000 --users 10000
+
+The database is read from BENCHMARK_DATABASE_URL (falling back to
+DATABASE_URL). The database must be migrated so the source tables exist.
+The scratch tables are dropped afterwards.
+"""
+import argparse
+import os
+import re
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+load_dotenv()
+
+SEED = {
+    "bench_tokens": (
+        "tokens",
+        "INSERT INTO bench_tokens (id, token, refresh_token, user_id, expires_at, refresh_expires_at, is_blacklisted) "
+        "SELECT i, md5(i::text), md5((-i)::text), i % :users, now(), now() + interval '7 days', false "
+        "FROM generate_series(1, :rows) AS i",
+    ),
+    "bench_projects": (
+        "projects",
+        "INSERT INTO bench_projects (id, user_id, job_history_id, name, start_date) "
+        "SELECT i, i % :users, i, 'Project', now() FROM generate_series(1, :rows) AS i",
+    ),
+    "bench_project_skills": (
+        "project_skills",
+        "INSERT INTO bench_project_skills (project_id, skill_id) "
+        "SELECT i, i % 500 FROM generate_series(1, :rows) AS i",
+    ),
+    "bench_job_histories": (
+        "job_histories",
+        "INSERT INTO bench_job_histories (id, user_id, location, description, is_active, start_date) "
+        "SELECT i, i % :users, 'Remote', 'Job', i % 10 = 0, now() - i * interval '1 minute' "
+        "FROM generate_series(1, :rows) AS i",
+    ),
+}
+
+INDEXES = [
+    "CREATE INDEX ON bench_tokens (user_id)",
+    "CREATE INDEX ON bench_projects (user_id)",
+    "CREATE INDEX ON bench_projects (job_history_id)",
+    "CREATE INDEX ON bench_project_skills (skill_id)",
+    "CREATE INDEX ON bench_job_histories (user_id, is_active, start_date DESC)",
+]
+
+QUERIES = {
+    "tokens for a user": "SELECT id FROM bench_tokens WHERE user_id = 42",
+    "projects for a user": "SELECT id FROM bench_projects WHERE user_id = 42",
+    "projects for a job": "SELECT id FROM bench_projects WHERE job_history_id = 42",
+    "projects using a skill": "SELECT project_id FROM bench_project_skills WHERE skill_id = 42",
+    "active jobs, newest first": (
+        "SELECT id FROM bench_job_histories WHERE user_id = 42 AND is_active ORDER BY start_date DESC LIMIT 10"
+    ),
+}
+
+
+def explain(connection, query: str) -> tuple[str, float]:
+    plan = [row[0] for row in connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {query}"))]
+    node = next(line.strip() for line in plan if "Scan" in line)
+    execution_ms = float(re.search(r"Execution Time: ([\d.]+)", plan[-1]).group(1))
+    return node.split("  (")[0].lstrip("-> "), execution_ms
+
+
+def run_queries(connection) -> dict:
+    return {name: explain(connection, query) for name, query in QUERIES.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    args = parser.parse_args()
+
+    url = os.getenv("BENCHMARK_DATABASE_URL") or os.getenv("DATABASE_URL")
+    if not url:
+        raise ValueError("Set BENCHMARK_DATABASE_URL or DATABASE_URL to a PostgreSQL database.")
+    engine = create_engine(url)
+
+    with engine.begin() as connection:
+        for table, (source, seed) in SEED.items():
+            connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+            connection.execute(text(f"CREATE TABLE {table} (LIKE {source} INCLUDING DEFAULTS)"))
+            connection.execute(text(seed), {"rows": args.rows, "users": args.users})
+            connection.execute(text(f"ANALYZE {table}"))
+
+    with engine.begin() as connection:
+        before = run_queries(connection)
+        for statement in INDEXES:
+            connection.execute(text(statement))
+        for table in SEED:
+            connection.execute(text(f"ANALYZE {table}"))
+        after = run_queries(connection)
+
+    for name in QUERIES:
+        print(name)
+        print(f"  before: {before[name][0]:<60} {before[name][1]:>10.3f} ms")
+        print(f"  after:  {after[name][0]:<60} {after[name][1]:>10.3f} ms")
+
+    with engine.begin() as connection:
+        for table in SEED:
+            connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+
+
+if __name__ == "__main__":
+    main()
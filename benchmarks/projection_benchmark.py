@@ -0,0 +1,95 @@
+"""
+Compare full-row reads against schema-driven column projection for users.
+
+Builds a scratch table shaped like `users` (with a 60-character bcrypt hash
+in every row) in the target PostgreSQL database, then reads it in pages of
+--page-size rows, once selecting every column and once selecting only the
+columns `UserResponse` serializes. Reports rows per second and the bytes of
+row data Postgres sends for each shape.
+
+Usage:
+    PYTHONPATH=. python benchmarks/projection_benchmark.py --rows 1000000 --page-size 200
+
+The database is read from BENCHMARK_DATABASE_URL (falling back to
+DATABASE_URL). The scratch table is dropped afterwards.
+"""
+import argparse
+import os
+import time
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, inspect, text
+from app.models.user import User
+from app.schemas.user import UserResponse
+from app.utils.database_utils import projected_columns
+
+load_dotenv()
+
+TABLE = "bench_users"
+
+ALL_COLUMNS = [column.key for column in inspect(User).column_attrs]
+SHAPES = {
+    "full row": ALL_COLUMNS,
+    "UserResponse": [column.key for column in projected_columns(User, UserResponse)],
+}
+
+
+def build_table(connection, rows: int) -> None:
+    connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    connection.execute(text(f"CREATE TABLE {TABLE} (LIKE users INCLUDING DEFAULTS)"))
+    connection.execute(text(
+        f"INSERT INTO {TABLE} (id, email, hashed_password, first_name, last_name, is_active) "
+        "SELECT i, 'user' || i || '@example.com', '$2b$12$' || left(repeat(md5(i::text), 2), 53), "
+        "'First', 'Last', true FROM generate_series(1, :rows) AS i"
+    ), {"rows": rows})
+    connection.execute(text(f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id)"))
+    connection.execute(text(f"VACUUM ANALYZE {TABLE}"))
+
+
+def measure(connection, columns: list[str], page_size: int) -> tuple[int, float]:
+    column_list = ", ".join(columns)
+    start = time.perf_counter()
+    rows, last_id = 0, 0
+    while True:
+        page = connection.execute(text(
+            f"SELECT {column_list} FROM {TABLE} WHERE id > :last_id ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": page_size}).all()
+        if not page:
+            break
+        rows += len(page)
+        last_id = page[-1][0]
+    return rows, time.perf_counter() - start
+
+
+def row_bytes(connection, columns: list[str]) -> int:
+    # Size of the row values Postgres serializes into DataRow messages
+    sizes = " + ".join(f"coalesce(pg_column_size({column}), 0)" for column in columns)
+    return connection.execute(text(f"SELECT sum({sizes}) FROM {TABLE}")).scalar()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=200)
+    args = parser.parse_args()
+
+    url = os.getenv("BENCHMARK_DATABASE_URL") or os.getenv("DATABASE_URL")
+    if not url:
+        raise ValueError("Set BENCHMARK_DATABASE_URL or DATABASE_URL to a PostgreSQL database.")
+    engine = create_engine(url)
+
+    with engine.begin() as connection:
+        build_table(connection, args.rows)
+
+    print(f"{'shape':<14} {'columns':>8} {'rows/s':>12} {'MiB sent':>10}")
+    with engine.connect() as connection:
+        for shape, columns in SHAPES.items():
+            rows, elapsed = measure(connection, columns, args.page_size)
+            sent = row_bytes(connection, columns) / (1024 * 1024)
+            print(f"{shape:<14} {len(columns):>8} {rows / elapsed:>12,.0f} {sent:>10.1f}")
+
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compare the Pydantic response path with the compiled orjson serializers.
+
+Builds N in-memory `User` rows and times turning them into a JSON page,
+once the way FastAPI does for a `response_model` (validate with
+`from_attributes`, dump to JSON-able data, `json.dumps`) and once with
+`serializer_for(UserResponse)` and orjson. No database is needed.
+
+Usage:
+    PYTHONPATH=. python benchmarks/serialization_benchmark.py --rows 1 100 10000
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from fastapi.encoders import jsonable_encoder
+from app.models.user import User
+from app.schemas.pagination import Page
+from app.schemas.user import UserResponse
+from app.utils.serialization_utils import dumps, serializer_for
+
+
+def make_users(rows: int) -> list[User]:
+    now = datetime.now(timezone.utc)
+    users = []
+    for i in range(rows):
+        user = User(
+            id=i, email=f"user{i}@example.com", hashed_password="hashed", first_name="First", last_name="Last"
+        )
+        user.created_at = user.updated_at = now
+        users.append(user)
+    return users
+
+
+def pydantic_path(users: list[User]) -> bytes:
+    page = Page[UserResponse](items=[UserResponse.model_validate(user) for user in users], next_cursor=None)
+    content = jsonable_encoder(page.model_dump(mode="json"))
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def compiled_path(users: list[User]) -> bytes:
+    return dumps({"items": serializer_for(UserResponse).many(users), "next_cursor": None})
+
+
+def best_of(function, users: list[User], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(users)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'pydantic ms':>12} {'compiled ms':>12} {'speedup':>8}")
+    for rows in args.rows:
+        users = make_users(rows)
+        assert json.loads(pydantic_path(users)) == json.loads(compiled_path(users))
+        pydantic_ms = best_of(pydantic_path, users, args.repeat) * 1000
+        compiled_ms = best_of(compiled_path, users, args.repeat) * 1000
+        print(f"{rows:>8} {pydantic_ms:>12.3f} {compiled_ms:>12.3f} {pydantic_ms / compiled_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
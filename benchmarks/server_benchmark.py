@@ -0,0 +1,111 @@
+"""
+Compare requests/second between the old and the production server entrypoints.
+
+Starts each server in turn on --port, waits until it answers, then drives
+--requests GETs of --path at --concurrency from several client processes
+(so the load generator is not the bottleneck) and reports requests/second
+and latency percentiles.
+
+Modes:
+    reload      `uvicorn app.main:app --reload`, the previous start_server.py
+    production  `python start_server.py` with ENV=production (gunicorn,
+                SERVER_WORKERS uvicorn workers, uvloop, httptools)
+
+Usage:
+    python benchmarks/server_benchmark.py --path /api/v1/portfolio/1 --requests 20000 --concurrency 64
+
+Run it on the same host class as production, against a migrated database
+(DATABASE_URL) with at least one portfolio, and with nothing else loading
+the machine.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import httpx
+
+MODES = {
+    "reload": ([sys.executable, "-m", "uvicorn", "app.main:app", "--reload"], {}),
+    "production": ([sys.executable, "start_server.py"], {"ENV": "production"}),
+}
+
+
+def wait_for_port(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.2)
+    raise TimeoutError(f"Server did not start on port {port}")
+
+
+async def drive(url: str, requests: int, concurrency: int) -> list[float]:
+    timings = []
+    remaining = iter(range(requests))
+
+    async def client(session: httpx.AsyncClient):
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await session.get(url)
+            response.raise_for_status()
+            timings.append((time.perf_counter() - start) * 1000)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits) as session:
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+    return timings
+
+
+def drive_process(url: str, requests: int, concurrency: int) -> list[float]:
+    return asyncio.run(drive(url, requests, concurrency))
+
+
+def measure(url: str, requests: int, concurrency: int, processes: int) -> tuple[float, list[float]]:
+    with ProcessPoolExecutor(processes) as pool:
+        drive_process(url, min(requests, 200), concurrency)  # Warm up
+        start = time.perf_counter()
+        parts = pool.map(
+            drive_process, [url] * processes, [requests // processes] * processes,
+            [max(1, concurrency // processes)] * processes,
+        )
+        timings = sorted(t for part in parts for t in part)
+        elapsed = time.perf_counter() - start
+    return len(timings) / elapsed, timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--path", default="/api/v1/portfolio/1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--client-processes", type=int, default=4)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{args.port}{args.path}"
+    print(f"{'mode':<12} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for mode in args.modes:
+        command, env = MODES[mode]
+        server_env = {**os.environ, **env, "SERVER_PORT": str(args.port)}
+        if mode == "reload":
+            command = command + ["--port", str(args.port)]
+        server = subprocess.Popen(command, env=server_env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_port(args.port)
+            rps, timings = measure(url, args.requests, args.concurrency, args.client_processes)
+        finally:
+            server.terminate()
+            server.wait()
+        p99 = timings[int(len(timings) * 0.99) - 1]
+        print(f"{mode:<12} {rps:>10,.0f} {statistics.median(timings):>8.2f} {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare unique-index size and lookup latency for full JWTs vs. fixed-width digests.
+
+Builds two scratch tables in the target PostgreSQL database, one keyed by a
+JWT-sized text value and one by its 64-character digest, then reports the
+unique index size and the latency of random point lookups.
+
+Usage:
+    python benchmarks/token_digest_benchmark.py --rows 10000000 --lookups 10000
+
+The database is read from BENCHMARK_DATABASE_URL (falling back to
+DATABASE_URL). The scratch tables are dropped afterwards.
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+load_dotenv()
+
+TABLES = {
+    # ~190 characters, about the size of our HS256 access tokens
+    "bench_tokens_jwt": "repeat(md5(i::text), 6)",
+    "bench_tokens_digest": "encode(sha256(convert_to(repeat(md5(i::text), 6), 'UTF8')), 'hex')",
+}
+
+
+def build_table(connection, table: str, expression: str, rows: int) -> None:
+    connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    connection.execute(text(f"CREATE TABLE {table} (id bigint PRIMARY KEY, token text NOT NULL)"))
+    connection.execute(text(
+        f"INSERT INTO {table} (id, token) SELECT i, {expression} FROM generate_series(1, :rows) AS i"
+    ), {"rows": rows})
+    connection.execute(text(f"CREATE UNIQUE INDEX {table}_token_key ON {table} (token)"))
+    connection.execute(text(f"ANALYZE {table}"))
+
+
+def measure_lookups(connection, table: str, expression: str, rows: int, lookups: int) -> list[float]:
+    ids = [random.randint(1, rows) for _ in range(lookups)]
+    keys = [
+        connection.execute(text(f"SELECT {expression} FROM (SELECT CAST(:i AS bigint) AS i) s"), {"i": i}).scalar()
+        for i in ids
+    ]
+    timings = []
+    for key in keys:
+        start = time.perf_counter()
+        connection.execute(text(f"SELECT id FROM {table} WHERE token = :token"), {"token": key}).scalar()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    url = os.getenv("BENCHMARK_DATABASE_URL") or os.getenv("DATABASE_URL")
+    if not url:
+        raise ValueError("Set BENCHMARK_DATABASE_URL or DATABASE_URL to a PostgreSQL database.")
+    engine = create_engine(url)
+
+    print(f"{'table':<22} {'index size':>12} {'p50 ms':>8} {'p99 ms':>8}")
+    for table, expression in TABLES.items():
+        with engine.begin() as connection:
+            build_table(connection, table, expression, args.rows)
+        with engine.connect() as connection:
+            index_size = connection.execute(
+                text("SELECT pg_size_pretty(pg_relation_size(:index))"), {"index": f"{table}_token_key"}
+            ).scalar()
+            timings = sorted(measure_lookups(connection, table, expression, args.rows, args.lookups))
+        p99 = timings[int(len(timings) * 0.99) - 1]
+        print(f"{table:<22} {index_size:>12} {statistics.median(timings):>8.3f} {p99:>8.3f}")
+
+    with engine.begin() as connection:
+        for table in TABLES:
+            connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,18 @@
 import os
 import sys
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool
 from dotenv import load_dotenv
-from app.db.database import Base, get_db
+from app.db.database import Base, get_db, get_session_factory, get_async_database_url
+from app.core.config import config
 from app.main import app
+from app.utils.query_tracking import instrument_engine
+from app.utils.service_cache import LocalCacheBackend, service_cache
 
 # Load environment variables
 load_dotenv()
@@ -29,18 +35,29 @@ try:
         connect_args={"options": "-c timezone=UTC"}
     )
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # NullPool keeps asyncpg connections from leaking across per-test event loops
+    async_engine = create_async_engine(
+        get_async_database_url(TEST_DATABASE_URL),
+        poolclass=NullPool,
+        connect_args={"server_settings": {"timezone": "UTC"}},
+    )
+    AsyncTestingSessionLocal = async_sessionmaker(
+        bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
 except Exception as e:
     raise RuntimeError(f"Failed to create test database engine: {e}")
 
+# Count statements per request, and fail tests on endpoints that exceed their query budget
+instrument_engine(async_engine)
+config.QUERY_BUDGET_STRICT = True
+
 # Override the get_db dependency to use the test database
-def override_get_db():
-    db = TestingSessionLocal()
-    try:
+async def override_get_db():
+    async with AsyncTestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_session_factory] = lambda: AsyncTestingSessionLocal
 
 # Fixture for creating a fresh test database and cleaning it up
 @pytest.fixture(scope="function")
@@ -65,6 +82,46 @@ def db():
         print("Test database teardown complete.")
 
 
+# Fixture for an async session on a fresh test database
+@pytest_asyncio.fixture(scope="function")
+async def async_db():
+    """
+    Provides a fresh async database session for each test function.
+    """
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    # Cached reads must not outlive the rows they were loaded from
+    service_cache.backend = LocalCacheBackend(max_size=1000, ttl_seconds=60)
+    async with AsyncTestingSessionLocal() as db_session:
+        yield db_session
+    Base.metadata.drop_all(bind=engine)
+
+
+# Fixture for code that opens its own sessions (streams, background jobs)
+@pytest.fixture(scope="function")
+def session_factory():
+    """
+    Provides the async session factory bound to the test database.
+    """
+    return AsyncTestingSessionLocal
+
+
+# Fixture recording every statement sent through the async test engine
+@pytest.fixture(scope="function")
+def count_queries():
+    """
+    Provides a list that collects the SQL of each statement executed while the test runs.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
 # Fixture for the FastAPI TestClient
 @pytest.fixture(scope="module")  # Change scope to 'function' for isolated clients per test
 def test_client():
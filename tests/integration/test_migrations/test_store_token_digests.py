@@ -0,0 +1,74 @@
+"""
+Integration tests for the backfill in the `store_token_digests` migration.
+"""
+
+import importlib.util
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import pytest
+from sqlalchemy import select
+from app.models.token import Token
+from app.models.user import User
+from app.utils.security_utils import generate_secure_value
+
+MIGRATION = Path(__file__).parents[3] / "alembic" / "versions" / "ccc8a3e9a365_store_token_digests.py"
+
+
+@pytest.fixture
+def migration():
+    """Loads the migration module, which is not importable as a package."""
+    spec = importlib.util.spec_from_file_location("store_token_digests", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def plaintext_tokens(db):
+    """Seeds five token rows holding plaintext values, as before the migration."""
+    user = User(email="backfill@example.com", hashed_password="hashed123", first_name="Test", last_name="User")
+    db.add(user)
+    db.flush()
+    now = datetime.now(timezone.utc)
+    raw = [(f"access-{i}", f"refresh-{i}") for i in range(5)]
+    db.add_all(
+        Token(
+            token=access,
+            refresh_token=refresh,
+            user_id=user.id,
+            expires_at=now + timedelta(minutes=15),
+            refresh_expires_at=now + timedelta(days=7),
+        )
+        for access, refresh in raw
+    )
+    db.commit()
+    return raw
+
+
+def test_backfill_hashes_rows_in_batches(db, migration, plaintext_tokens):
+    """
+    Test that every plaintext row is replaced by its digest, two ids per batch.
+    """
+    batches = migration.backfill(db.connection(), batch_size=2)
+    db.commit()
+
+    assert batches == 3
+    rows = db.execute(select(Token.token, Token.refresh_token).order_by(Token.id)).all()
+    assert rows == [
+        (generate_secure_value(access), generate_secure_value(refresh))
+        for access, refresh in plaintext_tokens
+    ]
+
+
+def test_backfill_is_resumable(db, migration, plaintext_tokens):
+    """
+    Test that running the backfill again leaves existing digests untouched.
+    """
+    migration.backfill(db.connection(), batch_size=2)
+    db.commit()
+    first = db.execute(select(Token.token, Token.refresh_token).order_by(Token.id)).all()
+
+    migration.backfill(db.connection(), batch_size=2)
+    db.commit()
+
+    assert db.execute(select(Token.token, Token.refresh_token).order_by(Token.id)).all() == first
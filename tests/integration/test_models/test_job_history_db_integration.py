@@ -1,7 +1,10 @@
 from datetime import datetime, timezone
 import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
 from app.models.job_history import JobHistory
 from app.models.user import User
+from app.services.job_history_service import JobHistoryService
 
 
 def strip_timezone(dt):
@@ -88,3 +91,40 @@ def test_job_history_with_end_date(db):
     assert job_history.is_active is False
     assert strip_timezone(job_history.start_date) == strip_timezone(start_date)
     assert strip_timezone(job_history.end_date) == strip_timezone(end_date)
+
+
+def explain(db, statement) -> str:
+    """Return the Postgres plan for `statement` as one string."""
+    sql = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    return "\n".join(db.execute(text(f"EXPLAIN {sql}")).scalars())
+
+
+@pytest.mark.parametrize("current_only", [False, True])
+def test_user_jobs_queries_use_composite_index(db, current_only):
+    """
+    Test that a user's job queries are served by the (user_id, is_active, start_date)
+    index, now the only index on job_histories.user_id.
+    """
+    user = User(email="plan@example.com", hashed_password="hashed_password", first_name="Plan", last_name="Check")
+    other = User(email="other@example.com", hashed_password="hashed_password", first_name="Other", last_name="User")
+    db.add_all([user, other])
+    db.commit()
+    # Most rows belong to another user, so filtering on user_id is selective
+    db.add_all(
+        JobHistory(user_id=owner.id, location="Remote", description=f"Job {i}", is_active=False,
+                   start_date=datetime(2020, 1, 1, tzinfo=timezone.utc),
+                   end_date=datetime(2021, 1, 1, tzinfo=timezone.utc))
+        for owner, count in ((user, 5), (other, 500))
+        for i in range(count)
+    )
+    db.commit()
+    db.execute(text("ANALYZE job_histories"))
+    # The table is still small, so make a sequential scan unattractive rather than impossible
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+
+    criteria = JobHistoryService._user_jobs_criteria(user.id, current_only)
+    jobs_plan = explain(db, select(JobHistory).where(*criteria).order_by(JobHistory.id))
+    version_plan = explain(db, select(func.max(JobHistory.updated_at), func.count()).where(*criteria))
+
+    assert "ix_job_histories_user_id_is_active_start_date" in jobs_plan
+    assert "ix_job_histories_user_id_is_active_start_date" in version_plan
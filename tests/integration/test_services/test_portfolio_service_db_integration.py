@@ -0,0 +1,176 @@
+"""
+Integration tests for PortfolioService.
+
+These tests pin the number of statements needed to load a portfolio.
+"""
+
+import pytest
+from datetime import datetime, timezone
+from fastapi import HTTPException
+from sqlalchemy import select
+from app.models.job_history import JobHistory
+from app.models.portfolio_snapshot import PortfolioSnapshot
+from app.models.project import Project
+from app.models.skill import Skill
+from app.models.user import User
+from app.schemas.job_history import JobHistoryCreate
+from app.services.job_history_service import JobHistoryService
+from app.services.portfolio_service import PortfolioService
+from app.utils.portfolio_snapshots import SnapshotRefresher
+from app.utils.serialization_utils import dumps
+
+
+async def create_portfolio(db, jobs: int) -> int:
+    """Creates a user with `jobs` job histories, each with a work project and a personal project."""
+    user = User(
+        email=f"portfolio{jobs}@example.com",
+        hashed_password="hashed_password",
+        first_name="John",
+        last_name="Doe",
+        is_active=True,
+    )
+    python, sql = Skill(name="Python"), Skill(name="SQL")
+    now = datetime.now(timezone.utc)
+    for index in range(jobs):
+        job = JobHistory(
+            user=user,
+            location="Remote",
+            description=f"Job {index}",
+            is_active=True,
+            start_date=now,
+            skills=[python, sql],
+        )
+        Project(user=user, job_history=job, name=f"Work {index}", start_date=now, skills=[python])
+        Project(user=user, name=f"Personal {index}", start_date=now, skills=[sql])
+    db.add(user)
+    await db.commit()
+    user_id = user.id
+    db.expunge_all()
+    return user_id
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("jobs", [1, 25])
+async def test_get_portfolio_round_trips(async_db, count_queries, jobs):
+    """
+    Test that a portfolio loads in five statements regardless of its size.
+    """
+    user_id = await create_portfolio(async_db, jobs)
+    count_queries.clear()
+
+    portfolio = await PortfolioService(async_db).get_portfolio(user_id)
+
+    assert len(count_queries) == 5
+    assert len(portfolio["job_histories"]) == jobs
+    assert len(portfolio["projects"]) == jobs * 2
+    assert [skill["name"] for skill in portfolio["job_histories"][0]["skills"]] == ["Python", "SQL"]
+    assert all(project["skills"] for project in portfolio["projects"])
+
+
+@pytest.mark.asyncio
+async def test_get_portfolio_not_found(async_db):
+    """
+    Test that a missing user returns 404.
+    """
+    with pytest.raises(HTTPException) as exc_info:
+        await PortfolioService(async_db).get_portfolio(999)
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_snapshot_built_on_first_read(async_db):
+    """
+    Test that a missing snapshot is built on read and matches the live portfolio.
+    """
+    user_id = await create_portfolio(async_db, 2)
+
+    snapshot = await PortfolioService(async_db).get_snapshot(user_id)
+
+    assert snapshot.version == 1
+    live = await PortfolioService(async_db).get_portfolio(user_id)
+    assert snapshot.document == dumps(live).decode()
+
+
+@pytest.mark.asyncio
+async def test_refresher_rebuilds_scheduled_snapshots(async_db, session_factory):
+    """
+    Test that scheduled users are rebuilt once each and the version increases.
+    """
+    user_id = await create_portfolio(async_db, 1)
+    await PortfolioService(async_db).refresh_snapshot(user_id)
+    refresher = SnapshotRefresher()
+
+    refresher.schedule(user_id)
+    refresher.schedule(user_id)
+    refresher.schedule(999)  # Deleted users are skipped
+    refreshed = await refresher.refresh_pending(session_factory)
+
+    assert refreshed == 1
+    assert refresher.failures == 0
+    async_db.expunge_all()
+    snapshot = await PortfolioService(async_db).get_snapshot(user_id)
+    assert snapshot.version == 2
+
+
+async def stored_snapshot(db, user_id: int) -> PortfolioSnapshot:
+    db.expunge_all()
+    result = await db.execute(select(PortfolioSnapshot).where(PortfolioSnapshot.user_id == user_id))
+    return result.scalars().one()
+
+
+@pytest.mark.asyncio
+async def test_write_marks_snapshot_stale_and_read_rebuilds(async_db):
+    """
+    Test that a job history write marks the snapshot stale in its own transaction,
+    so the next read rebuilds it even though no refresher ran.
+    """
+    user_id = await create_portfolio(async_db, 1)
+    await PortfolioService(async_db).refresh_snapshot(user_id)
+
+    await JobHistoryService(async_db).create_job_history(JobHistoryCreate(
+        user_id=user_id, location="Remote", description="New job",
+        is_active=True, start_date=datetime.now(timezone.utc),
+    ))
+    assert (await stored_snapshot(async_db, user_id)).is_stale
+
+    snapshot = await PortfolioService(async_db).get_snapshot(user_id)
+
+    assert not snapshot.is_stale
+    assert snapshot.version == 2
+    assert "New job" in snapshot.document
+
+
+@pytest.mark.asyncio
+async def test_mark_before_first_build(async_db):
+    """
+    Test that marking a user without a snapshot leaves an unbuilt row that the next read builds.
+    """
+    user_id = await create_portfolio(async_db, 1)
+    await PortfolioSnapshot.mark_stale(async_db, user_id)
+    await async_db.commit()
+
+    placeholder = await stored_snapshot(async_db, user_id)
+    assert placeholder.document is None
+    assert placeholder.is_stale
+
+    snapshot = await PortfolioService(async_db).get_snapshot(user_id)
+    assert snapshot.document is not None
+    assert snapshot.built_from_version == snapshot.source_version == 1
+
+
+@pytest.mark.asyncio
+async def test_build_from_older_source_version_is_discarded(async_db):
+    """
+    Test that a build which read an older `source_version` does not replace a newer one.
+    """
+    user_id = await create_portfolio(async_db, 1)
+    await PortfolioSnapshot.mark_stale(async_db, user_id)
+    await PortfolioSnapshot.mark_stale(async_db, user_id)
+    await async_db.commit()
+    await PortfolioService(async_db).refresh_snapshot(user_id)
+    version = (await stored_snapshot(async_db, user_id)).version
+
+    snapshot = await PortfolioService(async_db).refresh_snapshot(user_id, source_version=1)
+
+    assert snapshot.version == version
+    assert snapshot.built_from_version == 2
@@ -0,0 +1,106 @@
+"""
+Integration tests for the batched purge of expired tokens.
+"""
+
+from datetime import datetime, timedelta, timezone
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, insert, select
+from app.models.token import Token
+from app.models.user import User
+from app.utils.token_purge import purge_expired_tokens
+
+EXPIRED = 7
+LIVE = 3
+BATCH_SIZE = 3
+
+
+@pytest_asyncio.fixture
+async def seeded_tokens(async_db):
+    """
+    Seeds EXPIRED tokens whose refresh token has expired, plus LIVE tokens that
+    are still refreshable (one of them with an expired access token).
+    """
+    user = User(email="purge@example.com", hashed_password="hashed123", first_name="Test", last_name="User")
+    async_db.add(user)
+    await async_db.commit()
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "token": f"expired-access-{i}",
+            "refresh_token": f"expired-refresh-{i}",
+            "user_id": user.id,
+            "expires_at": now - timedelta(days=8),
+            "refresh_expires_at": now - timedelta(days=1),
+        }
+        for i in range(EXPIRED)
+    ]
+    rows += [
+        {
+            "token": f"live-access-{i}",
+            "refresh_token": f"live-refresh-{i}",
+            "user_id": user.id,
+            # Access tokens expire long before refresh tokens; those rows must stay
+            "expires_at": now + (timedelta(minutes=15) if i else -timedelta(minutes=15)),
+            "refresh_expires_at": now + timedelta(days=7),
+        }
+        for i in range(LIVE)
+    ]
+    # Core insert skips the model's future-expiry validators
+    await async_db.execute(insert(Token), rows)
+    await async_db.commit()
+
+
+async def remaining_tokens(async_db) -> list[str]:
+    result = await async_db.execute(select(Token.token).order_by(Token.token))
+    return list(result.scalars())
+
+
+@pytest.mark.asyncio
+async def test_delete_expired_tokens_in_batches(async_db, seeded_tokens, count_queries, monkeypatch):
+    """
+    Test that every expired row is deleted over several committed batches,
+    with a pause between them, and live rows survive.
+    """
+    commits, pauses = [], []
+    event.listen(async_db.sync_session, "after_commit", lambda session: commits.append(1))
+
+    async def record_pause(seconds):
+        pauses.append(seconds)
+
+    monkeypatch.setattr("app.models.token.asyncio.sleep", record_pause)
+
+    deleted = await Token.delete_expired_tokens(async_db, batch_size=BATCH_SIZE, pause_seconds=0.5)
+
+    assert deleted == EXPIRED
+    deletes = [statement for statement in count_queries if statement.lstrip().upper().startswith("DELETE")]
+    # 3 + 3 + 1: the short batch ends the loop
+    assert len(deletes) == 3
+    assert all("FOR UPDATE SKIP LOCKED" in statement for statement in deletes)
+    assert len(commits) == 3
+    assert pauses == [0.5, 0.5]
+    assert await remaining_tokens(async_db) == [f"live-access-{i}" for i in range(LIVE)]
+
+
+@pytest.mark.asyncio
+async def test_delete_expired_tokens_exact_multiple(async_db, seeded_tokens, count_queries):
+    """
+    Test that an empty final batch stops the purge when the count is a multiple of the batch size.
+    """
+    deleted = await Token.delete_expired_tokens(async_db, batch_size=EXPIRED)
+
+    assert deleted == EXPIRED
+    assert len([s for s in count_queries if s.lstrip().upper().startswith("DELETE")]) == 2
+
+
+@pytest.mark.asyncio
+async def test_purge_expired_tokens(async_db, seeded_tokens, session_factory):
+    """
+    Test that the scheduled purge removes only expired rows and reports how many.
+    """
+    assert await purge_expired_tokens(session_factory) == EXPIRED
+    assert await purge_expired_tokens(session_factory) == 0
+
+    count = await async_db.execute(select(func.count()).select_from(Token))
+    assert count.scalar_one() == LIVE
@@ -0,0 +1,98 @@
+"""
+Integration tests for TokenService storing and finding tokens by digest.
+"""
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import select
+from app.models.token import Token
+from app.models.user import User
+from app.services.token_service import TokenService
+from app.utils.security_utils import TOKEN_DIGEST_LENGTH, generate_secure_value
+from app.utils.token_revocation import revocation_list
+
+
+@pytest_asyncio.fixture
+async def issued_token(async_db):
+    """Creates a user and issues them an access and refresh token."""
+    user = User(email="digest@example.com", hashed_password="hashed123", first_name="Test", last_name="User")
+    async_db.add(user)
+    await async_db.commit()
+    response = await TokenService(async_db).create_token(user.id, {"sub": user.email})
+    yield response
+    revocation_list.clear()
+
+
+async def stored_token(async_db) -> Token:
+    return (await async_db.execute(select(Token))).scalars().one()
+
+
+@pytest.mark.asyncio
+async def test_row_stores_digests_not_tokens(async_db, issued_token):
+    """
+    Test that the tokens row holds the digests of the issued tokens, never the JWTs.
+    """
+    token = await stored_token(async_db)
+
+    assert token.token == generate_secure_value(issued_token.access_token)
+    assert token.refresh_token == generate_secure_value(issued_token.refresh_token)
+    assert len(token.token) == len(token.refresh_token) == TOKEN_DIGEST_LENGTH
+    assert issued_token.access_token not in (token.token, token.refresh_token)
+    assert issued_token.refresh_token not in (token.token, token.refresh_token)
+
+
+@pytest.mark.asyncio
+async def test_raw_token_matches_no_row(async_db, issued_token):
+    """
+    Test that looking up a raw token, or a stored digest used as a token, finds nothing.
+    """
+    for value in (issued_token.access_token, issued_token.refresh_token):
+        result = await async_db.execute(
+            select(Token).where((Token.token == value) | (Token.refresh_token == value))
+        )
+        assert result.first() is None
+
+    token = await stored_token(async_db)
+    with pytest.raises(HTTPException) as exc_info:
+        await TokenService(async_db).refresh_access_token(token.refresh_token)
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_refresh_finds_row_by_digest(async_db, issued_token):
+    """
+    Test that refreshing finds the row from the raw refresh token and stores the new access token's digest.
+    """
+    new_access_token = await TokenService(async_db).refresh_access_token(issued_token.refresh_token)
+
+    token = await stored_token(async_db)
+    assert token.token == generate_secure_value(new_access_token)
+    assert token.refresh_token == generate_secure_value(issued_token.refresh_token)
+
+
+@pytest.mark.asyncio
+async def test_blacklist_finds_row_by_digest(async_db, issued_token):
+    """
+    Test that blacklisting finds the row from the raw access token and revokes its digest.
+    """
+    await TokenService(async_db).blacklist_token(issued_token.access_token)
+
+    token = await stored_token(async_db)
+    assert token.is_blacklisted is True
+    assert revocation_list.is_revoked(issued_token.access_token)
+
+
+@pytest.mark.asyncio
+async def test_model_blacklist_on_row_found_by_digest(async_db, issued_token):
+    """
+    Test that `Token.blacklist` on the row found by digest is what the revocation sync loads.
+    """
+    digest = generate_secure_value(issued_token.access_token)
+    token = (await async_db.execute(select(Token).where(Token.token == digest))).scalars().one()
+
+    token.blacklist()
+    await async_db.commit()
+    await revocation_list.load(async_db)
+
+    assert revocation_list.is_revoked(issued_token.access_token)
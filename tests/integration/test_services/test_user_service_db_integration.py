@@ -0,0 +1,122 @@
+"""
+Integration tests for UserService registration and login pipelines.
+
+These tests pin the number of statements each pipeline sends to the database.
+"""
+
+import pytest
+from fastapi import HTTPException
+from app.db.dependency import get_current_user
+from app.schemas.register import RegisterRequest
+from app.services.user_service import UserService
+from app.utils.token_cache import TokenCache, token_cache
+from app.utils.token_revocation import RevocationList, revocation_list
+
+
+@pytest.fixture
+def worker_auth_state():
+    """
+    Empties this worker's token cache and revocation set before and after the test.
+    """
+    token_cache.clear()
+    revocation_list.clear()
+    yield
+    token_cache.clear()
+    revocation_list.clear()
+
+
+@pytest.fixture
+def register_data():
+    """Provides a sample registration request."""
+    return RegisterRequest(
+        email="pipeline@example.com",
+        password="securepassword",
+        first_name="John",
+        last_name="Doe",
+    )
+
+
+@pytest.mark.asyncio
+async def test_register_round_trips(async_db, count_queries, register_data):
+    """
+    Test that registration is one user INSERT and one token INSERT.
+    """
+    response = await UserService(async_db).register_user(register_data)
+
+    assert response.id is not None
+    assert response.token.access_token
+    assert len(count_queries) == 2
+    assert "ON CONFLICT" in count_queries[0]
+
+
+@pytest.mark.asyncio
+async def test_register_duplicate_email(async_db, register_data):
+    """
+    Test that a second registration with the same email is rejected.
+    """
+    await UserService(async_db).register_user(register_data)
+
+    with pytest.raises(HTTPException, match="Email already registered"):
+        await UserService(async_db).register_user(register_data)
+
+
+@pytest.mark.asyncio
+async def test_login_round_trips(async_db, count_queries, register_data):
+    """
+    Test that login is one user SELECT and one token INSERT.
+    """
+    await UserService(async_db).register_user(register_data)
+    count_queries.clear()
+
+    response = await UserService(async_db).login_user(register_data.email, register_data.password)
+
+    assert response.email == register_data.email
+    assert len(count_queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_login_invalid_password(async_db, register_data):
+    """
+    Test that a wrong password is rejected with 401.
+    """
+    await UserService(async_db).register_user(register_data)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await UserService(async_db).login_user(register_data.email, "wrongpassword")
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("action", ["deactivate_user_by_id", "delete_user_by_id"])
+async def test_user_rejected_on_other_worker_with_cached_token(
+    async_db, session_factory, register_data, worker_auth_state, monkeypatch, action
+):
+    """
+    Test that deactivating or deleting a user on another worker rejects their
+    token on this worker after its revocation sync, even though it is cached here.
+    """
+    response = await UserService(async_db).register_user(register_data)
+    access_token = response.token.access_token
+    # This worker verifies the token, caching it
+    assert (await get_current_user(access_token, async_db)).id == response.id
+
+    # Another worker, with its own session, revocation set and token cache, makes the change
+    other_worker = RevocationList()
+    other_cache = TokenCache(max_size=10, ttl_seconds=60)
+    with monkeypatch.context() as patched:
+        patched.setattr("app.services.user_service.revocation_list", other_worker)
+        patched.setattr("app.models.user.token_cache", other_cache)
+        patched.setattr("app.services.user_service.token_cache", other_cache)
+        patched.setattr("app.utils.token_revocation.token_cache", other_cache)
+        async with session_factory() as other_db:
+            await getattr(UserService(other_db), action)(response.id)
+    assert other_worker.is_revoked(access_token)
+    assert not revocation_list.is_revoked(access_token)
+    assert token_cache.get(access_token) is not None
+
+    await revocation_list.load(async_db)
+
+    assert token_cache.get(access_token) is None
+    with pytest.raises(HTTPException) as exc_info:
+        await get_current_user(access_token, async_db)
+    assert exc_info.value.status_code == 401
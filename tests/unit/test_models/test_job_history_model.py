@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta, timezone
 import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
 from app.models.job_history import JobHistory
 
 
@@ -73,3 +75,14 @@ def test_is_current():
     # End_date in the future - job is current
     job.end_date = datetime.now(timezone.utc) + timedelta(days=1)
     assert job.is_current is True
+
+
+def test_is_current_in_sql():
+    """
+    Test that is_current compiles to a SQL filter on end_date.
+    """
+    statement = select(JobHistory.id).where(JobHistory.is_current)
+
+    assert "job_histories.end_date IS NULL OR job_histories.end_date > now()" in str(
+        statement.compile(dialect=postgresql.dialect())
+    )
@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta, timezone
 from app.models.token import Token
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
 
 
 def test_token_model_initialization():
@@ -38,3 +40,37 @@ def test_token_model_blacklisted_flag():
     )
 
     assert token.is_blacklisted is True
+
+
+def test_token_expiry_hybrids():
+    """
+    Test the expiry checks on an instance, including an explicit comparison time.
+    """
+    now = datetime.now(timezone.utc)
+    token = Token(
+        token="access123",
+        refresh_token="refresh123",
+        user_id=1,
+        expires_at=now + timedelta(minutes=15),
+        refresh_expires_at=now + timedelta(days=7),
+        is_blacklisted=False
+    )
+
+    assert token.is_live is True
+    assert token.is_access_token_expired() is False
+    assert token.is_access_token_expired(now + timedelta(hours=1)) is True
+    assert token.is_refresh_token_expired(now + timedelta(days=8)) is True
+
+    token.blacklist()
+    assert token.is_live is False
+
+
+def test_token_expiry_hybrids_in_sql():
+    """
+    Test that the expiry checks compile to SQL comparisons against now().
+    """
+    live = str(select(Token.id).where(Token.is_live).compile(dialect=postgresql.dialect()))
+    expired = str(select(Token.id).where(Token.is_expired).compile(dialect=postgresql.dialect()))
+
+    assert "NOT tokens.is_blacklisted AND tokens.refresh_expires_at >= now()" in live
+    assert "tokens.expires_at < now() OR tokens.refresh_expires_at < now()" in expired
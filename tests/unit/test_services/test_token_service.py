@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy.exc import OperationalError
+from app.models.token import Token
+from app.services.token_service import TokenService
+from app.utils.security_utils import generate_secure_value
+from app.utils.token_revocation import revocation_list
+
+
+class FakeDatabase:
+    """
+    `DatabaseUtils` stand-in holding one token row, whose commit can be made to fail.
+    """
+
+    def __init__(self, token: Token, commit_fails: bool):
+        self.token = token
+        self.commit_fails = commit_fails
+
+    async def find_or_404(self, model, **filters):
+        return self.token
+
+    async def commit_and_refresh(self, instance):
+        if self.commit_fails:
+            raise OperationalError("COMMIT", {}, Exception("connection lost"))
+
+
+def make_token(raw_token: str) -> Token:
+    now = datetime.now(timezone.utc)
+    return Token(
+        token=generate_secure_value(raw_token),
+        refresh_token=generate_secure_value(f"refresh-{raw_token}"),
+        user_id=1,
+        expires_at=now + timedelta(minutes=15),
+        refresh_expires_at=now + timedelta(days=7),
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_revocations():
+    revocation_list.clear()
+    yield
+    revocation_list.clear()
+
+
+@pytest.mark.asyncio
+async def test_blacklist_revokes_locally_after_commit():
+    """
+    Test that a committed blacklist is rejected on this worker right away.
+    """
+    service = TokenService(None)
+    service._database = FakeDatabase(make_token("access-token"), commit_fails=False)
+
+    await service.blacklist_token("access-token")
+
+    assert revocation_list.is_revoked("access-token")
+
+
+@pytest.mark.asyncio
+async def test_blacklist_not_revoked_when_commit_fails():
+    """
+    Test that a blacklist rolled back in the database is not recorded on this worker.
+    """
+    service = TokenService(None)
+    service._database = FakeDatabase(make_token("access-token"), commit_fails=True)
+
+    with pytest.raises(OperationalError):
+        await service.blacklist_token("access-token")
+
+    assert not revocation_list.is_revoked("access-token")
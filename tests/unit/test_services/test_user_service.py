@@ -0,0 +1,71 @@
+import pytest
+from fastapi import HTTPException
+from app.schemas.register import RegisterRequest
+from app.services import user_service
+from app.services.user_service import UserService
+
+
+class FakeDatabase:
+    """
+    `DatabaseUtils` stand-in that records the values passed to the insert,
+    which always conflicts.
+    """
+
+    def __init__(self):
+        self.inserted = []
+        self.db = self
+
+    async def rollback(self):
+        pass
+
+    async def insert_ignore_conflicts(self, model, values, conflict_columns):
+        self.inserted.append(values)
+        return None
+
+
+@pytest.fixture
+def hashed(monkeypatch):
+    passwords = []
+
+    async def fake_hash(password):
+        passwords.append(password)
+        return f"hashed-{password}"
+
+    monkeypatch.setattr(user_service.password_hasher, "hash", fake_hash)
+    return passwords
+
+
+@pytest.mark.asyncio
+async def test_register_rejects_invalid_name_before_hashing(hashed):
+    """
+    Test that the model's name checks run before the password is hashed or the row inserted.
+    """
+    service = UserService(None)
+    service._database = FakeDatabase()
+    request = RegisterRequest(email="jane@example.com", password="secret123", first_name="Jane1", last_name="Doe")
+
+    with pytest.raises(ValueError, match="First Name must contain only alphabetic characters."):
+        await service.register_user(request)
+
+    assert hashed == []
+    assert service._database.inserted == []
+
+
+@pytest.mark.asyncio
+async def test_register_inserts_checked_values(hashed):
+    """
+    Test that the insert receives the checked fields and the hashed password.
+    """
+    service = UserService(None)
+    service._database = FakeDatabase()
+    request = RegisterRequest(email="jane@example.com", password="secret123", first_name="Jane", last_name="Doe")
+
+    with pytest.raises(HTTPException, match="Email already registered"):
+        await service.register_user(request)
+
+    assert service._database.inserted == [{
+        "email": "jane@example.com",
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "hashed_password": "hashed-secret123",
+    }]
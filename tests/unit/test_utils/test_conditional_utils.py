@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from starlette.requests import Request
+from app.utils.conditional_utils import Validators
+
+UPDATED_AT = datetime(2026, 1, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+
+
+def make_request(**headers) -> Request:
+    raw_headers = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "headers": raw_headers})
+
+
+def test_etag_changes_with_version():
+    """
+    Test that ETags are strong, stable for the same parts and change when updated_at changes.
+    """
+    etag = Validators.from_parts(1, UPDATED_AT).etag
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == Validators.from_parts(1, UPDATED_AT).etag
+    assert etag != Validators.from_parts(1, UPDATED_AT + timedelta(microseconds=1)).etag
+
+
+def test_if_none_match():
+    """
+    Test If-None-Match against the current ETag, a stale one, a list and `*`.
+    """
+    validators = Validators.from_parts(1, UPDATED_AT, last_modified=UPDATED_AT)
+
+    assert validators.is_fresh(make_request(if_none_match=validators.etag))
+    assert validators.is_fresh(make_request(if_none_match=f'"stale", W/{validators.etag}'))
+    assert validators.is_fresh(make_request(if_none_match="*"))
+    assert not validators.is_fresh(make_request(if_none_match='"stale"'))
+
+
+def test_if_modified_since():
+    """
+    Test If-Modified-Since at second resolution, and that If-None-Match takes precedence.
+    """
+    validators = Validators.from_parts(1, UPDATED_AT, last_modified=UPDATED_AT)
+    last_modified = format_datetime(UPDATED_AT.replace(microsecond=0), usegmt=True)
+    earlier = format_datetime(UPDATED_AT - timedelta(seconds=1), usegmt=True)
+
+    assert validators.headers["Last-Modified"] == last_modified
+    assert validators.is_fresh(make_request(if_modified_since=last_modified))
+    assert not validators.is_fresh(make_request(if_modified_since=earlier))
+    assert not validators.is_fresh(make_request(if_modified_since="not a date"))
+    assert not validators.is_fresh(make_request(if_none_match='"stale"', if_modified_since=last_modified))
+
+
+def test_not_modified_response():
+    """
+    Test that the 304 response is empty and carries the validators.
+    """
+    validators = Validators.from_parts(1, UPDATED_AT, last_modified=UPDATED_AT)
+
+    response = validators.not_modified()
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == validators.etag
@@ -1,15 +1,18 @@
 import pytest
+from sqlalchemy import inspect
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from app.models.user import User
+from app.schemas.user import UserResponse
 from app.utils.database_utils import DatabaseUtils
 
 
-def test_add_and_commit(db):
+@pytest.mark.asyncio
+async def test_add_and_commit(async_db):
     """
     Test the add_and_commit method.
     """
-    db_utils = DatabaseUtils(db)
+    db_utils = DatabaseUtils(async_db)
 
     user = User(
         email="test_user@example.com",
@@ -19,18 +22,19 @@ def test_add_and_commit(db):
         is_active=True
     )
 
-    saved_user = db_utils.add_and_commit(user)
+    saved_user = await db_utils.add_and_commit(user)
 
     # Validate that the user was saved
     assert saved_user.id is not None
     assert saved_user.email == "test_user@example.com"
 
 
-def test_commit_and_refresh(db):
+@pytest.mark.asyncio
+async def test_commit_and_refresh(async_db):
     """
     Test the commit_and_refresh method.
     """
-    db_utils = DatabaseUtils(db)
+    db_utils = DatabaseUtils(async_db)
 
     user = User(
         email="refresh_test@example.com",
@@ -39,22 +43,23 @@ def test_commit_and_refresh(db):
         last_name="Smith",
         is_active=False
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    async_db.add(user)
+    await async_db.commit()
+    await async_db.refresh(user)
 
     # Update an attribute and commit
     user.first_name = "Updated"
-    updated_user = db_utils.commit_and_refresh(user)
+    updated_user = await db_utils.commit_and_refresh(user)
 
     assert updated_user.first_name == "Updated"
 
 
-def test_get_by_id_success(db):
+@pytest.mark.asyncio
+async def test_get_by_id_success(async_db):
     """
     Test the get_by_id method with a valid ID.
     """
-    db_utils = DatabaseUtils(db)
+    db_utils = DatabaseUtils(async_db)
 
     user = User(
         email="getbyid_test@example.com",
@@ -63,29 +68,31 @@ def test_get_by_id_success(db):
         last_name="Evans",
         is_active=True
     )
-    saved_user = db_utils.add_and_commit(user)
+    saved_user = await db_utils.add_and_commit(user)
 
-    retrieved_user = db_utils.get_by_id(User, saved_user.id)
+    retrieved_user = await db_utils.get_by_id(User, saved_user.id)
 
     assert retrieved_user.id == saved_user.id
     assert retrieved_user.email == "getbyid_test@example.com"
 
 
-def test_get_by_id_not_found(db):
+@pytest.mark.asyncio
+async def test_get_by_id_not_found(async_db):
     """
     Test the get_by_id method with an invalid ID.
     """
-    db_utils = DatabaseUtils(db)
+    db_utils = DatabaseUtils(async_db)
 
     with pytest.raises(HTTPException, match="User with ID 1 not found"):
-        db_utils.get_by_id(User, 1)
+        await db_utils.get_by_id(User, 1)
 
 
-def test_find_or_404(db):
+@pytest.mark.asyncio
+async def test_find_or_404(async_db):
     """
     Test the find_or_404 method.
     """
-    db_utils = DatabaseUtils(db)
+    db_utils = DatabaseUtils(async_db)
 
     user = User(
         email="findor404_test@example.com",
@@ -94,20 +101,21 @@ def test_find_or_404(db):
         last_name="Ruffalo",
         is_active=True
     )
-    db_utils.add_and_commit(user)
+    await db_utils.add_and_commit(user)
 
-    retrieved_user = db_utils.find_or_404(User, email="findor404_test@example.com")
+    retrieved_user = await db_utils.find_or_404(User, email="findor404_test@example.com")
     assert retrieved_user.email == "findor404_test@example.com"
 
     with pytest.raises(HTTPException, match="User with email=nonexistent@example.com not found"):
-        db_utils.find_or_404(User, email="nonexistent@example.com")
+        await db_utils.find_or_404(User, email="nonexistent@example.com")
 
 
-def test_delete_and_commit(db):
+@pytest.mark.asyncio
+async def test_delete_and_commit(async_db):
     """
     Test the delete_and_commit method.
     """
-    db_utils = DatabaseUtils(db)
+    db_utils = DatabaseUtils(async_db)
 
     user = User(
         email="delete_test@example.com",
@@ -116,19 +124,20 @@ def test_delete_and_commit(db):
         last_name="Rudd",
         is_active=True
     )
-    saved_user = db_utils.add_and_commit(user)
+    saved_user = await db_utils.add_and_commit(user)
 
-    db_utils.delete_and_commit(saved_user)
+    await db_utils.delete_and_commit(saved_user)
 
     with pytest.raises(HTTPException, match="User with ID .* not found"):
-        db_utils.get_by_id(User, saved_user.id)
+        await db_utils.get_by_id(User, saved_user.id)
 
 
-def test_find_and_update(db):
+@pytest.mark.asyncio
+async def test_find_and_update(async_db):
     """
     Test the find_and_update method.
     """
-    db_utils = DatabaseUtils(db)
+    db_utils = DatabaseUtils(async_db)
 
     user = User(
         email="update_test@example.com",
@@ -137,19 +146,20 @@ def test_find_and_update(db):
         last_name="Larson",
         is_active=True
     )
-    saved_user = db_utils.add_and_commit(user)
+    saved_user = await db_utils.add_and_commit(user)
 
-    updated_user = db_utils.find_and_update(User, saved_user.id, {"first_name": "Updated"})
+    updated_user = await db_utils.find_and_update(User, saved_user.id, {"first_name": "Updated"})
 
     assert updated_user.first_name == "Updated"
     assert updated_user.id == saved_user.id
 
 
-def test_bulk_update(db):
+@pytest.mark.asyncio
+async def test_bulk_update(async_db):
     """
     Test the bulk_update method.
     """
-    db_utils = DatabaseUtils(db)
+    db_utils = DatabaseUtils(async_db)
 
     user1 = User(
         email="bulk1@example.com",
@@ -165,15 +175,117 @@ def test_bulk_update(db):
         last_name="User",
         is_active=False
     )
-    db_utils.add_and_commit(user1)
-    db_utils.add_and_commit(user2)
+    await db_utils.add_and_commit(user1)
+    await db_utils.add_and_commit(user2)
 
     updates = [
         {"id": user1.id, "first_name": "UpdatedFirst"},
         {"id": user2.id, "first_name": "UpdatedSecond", "is_active": True}
     ]
-    updated_users = db_utils.bulk_update(User, updates)
+    updated_users = await db_utils.bulk_update(User, updates)
 
     assert updated_users[0].first_name == "UpdatedFirst"
     assert updated_users[1].first_name == "UpdatedSecond"
     assert updated_users[1].is_active is True
+
+
+@pytest.mark.asyncio
+async def test_add_and_commit_returns_server_defaults(async_db):
+    """
+    Test that server-generated timestamps are populated without a refresh.
+    """
+    db_utils = DatabaseUtils(async_db)
+
+    user = User(
+        email="defaults_test@example.com",
+        hashed_password="hashed_password",
+        first_name="Tom",
+        last_name="Holland",
+        is_active=True
+    )
+    saved_user = await db_utils.add_and_commit(user)
+
+    assert saved_user.created_at is not None
+    assert saved_user.updated_at is not None
+
+
+@pytest.mark.asyncio
+async def test_find_and_update_not_found(async_db):
+    """
+    Test the find_and_update method with an invalid ID.
+    """
+    db_utils = DatabaseUtils(async_db)
+
+    with pytest.raises(HTTPException, match="User with ID 1 not found"):
+        await db_utils.find_and_update(User, 1, {"first_name": "Updated"})
+
+
+@pytest.mark.asyncio
+async def test_get_page(async_db):
+    """
+    Test keyset pagination across pages with the get_page method.
+    """
+    db_utils = DatabaseUtils(async_db)
+
+    for name in ["Alpha", "Bravo", "Charlie"]:
+        await db_utils.add_and_commit(User(
+            email=f"{name.lower()}@example.com",
+            hashed_password="hashed_password",
+            first_name=name,
+            last_name="User",
+            is_active=True
+        ))
+
+    first_page, cursor = await db_utils.get_page(User, limit=2)
+    assert [user.first_name for user in first_page] == ["Alpha", "Bravo"]
+    assert cursor is not None
+
+    second_page, cursor = await db_utils.get_page(User, limit=2, cursor=cursor)
+    assert [user.first_name for user in second_page] == ["Charlie"]
+    assert cursor is None
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_with_schema_projection(async_db, count_queries):
+    """
+    Test that passing a schema selects only the columns that schema serializes.
+    """
+    db_utils = DatabaseUtils(async_db)
+
+    user = await db_utils.add_and_commit(User(
+        email="projection@example.com",
+        hashed_password="hashed_password",
+        first_name="Project",
+        last_name="User",
+        is_active=True
+    ))
+    async_db.expunge_all()
+    count_queries.clear()
+
+    fetched_user = await db_utils.get_by_id(User, user.id, schema=UserResponse)
+
+    assert "hashed_password" not in count_queries[0]
+    assert "hashed_password" in inspect(fetched_user).unloaded
+    assert UserResponse.model_validate(fetched_user).email == "projection@example.com"
+
+
+@pytest.mark.asyncio
+async def test_get_collection_version(async_db):
+    """
+    Test that the collection version changes when a matching row is added.
+    """
+    db_utils = DatabaseUtils(async_db)
+
+    assert await db_utils.get_collection_version(User, User.is_active.is_(True)) == (None, 0)
+
+    user = await db_utils.add_and_commit(User(
+        email="version@example.com",
+        hashed_password="hashed_password",
+        first_name="Version",
+        last_name="User",
+        is_active=True
+    ))
+
+    last_modified, count = await db_utils.get_collection_version(User, User.is_active.is_(True))
+    assert count == 1
+    assert last_modified == await db_utils.get_version(User, user.id)
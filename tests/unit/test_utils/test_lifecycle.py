@@ -0,0 +1,149 @@
+import asyncio
+import json
+import signal
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+import pytest
+import uvicorn
+from app import main
+from app.api.endpoints import health
+from app.core import server
+from app.db.database import get_session_factory
+from app.utils.lifecycle import InFlightMiddleware, Lifecycle, warm_pool
+
+
+class FakeEngine:
+    """
+    Engine stand-in recording how many connections were open at once.
+    """
+
+    def __init__(self, pool_size: int):
+        self.pool = SimpleNamespace(size=lambda: pool_size)
+        self.open = 0
+        self.peak = 0
+
+    @asynccontextmanager
+    async def connect(self):
+        self.open += 1
+        self.peak = max(self.peak, self.open)
+        try:
+            async def execute(statement):
+                await asyncio.sleep(0)
+            yield SimpleNamespace(execute=execute)
+        finally:
+            self.open -= 1
+
+
+def test_ready_only_between_warmup_and_drain():
+    """
+    Test that a worker accepts traffic only after warmup and until drain starts.
+    """
+    lifecycle = Lifecycle()
+    assert lifecycle.accepting is False
+
+    lifecycle.mark_ready(0.5)
+    assert lifecycle.accepting is True
+    assert lifecycle.warmup_seconds == 0.5
+
+    lifecycle.begin_drain()
+    assert lifecycle.accepting is False
+
+
+@pytest.mark.asyncio
+async def test_middleware_counts_requests_in_flight():
+    """
+    Test that a request counts as in flight until it finishes.
+    """
+    lifecycle = Lifecycle()
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        await release.wait()
+
+    middleware = InFlightMiddleware(app, lifecycle)
+    request = asyncio.create_task(middleware({"type": "http"}, None, None))
+    await asyncio.sleep(0)
+    assert lifecycle.in_flight == 1
+
+    release.set()
+    await request
+    assert lifecycle.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_exit_signal_reports_draining(monkeypatch):
+    """
+    Test that the server's exit signal flips readiness to draining before it stops serving.
+    """
+    lifecycle = Lifecycle()
+    lifecycle.mark_ready(0.5)
+    monkeypatch.setattr(server, "lifecycle", lifecycle)
+    monkeypatch.setattr(health, "lifecycle", lifecycle)
+    draining_server = server.DrainingServer(uvicorn.Config(app=None))
+
+    draining_server.handle_exit(signal.SIGTERM, None)
+
+    assert draining_server.should_exit is True
+    response = await health.readiness()
+    assert response.status_code == 503
+    assert json.loads(response.body) == {"status": "draining"}
+
+
+@pytest.mark.asyncio
+async def test_middleware_ignores_lifespan_events():
+    """
+    Test that non-HTTP scopes are not counted as requests.
+    """
+    lifecycle = Lifecycle()
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(lifecycle.in_flight)
+
+    await InFlightMiddleware(app, lifecycle)({"type": "lifespan"}, None, None)
+
+    assert seen == [0]
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_holds_connections_open_together():
+    """
+    Test that warmup opens distinct connections at once, capped at the pool size.
+    """
+    engine = FakeEngine(pool_size=3)
+
+    assert await warm_pool(engine, 5) == 3
+    assert engine.peak == 3
+    assert engine.open == 0
+
+
+@pytest.mark.asyncio
+async def test_lifespan_uses_overridden_session_factory(monkeypatch):
+    """
+    Test that the lifespan warms up and disposes the engine of the session factory
+    from `dependency_overrides`, not the module-level one.
+    """
+    disposed = []
+
+    async def dispose():
+        disposed.append(True)
+
+    engine = SimpleNamespace(dispose=dispose)
+    session_factory = SimpleNamespace(kw={"bind": engine})
+    warmed = []
+
+    async def warm_up(engine, session_factory, connections):
+        warmed.append((engine, session_factory))
+        return 0.0
+
+    monkeypatch.setitem(main.app.dependency_overrides, get_session_factory, lambda: session_factory)
+    monkeypatch.setattr(main, "warm_up", warm_up)
+    monkeypatch.setattr(main, "lifecycle", Lifecycle())
+    monkeypatch.setattr(main.password_hasher, "shutdown", lambda: None)
+    monkeypatch.setattr(main.config, "TOKEN_PURGE_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr(main.config, "METRICS_MULTIPROCESS_DIR", "")
+
+    async with main.lifespan(main.app):
+        assert warmed == [(engine, session_factory)]
+
+    assert disposed == [True]
@@ -0,0 +1,105 @@
+import os
+import time
+from app.utils import metrics
+from app.utils.metrics import (
+    AGGREGATE_FILE,
+    MetricFamily,
+    MetricsRegistry,
+    mark_process_dead,
+    merge_snapshots,
+    render_text,
+    write_snapshot,
+)
+
+
+def test_histogram_buckets_are_cumulative():
+    """
+    Test that observations land in the first bucket that holds them and render cumulatively.
+    """
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, "/things")
+
+    text = render_text(registry.collect())
+
+    assert 'latency_seconds_bucket{route="/things",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="/things",le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{route="/things",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{route="/things"} 4' in text
+    assert "# TYPE latency_seconds histogram" in text
+
+
+def test_label_values_are_escaped():
+    """
+    Test that quotes, backslashes and newlines in label values are escaped.
+    """
+    registry = MetricsRegistry()
+    registry.counter("events_total", "Events.", ("name",)).inc('say "hi"\\\n')
+
+    assert 'events_total{name="say \\"hi\\"\\\\\\n"} 1' in render_text(registry.collect())
+
+
+def test_merge_sums_counters_and_labels_live_gauges(tmp_path):
+    """
+    Test that counters from every worker are summed, while gauges are kept
+    per worker and dropped once a worker stops updating its snapshot.
+    """
+    families = [
+        MetricFamily("requests_total", "counter", "Requests.", [("requests_total", {}, 3)]),
+        MetricFamily("in_flight", "gauge", "In flight.", [("in_flight", {}, 2)]),
+    ]
+    write_snapshot(str(tmp_path), families)
+    exited = tmp_path / "1-0.json"
+    os.replace(tmp_path / f"{metrics.process_key()}.json", exited)
+    os.utime(exited, (time.time() - 60, time.time() - 60))
+    write_snapshot(str(tmp_path), families)
+
+    merged = {family.name: family.samples for family in merge_snapshots(str(tmp_path), stale_after_seconds=15)}
+
+    assert merged["requests_total"] == [("requests_total", {}, 6)]
+    assert merged["in_flight"] == [("in_flight", {"pid": str(os.getpid())}, 2)]
+
+
+def snapshot_families(requests: int, in_flight: int) -> list[MetricFamily]:
+    return [
+        MetricFamily("requests_total", "counter", "Requests.", [("requests_total", {}, requests)]),
+        MetricFamily("in_flight", "gauge", "In flight.", [("in_flight", {}, in_flight)]),
+    ]
+
+
+def merged_samples(directory) -> dict:
+    return {family.name: family.samples for family in merge_snapshots(str(directory), stale_after_seconds=15)}
+
+
+def test_reused_pid_keeps_dead_workers_counters(tmp_path, monkeypatch):
+    """
+    Test that a worker reusing a dead worker's PID writes its own snapshot
+    instead of replacing the dead one's counters.
+    """
+    monkeypatch.setattr(metrics, "_process_key", None)
+    write_snapshot(str(tmp_path), snapshot_families(requests=5, in_flight=0))
+    monkeypatch.setattr(metrics, "_process_key", None)  # A new process with the same PID
+    write_snapshot(str(tmp_path), snapshot_families(requests=1, in_flight=1))
+
+    assert len(list(tmp_path.glob(f"{os.getpid()}-*.json"))) == 2
+    assert merged_samples(tmp_path)["requests_total"] == [("requests_total", {}, 6)]
+
+
+def test_dead_worker_folded_into_aggregate(tmp_path):
+    """
+    Test that marking a worker dead moves its counters into the aggregate,
+    drops its gauges and leaves the merged totals unchanged.
+    """
+    write_snapshot(str(tmp_path), snapshot_families(requests=2, in_flight=1))
+    (tmp_path / "99999-1.json").write_bytes((tmp_path / f"{metrics.process_key()}.json").read_bytes())
+    (tmp_path / AGGREGATE_FILE).write_bytes(b'[["requests_total", "counter", "Requests.", [["requests_total", {}, 10]]]]')
+    before = merged_samples(tmp_path)["requests_total"]
+
+    mark_process_dead(str(tmp_path), 99999)
+    mark_process_dead(str(tmp_path), 99999)  # Nothing left to fold
+
+    assert not list(tmp_path.glob("99999-*.json"))
+    merged = merged_samples(tmp_path)
+    assert before == merged["requests_total"] == [("requests_total", {}, 14)]
+    assert merged["in_flight"] == [("in_flight", {"pid": str(os.getpid())}, 1)]
@@ -0,0 +1,22 @@
+import pytest
+from fastapi import HTTPException
+from app.utils.pagination_utils import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    """
+    Test that a cursor decodes back to the values it was built from.
+    """
+    cursor = encode_cursor({"id": 42})
+
+    assert decode_cursor(cursor) == {"id": 42}
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", encode_cursor([1, 2])])
+def test_invalid_cursor(cursor):
+    """
+    Test that malformed cursors are rejected with 400.
+    """
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
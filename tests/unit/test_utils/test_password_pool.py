@@ -0,0 +1,64 @@
+import asyncio
+import time
+import pytest
+from fastapi import HTTPException
+from app.utils.password_pool import PasswordHasher
+
+
+@pytest.fixture
+def hasher():
+    pool = PasswordHasher(workers=1, queue_size=0, retry_after_seconds=2)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify(hasher):
+    """
+    Test that hashing and verification run in the pool.
+    """
+    hashed = await hasher.hash("securepassword")
+
+    assert await hasher.verify("securepassword", hashed) is True
+    assert await hasher.verify("wrongpassword", hashed) is False
+    assert hasher.stats()["completed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full(hasher):
+    """
+    Test that calls beyond workers + queue size fail fast with 503 and Retry-After.
+    """
+    results = await asyncio.gather(
+        hasher.hash("password1"), hasher.hash("password2"), return_exceptions=True
+    )
+
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(rejected) == 1
+    assert rejected[0].status_code == 503
+    assert rejected[0].headers["Retry-After"] == "2"
+    assert hasher.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_keeps_slot_until_job_finishes(hasher):
+    """
+    Test that a job whose caller was cancelled still counts against the limit while it runs.
+    """
+    await hasher.warm()
+    caller = asyncio.create_task(hasher._submit(time.sleep, 0.5))
+    await asyncio.sleep(0.2)
+
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+
+    assert hasher.stats()["in_flight"] == 1
+    with pytest.raises(HTTPException):
+        await hasher.hash("password1")
+
+    for _ in range(50):
+        if hasher.stats()["in_flight"] == 0:
+            break
+        await asyncio.sleep(0.05)
+    assert hasher.stats()["in_flight"] == 0
@@ -0,0 +1,49 @@
+import time
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+from app.db.pool import PoolMetrics, install_idle_pre_ping, pool_metrics
+
+
+def test_stats_report_occupancy_and_checkout_latency():
+    """
+    Test that stats combine the pool's occupancy with recorded checkout latency.
+    """
+    metrics = PoolMetrics()
+    metrics.observe_checkout(0.002)
+    metrics.observe_checkout(0.3)
+    pool = SimpleNamespace(size=lambda: 5, checkedin=lambda: 2, checkedout=lambda: 3, overflow=lambda: -2)
+
+    stats = metrics.stats(pool)
+
+    assert stats["checked_out"] == 3
+    assert stats["overflow"] == 0
+    assert stats["checkouts"] == 2
+    assert stats["checkout_seconds_max"] == 0.3
+    assert stats["checkout_buckets"][0.005] == 1
+    assert stats["checkout_buckets"][0.5] == 1
+
+
+@pytest.fixture
+def idle_pinged_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=1)
+    install_idle_pre_ping(SimpleNamespace(sync_engine=engine), idle_seconds=0.05)
+    yield engine
+    engine.dispose()
+
+
+def test_pre_ping_only_after_idle(idle_pinged_engine):
+    """
+    Test that a connection is pinged on checkout only once it has been idle long enough.
+    """
+    pings = pool_metrics.pings
+    for _ in range(3):
+        with idle_pinged_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    assert pool_metrics.pings == pings
+
+    time.sleep(0.06)
+    with idle_pinged_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert pool_metrics.pings == pings + 1
@@ -0,0 +1,78 @@
+import asyncio
+from contextlib import asynccontextmanager
+import pytest
+from sqlalchemy.exc import OperationalError
+from app.services.portfolio_service import PortfolioService
+from app.utils.portfolio_snapshots import SnapshotRefresher
+
+
+@asynccontextmanager
+async def session_factory():
+    yield None
+
+
+@pytest.fixture
+def rebuilds(monkeypatch):
+    """
+    Replace the snapshot rebuild; user ids in `rebuilds["fail"]` raise, those in `rebuilds["hang"]` never finish.
+    """
+    state = {"done": [], "fail": set(), "hang": set()}
+
+    async def refresh_snapshot(self, user_id):
+        if user_id in state["fail"]:
+            raise OperationalError("SELECT", {}, Exception("connection lost"))
+        if user_id in state["hang"]:
+            await asyncio.Event().wait()
+        state["done"].append(user_id)
+
+    monkeypatch.setattr(PortfolioService, "refresh_snapshot", refresh_snapshot)
+    return state
+
+
+@pytest.mark.asyncio
+async def test_failed_rebuild_is_queued_again(rebuilds):
+    """
+    Test that a rebuild failing on a transient error is retried by the next pass.
+    """
+    refresher = SnapshotRefresher()
+    rebuilds["fail"].add(1)
+    refresher.schedule(1)
+    refresher.schedule(2)
+
+    assert await refresher.refresh_pending(session_factory) == 1
+    assert refresher.failures == 1
+    assert refresher.pending == 1
+
+    rebuilds["fail"].clear()
+    assert await refresher.refresh_pending(session_factory) == 1
+    assert sorted(rebuilds["done"]) == [1, 2]
+    assert refresher.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_drain_rebuilds_queued_snapshots(rebuilds):
+    """
+    Test that draining on shutdown rebuilds what the cancelled run loop left queued.
+    """
+    refresher = SnapshotRefresher()
+    task = asyncio.create_task(refresher.run(session_factory))
+    await asyncio.sleep(0)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    refresher.schedule(1)
+
+    assert await refresher.drain(session_factory, timeout_seconds=1) == 1
+    assert rebuilds["done"] == [1]
+
+
+@pytest.mark.asyncio
+async def test_drain_timeout_keeps_interrupted_rebuild(rebuilds):
+    """
+    Test that a rebuild cut off by the drain timeout is put back, not lost.
+    """
+    refresher = SnapshotRefresher()
+    rebuilds["hang"].add(1)
+    refresher.schedule(1)
+
+    assert await refresher.drain(session_factory, timeout_seconds=0.05) == 0
+    assert refresher.pending == 1
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.core.config import config
+from app.utils.profiling import (
+    Profiler,
+    ProfilingMiddleware,
+    sign_profile_header,
+    verify_profile_header,
+)
+
+
+@pytest.fixture
+def profiling_config(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "PROFILING_SECRET", "test-secret")
+    monkeypatch.setattr(config, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "PROFILING_INTERVAL_MS", 1)
+    return tmp_path
+
+
+def scope_with(headers=()):
+    return {"type": "http", "method": "GET", "path": "/api/v1/things", "headers": list(headers)}
+
+
+def test_signed_header_is_verified(profiling_config):
+    """
+    Test that only unexpired headers signed with the secret are accepted.
+    """
+    assert verify_profile_header(sign_profile_header()) is True
+    assert verify_profile_header(sign_profile_header(valid_for_seconds=-1)) is False
+    assert verify_profile_header(f"{int(time.time()) + 60}.forged") is False
+    assert verify_profile_header("garbage") is False
+
+
+def test_requests_are_not_profiled_by_default(profiling_config):
+    """
+    Test that only signed or sampled requests are selected.
+    """
+    profiler = Profiler(sample_rate=0)
+
+    assert profiler.should_profile(scope_with()) is False
+    assert profiler.should_profile(scope_with([(b"x-profile", sign_profile_header().encode())])) is True
+    assert Profiler(sample_rate=1).should_profile(scope_with()) is True
+
+
+def busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_trace_records_running_and_waiting_stacks(profiling_config):
+    """
+    Test that a profiled request writes collapsed stacks covering both
+    CPU work and awaits, and names the trace in the response.
+    """
+    async def handler(scope, receive, send):
+        busy(0.05)
+        await asyncio.sleep(0.05)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await ProfilingMiddleware(handler, Profiler(sample_rate=1))(scope_with(), None, send)
+
+    [trace] = profiling_config.glob("*.folded")
+    assert (b"x-profile-trace", trace.name.encode()) in messages[0]["headers"]
+    stacks = trace.read_text().splitlines()
+    assert any("busy" in stack for stack in stacks)
+    assert any("handler" in stack and "(waiting)" in stack for stack in stacks)
+    assert all(stack.startswith("ProfilingMiddleware.__call__") for stack in stacks)
+
+
+@pytest.mark.asyncio
+async def test_trace_written_off_the_event_loop(profiling_config):
+    """
+    Test that joining the sampler thread and writing the trace happen in a worker thread.
+    """
+    profiler = Profiler(sample_rate=1)
+    write = profiler.write
+    threads = []
+
+    def recording_write(path, sampler):
+        threads.append(threading.get_ident())
+        write(path, sampler)
+
+    profiler.write = recording_write
+
+    async def handler(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    async def send(message):
+        pass
+
+    await ProfilingMiddleware(handler, profiler)(scope_with(), None, send)
+
+    assert threads and threads[0] != threading.get_ident()
+    assert profiler.traces_written == 1
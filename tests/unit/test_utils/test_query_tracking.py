@@ -0,0 +1,80 @@
+import pytest
+from app.core.config import config
+from app.utils.query_tracking import (
+    QueryBudgetExceeded,
+    QueryStats,
+    QueryTrackingMiddleware,
+    current_query_stats,
+    query_budget,
+)
+
+
+def test_repeated_shapes_ignore_layout():
+    """
+    Test that identical statements are grouped regardless of whitespace.
+    """
+    stats = QueryStats()
+    stats.record("SELECT * FROM skills\nWHERE id = $1", 0.001)
+    stats.record("SELECT *  FROM skills WHERE id = $1", 0.002)
+    stats.record("SELECT * FROM users", 0.001)
+
+    assert stats.count == 3
+    assert stats.repeated(2) == [("SELECT * FROM skills WHERE id = $1", 2)]
+    assert stats.server_timing == 'db;dur=4.00;desc="3 queries"'
+
+
+async def run_request(app, endpoint=None):
+    """
+    Drive the middleware through one GET and return the response start message.
+    """
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/things"}
+    if endpoint is not None:
+        scope["endpoint"] = endpoint
+    await QueryTrackingMiddleware(app)(scope, None, send)
+    return messages[0]
+
+
+def issuing(queries: int):
+    """
+    Build an ASGI app that records `queries` statements, then responds.
+    """
+    async def app(scope, receive, send):
+        for _ in range(queries):
+            current_query_stats().record("SELECT 1", 0.0)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+    return app
+
+
+@pytest.mark.asyncio
+async def test_server_timing_header():
+    """
+    Test that the response carries the request's statement count.
+    """
+    start = await run_request(issuing(2))
+
+    assert (b"server-timing", b'db;dur=0.00;desc="2 queries"') in start["headers"]
+    assert current_query_stats() is None
+
+
+@pytest.mark.asyncio
+async def test_budget_exceeded_raises_in_strict_mode(monkeypatch):
+    """
+    Test that strict mode fails a request that issues more statements than its budget.
+    """
+    monkeypatch.setattr(config, "QUERY_BUDGET_STRICT", True)
+
+    @query_budget(1)
+    async def endpoint():
+        pass
+
+    await run_request(issuing(1), endpoint)
+    with pytest.raises(QueryBudgetExceeded):
+        await run_request(issuing(2), endpoint)
+
+    monkeypatch.setattr(config, "QUERY_BUDGET_STRICT", False)
+    await run_request(issuing(2), endpoint)
@@ -0,0 +1,59 @@
+from collections import namedtuple
+from datetime import datetime, timezone
+from app.models.job_history import JobHistory
+from app.models.project import Project
+from app.models.skill import Skill
+from app.models.user import User
+from app.schemas.portfolio import PortfolioResponse
+from app.schemas.user import UserResponse
+from app.utils.serialization_utils import TrustedJSONResponse, serializer_for
+
+NOW = datetime(2026, 1, 1, 12, 30, 45, 123456, tzinfo=timezone.utc)
+
+
+def make_user():
+    user = User(id=1, email="test@example.com", hashed_password="hashed", first_name="John", last_name="Doe")
+    user.created_at = user.updated_at = NOW
+    return user
+
+
+def test_serializer_matches_pydantic():
+    """
+    Test that the compiled serializer produces the same JSON as Pydantic.
+    """
+    user = make_user()
+
+    assert serializer_for(UserResponse).dumps(user) == UserResponse.model_validate(user).model_dump_json().encode()
+
+
+def test_serializer_nested_schemas():
+    """
+    Test that nested and list-of-nested schemas are serialized recursively.
+    """
+    user = make_user()
+    python = Skill(id=1, name="Python")
+    job = JobHistory(id=1, location="Remote", description="Engineer", is_active=True, start_date=NOW, skills=[python])
+    user.job_histories = [job]
+    user.projects = [Project(id=1, job_history_id=1, name="API", start_date=NOW, skills=[python])]
+
+    serialized = serializer_for(PortfolioResponse).dumps(user)
+
+    assert serialized == PortfolioResponse.model_validate(user).model_dump_json().encode()
+
+
+def test_serializer_core_rows():
+    """
+    Test that rows with attribute access (such as Core `Row`s) are supported.
+    """
+    Row = namedtuple("Row", ["id", "email", "first_name", "last_name", "created_at", "updated_at"])
+    row = Row(1, "test@example.com", "John", "Doe", NOW, NOW)
+
+    assert serializer_for(UserResponse)(row)["email"] == "test@example.com"
+
+
+def test_trusted_json_response_renders_bytes_and_builtins():
+    """
+    Test that pre-encoded bytes pass through and builtins are encoded.
+    """
+    assert TrustedJSONResponse(b'{"a":1}').body == b'{"a":1}'
+    assert TrustedJSONResponse({"at": NOW}).body == b'{"at":"2026-01-01T12:30:45.123456Z"}'
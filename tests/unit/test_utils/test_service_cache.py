@@ -0,0 +1,153 @@
+import asyncio
+import pytest
+from app.utils.service_cache import LocalCacheBackend, RedisCacheBackend, ServiceCache
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for a `redis.asyncio` client.
+    """
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+
+class BrokenBackend:
+    async def get(self, key):
+        raise ConnectionError("cache down")
+
+    async def set(self, key, value, ttl_seconds):
+        raise ConnectionError("cache down")
+
+    async def delete(self, *keys):
+        raise ConnectionError("cache down")
+
+    def stats(self):
+        return {}
+
+
+def make_cache(backend=None):
+    return ServiceCache(backend or LocalCacheBackend(max_size=100, ttl_seconds=60), ttl_seconds=60)
+
+
+def counting_loader(value, delay=0):
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+
+    return load, calls
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", [None, RedisCacheBackend(FakeRedis())], ids=["local", "redis"])
+async def test_read_through(backend):
+    """
+    Test that the first read loads and later reads are served from the cache.
+    """
+    cache = make_cache(backend)
+    load, calls = counting_loader([{"id": 1}])
+
+    assert await cache.get_or_load("key", load) == [{"id": 1}]
+    assert await cache.get_or_load("key", load) == [{"id": 1}]
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_single_flight():
+    """
+    Test that concurrent misses on the same key share one load.
+    """
+    cache = make_cache()
+    load, calls = counting_loader("value", delay=0.01)
+
+    results = await asyncio.gather(*(cache.get_or_load("key", load) for _ in range(10)))
+
+    assert results == ["value"] * 10
+    assert len(calls) == 1
+    assert cache.coalesced == 9
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    """
+    Test that when the caller running a load is cancelled, a coalesced caller still gets the value.
+    """
+    cache = make_cache()
+    load, calls = counting_loader("value", delay=0.01)
+
+    leader = asyncio.create_task(cache.get_or_load("key", load))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cache.get_or_load("key", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert await follower == "value"
+    assert len(calls) == 2
+    assert cache.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_invalidate():
+    """
+    Test that invalidation forces a reload, including when it lands mid-load.
+    """
+    cache = make_cache()
+    load, calls = counting_loader("value", delay=0.01)
+
+    await cache.get_or_load("key", load)
+    await cache.invalidate("key")
+    await cache.get_or_load("key", load)
+    assert len(calls) == 2
+
+    await cache.invalidate("key")
+    in_flight = asyncio.create_task(cache.get_or_load("key", load))
+    await asyncio.sleep(0)
+    await cache.invalidate("key")
+    await in_flight
+    await cache.get_or_load("key", load)
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_version_mismatch_reloads():
+    """
+    Test that an entry cached at another version is treated as a miss.
+    """
+    cache = make_cache()
+    load, calls = counting_loader("value")
+
+    await cache.get_or_load("key", load, version='"v1"')
+    await cache.get_or_load("key", load, version='"v1"')
+    await cache.get_or_load("key", load, version='"v2"')
+
+    assert len(calls) == 2
+    assert cache.stale == 1
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_fall_back_to_loader():
+    """
+    Test that a failing backend is counted and reads still succeed.
+    """
+    cache = make_cache(BrokenBackend())
+    load, calls = counting_loader("value")
+
+    assert await cache.get_or_load("key", load) == "value"
+    await cache.invalidate("key")
+    assert cache.errors == 3
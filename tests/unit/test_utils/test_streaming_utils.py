@@ -0,0 +1,41 @@
+import json
+from types import SimpleNamespace
+import pytest
+from pydantic import BaseModel
+from app.utils.streaming_utils import encode_json_array, encode_ndjson
+
+
+class Row(BaseModel):
+    id: int
+    name: str
+
+
+async def rows(count):
+    for i in range(count):
+        yield SimpleNamespace(id=i, name=f"row-{i}")
+
+
+async def collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.asyncio
+async def test_encode_ndjson():
+    """
+    Test that each row is encoded as one JSON document per line.
+    """
+    body = await collect(encode_ndjson(rows(3), Row))
+
+    lines = body.decode().splitlines()
+    assert [json.loads(line) for line in lines] == [{"id": i, "name": f"row-{i}"} for i in range(3)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", [0, 1, 3])
+async def test_encode_json_array(count):
+    """
+    Test that the streamed chunks form a valid JSON array, including when empty.
+    """
+    body = await collect(encode_json_array(rows(count), Row))
+
+    assert json.loads(body) == [{"id": i, "name": f"row-{i}"} for i in range(count)]
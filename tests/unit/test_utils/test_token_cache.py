@@ -0,0 +1,93 @@
+import time
+from app.schemas.user import AuthenticatedUser
+from app.utils.cache_utils import LRUCache
+from app.utils.token_cache import TokenCache
+
+
+def make_user(user_id=1):
+    return AuthenticatedUser(id=user_id, email=f"user{user_id}@example.com", is_active=True)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """
+    Test that the oldest untouched entry is evicted when the cache is full.
+    """
+    cache = LRUCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_cache_expires_entries():
+    """
+    Test that entries are not returned after their TTL.
+    """
+    cache = LRUCache(max_size=10, ttl_seconds=60)
+    cache.set("a", 1, ttl_seconds=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_lru_cache_stats():
+    """
+    Test that hit rate and memory figures are reported.
+    """
+    cache = LRUCache(max_size=10, ttl_seconds=60)
+    cache.set("a", {"sub": "user@example.com"})
+    cache.get("a")
+    cache.get("missing")
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["approx_bytes"] > 0
+
+
+def test_token_cache_never_outlives_exp():
+    """
+    Test that an already-expired token is not cached.
+    """
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.set("token", {"sub": "user1@example.com", "exp": time.time() - 1}, make_user())
+
+    assert cache.get("token") is None
+
+
+def test_token_cache_hit():
+    """
+    Test that a cached token returns its claims and identity.
+    """
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    claims = {"sub": "user1@example.com", "exp": time.time() + 60}
+    cache.set("token", claims, make_user())
+
+    cached_claims, cached_user = cache.get("token")
+    assert cached_claims == claims
+    assert cached_user.id == 1
+
+
+def test_token_cache_invalidation():
+    """
+    Test invalidation by token and by user.
+    """
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    exp = time.time() + 60
+    cache.set("token1", {"exp": exp}, make_user(1))
+    cache.set("token2", {"exp": exp}, make_user(1))
+    cache.set("token3", {"exp": exp}, make_user(2))
+
+    cache.invalidate_token("token3")
+    assert cache.get("token3") is None
+
+    cache.invalidate_user(1)
+    assert cache.get("token1") is None
+    assert cache.get("token2") is None
@@ -0,0 +1,56 @@
+import time
+from datetime import datetime, timedelta, timezone
+from app.schemas.user import AuthenticatedUser
+from app.utils.token_cache import token_cache
+from app.utils.token_revocation import RevocationList
+
+
+def test_revoke_token():
+    """
+    Test that a revoked token is reported without a database lookup.
+    """
+    revocations = RevocationList()
+    revocations.revoke("token1", datetime.now(timezone.utc) + timedelta(minutes=5))
+
+    assert revocations.is_revoked("token1")
+    assert not revocations.is_revoked("token2")
+
+
+def test_revoke_invalidates_cached_token():
+    """
+    Test that revoking a token evicts it from the verified-token cache.
+    """
+    user = AuthenticatedUser(id=42, email="user@example.com", is_active=True)
+    token_cache.set("cached-token", {"exp": time.time() + 60}, user)
+
+    RevocationList().revoke("cached-token", datetime.now(timezone.utc) + timedelta(minutes=5))
+
+    assert token_cache.get("cached-token") is None
+
+
+def test_merge_tracks_remote_revocations():
+    """
+    Test that a sync picks up revocations made by other workers and drops expired ones.
+    """
+    revocations = RevocationList()
+    revocations.revoke("expired", datetime.now(timezone.utc) - timedelta(seconds=1))
+
+    revocations.merge({RevocationList.digest("remote"): time.time() + 300})
+
+    assert revocations.is_revoked("remote")
+    assert not revocations.is_revoked("expired")
+
+
+def test_merge_keeps_revocations_missing_from_the_snapshot():
+    """
+    Test that a token revoked while the sync query ran survives the sync.
+    """
+    revocations = RevocationList()
+    # The snapshot was read before this worker committed the revocation
+    snapshot = {RevocationList.digest("remote"): time.time() + 300}
+    revocations.revoke("local", datetime.now(timezone.utc) + timedelta(minutes=5))
+
+    revocations.merge(snapshot)
+
+    assert revocations.is_revoked("local")
+    assert revocations.is_revoked("remote")